@@ -0,0 +1,31 @@
+"""telegram media file_id cache
+
+Revision ID: 0009_telegram_media_files
+Revises: 0008_user_is_active
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009_telegram_media_files"
+down_revision = "0008_user_is_active"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "telegram_media_files",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("bot_id", sa.String(length=64), nullable=False),
+        sa.Column("media_path", sa.String(length=500), nullable=False),
+        sa.Column("file_id", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime, nullable=False),
+        sa.Column("updated_at", sa.DateTime, nullable=False),
+        sa.UniqueConstraint("bot_id", "media_path", name="uq_telegram_media_files_bot_media_path"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("telegram_media_files")
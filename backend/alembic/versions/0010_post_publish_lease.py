@@ -0,0 +1,30 @@
+"""post publish lease
+
+Revision ID: 0010_post_publish_lease
+Revises: 0009_telegram_media_files
+Create Date: 2026-10-18 00:10:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010_post_publish_lease"
+down_revision = "0009_telegram_media_files"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # ALTER TYPE ... ADD VALUE cannot be used inside the migration transaction.
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE poststatus ADD VALUE IF NOT EXISTS 'publishing' AFTER 'scheduled'")
+    op.add_column("posts", sa.Column("lease_owner", sa.String(length=128), nullable=True))
+    op.add_column("posts", sa.Column("lease_expires_at", sa.DateTime, nullable=True))
+
+
+def downgrade() -> None:
+    op.execute("UPDATE posts SET status = 'scheduled' WHERE status = 'publishing'")
+    op.drop_column("posts", "lease_expires_at")
+    op.drop_column("posts", "lease_owner")
+    # Postgres cannot drop a single enum value; 'publishing' stays in poststatus but is unused.
@@ -0,0 +1,24 @@
+"""publish retry backoff
+
+Revision ID: 0011_publish_retry_backoff
+Revises: 0010_post_publish_lease
+Create Date: 2026-10-18 00:11:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011_publish_retry_backoff"
+down_revision = "0010_post_publish_lease"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("posts", sa.Column("next_retry_at", sa.DateTime, nullable=True))
+    op.add_column("channels", sa.Column("publish_cooldown_until", sa.DateTime, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("channels", "publish_cooldown_until")
+    op.drop_column("posts", "next_retry_at")
@@ -0,0 +1,44 @@
+"""telegram outbox
+
+Revision ID: 0012_telegram_outbox
+Revises: 0011_publish_retry_backoff
+Create Date: 2026-10-18 00:12:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0012_telegram_outbox"
+down_revision = "0011_publish_retry_backoff"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "telegram_outbox",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("post_id", sa.Integer, nullable=True),
+        sa.Column("action", sa.String(length=16), nullable=False),
+        sa.Column("chat_id", sa.String(length=255), nullable=False),
+        sa.Column("message_id", sa.String(length=64), nullable=False),
+        sa.Column("payload_json", sa.JSON, nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("attempts", sa.Integer, nullable=False),
+        sa.Column("last_error", sa.Text, nullable=True),
+        sa.Column("available_at", sa.DateTime, nullable=False),
+        sa.Column("lease_owner", sa.String(length=128), nullable=True),
+        sa.Column("created_at", sa.DateTime, nullable=False),
+        sa.Column("delivered_at", sa.DateTime, nullable=True),
+    )
+    op.create_index("ix_telegram_outbox_status_available_at", "telegram_outbox", ["status", "available_at"])
+    op.create_index("ix_telegram_outbox_post_id_status", "telegram_outbox", ["post_id", "status"])
+    op.add_column("posts", sa.Column("sync_pending", sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.alter_column("posts", "sync_pending", server_default=None)
+
+
+def downgrade() -> None:
+    op.drop_column("posts", "sync_pending")
+    op.drop_index("ix_telegram_outbox_post_id_status", table_name="telegram_outbox")
+    op.drop_index("ix_telegram_outbox_status_available_at", table_name="telegram_outbox")
+    op.drop_table("telegram_outbox")
@@ -0,0 +1,24 @@
+"""post telegram fingerprint
+
+Revision ID: 0013_post_telegram_fingerprint
+Revises: 0012_telegram_outbox
+Create Date: 2026-10-18 00:13:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0013_post_telegram_fingerprint"
+down_revision = "0012_telegram_outbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Stays NULL for posts published before this column; their next edit is sent
+    # unconditionally and records it.
+    op.add_column("posts", sa.Column("telegram_fingerprint", sa.String(length=65), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("posts", "telegram_fingerprint")
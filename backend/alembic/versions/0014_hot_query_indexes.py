@@ -0,0 +1,66 @@
+"""hot query indexes
+
+Revision ID: 0014_hot_query_indexes
+Revises: 0013_post_telegram_fingerprint
+Create Date: 2026-10-18 00:14:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0014_hot_query_indexes"
+down_revision = "0013_post_telegram_fingerprint"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    # list_posts_compact: channel_id [+ status IN (...)] ORDER BY created_at DESC
+    ("ix_posts_channel_status_created_at", "posts", ["channel_id", "status", "created_at"], None),
+    ("ix_posts_channel_created_at", "posts", ["channel_id", "created_at"], None),
+    # publish beat and schedule list: status = 'scheduled' ORDER BY scheduled_at, id
+    ("ix_posts_scheduled_at_id", "posts", ["scheduled_at", "id"], "status = 'scheduled'"),
+    # dashboard next/overdue per channel
+    ("ix_posts_scheduled_channel_at", "posts", ["channel_id", "scheduled_at"], "status = 'scheduled'"),
+    # lease reaper
+    ("ix_posts_publishing_lease_expires_at", "posts", ["lease_expires_at"], "status = 'publishing'"),
+    # dashboard recent errors: last_error IS NOT NULL ORDER BY updated_at DESC
+    ("ix_posts_errors_updated_at", "posts", ["updated_at"], "last_error IS NOT NULL"),
+    # dashboard last published per channel
+    ("ix_posts_channel_published_at", "posts", ["channel_id", "published_at"], "published_at IS NOT NULL"),
+    # audit log list (+ filters) ORDER BY created_at DESC
+    ("ix_audit_logs_created_at_id", "audit_logs", ["created_at", "id"], None),
+    ("ix_audit_logs_entity_created_at", "audit_logs", ["entity_type", "entity_id", "created_at"], None),
+    ("ix_audit_logs_actor_created_at", "audit_logs", ["actor_user_id", "created_at"], None),
+    # suggestions inbox ORDER BY created_at DESC [channel filter]
+    ("ix_suggestions_created_at_id", "suggestions", ["created_at", "id"], None),
+    ("ix_suggestions_channel_created_at", "suggestions", ["channel_id", "created_at"], None),
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # CONCURRENTLY keeps the tables writable during the build but cannot run in a
+        # transaction. A build that fails leaves an INVALID index: drop it and rerun.
+        with op.get_context().autocommit_block():
+            for name, table, columns, where in INDEXES:
+                op.create_index(
+                    name,
+                    table,
+                    columns,
+                    postgresql_where=sa.text(where) if where else None,
+                    postgresql_concurrently=True,
+                )
+        return
+    for name, table, columns, where in INDEXES:
+        op.create_index(name, table, columns, sqlite_where=sa.text(where) if where else None)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, table, _columns, _where in reversed(INDEXES):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
+        return
+    for name, table, _columns, _where in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,51 @@
+"""channel post stats
+
+Revision ID: 0015_channel_post_stats
+Revises: 0014_hot_query_indexes
+Create Date: 2026-10-18 00:15:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0015_channel_post_stats"
+down_revision = "0014_hot_query_indexes"
+branch_labels = None
+depends_on = None
+
+STATUSES = ["draft", "pending", "approved", "scheduled", "publishing", "published", "rejected", "failed"]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "channel_post_stats",
+        sa.Column(
+            "channel_id", sa.Integer, sa.ForeignKey("channels.id", ondelete="CASCADE"), primary_key=True
+        ),
+        *[
+            sa.Column(f"{status}_count", sa.Integer, nullable=False, server_default="0")
+            for status in STATUSES
+        ],
+        sa.Column("first_scheduled_at", sa.DateTime, nullable=True),
+        sa.Column("last_post_at", sa.DateTime, nullable=True),
+        sa.Column("last_published_at", sa.DateTime, nullable=True),
+    )
+    # Backfill once from posts; from here on the application maintains the rows.
+    counts = ", ".join(f"SUM(CASE WHEN status = '{status}' THEN 1 ELSE 0 END)" for status in STATUSES)
+    columns = ", ".join(f"{status}_count" for status in STATUSES)
+    op.execute(
+        f"""
+        INSERT INTO channel_post_stats
+            (channel_id, {columns}, first_scheduled_at, last_post_at, last_published_at)
+        SELECT channel_id, {counts},
+               MIN(CASE WHEN status = 'scheduled' THEN scheduled_at END),
+               MAX(created_at),
+               MAX(published_at)
+        FROM posts
+        GROUP BY channel_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("channel_post_stats")
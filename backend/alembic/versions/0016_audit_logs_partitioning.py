@@ -0,0 +1,104 @@
+"""audit logs monthly partitions
+
+Revision ID: 0016_audit_logs_partitioning
+Revises: 0015_channel_post_stats
+Create Date: 2026-10-18 00:16:00.000000
+"""
+
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0016_audit_logs_partitioning"
+down_revision = "0015_channel_post_stats"
+branch_labels = None
+depends_on = None
+
+# Partitions created ahead of the current month; the periodic maintenance task keeps this up.
+MONTHS_AHEAD = 2
+
+COLUMNS = "id, entity_type, entity_id, action, actor_user_id, payload_json, created_at"
+COLUMN_DDL = """
+    entity_type varchar(50) NOT NULL,
+    entity_id integer NOT NULL,
+    action varchar(50) NOT NULL,
+    actor_user_id integer NOT NULL REFERENCES users (id),
+    payload_json json NOT NULL,
+    created_at timestamp without time zone NOT NULL
+"""
+
+INDEXES = [
+    ("ix_audit_logs_entity_id", ["entity_id"]),
+    ("ix_audit_logs_created_at_id", ["created_at", "id"]),
+    ("ix_audit_logs_entity_created_at", ["entity_type", "entity_id", "created_at"]),
+    ("ix_audit_logs_actor_created_at", ["actor_user_id", "created_at"]),
+]
+
+
+def _next_month(month: datetime) -> datetime:
+    return month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+
+
+def upgrade() -> None:
+    # Native partitioning is Postgres-only; other databases keep the plain table.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned")
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY NONE")
+    op.execute(
+        f"""
+        CREATE TABLE audit_logs (
+            id integer NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            {COLUMN_DDL}
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    # Catches rows outside every monthly partition instead of failing the insert.
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    oldest = op.get_bind().execute(sa.text("SELECT min(created_at) FROM audit_logs_unpartitioned")).scalar()
+    now = datetime.utcnow()
+    month = (oldest or now).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    last = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    for _ in range(MONTHS_AHEAD):
+        last = _next_month(last)
+    while month <= last:
+        upper = _next_month(month)
+        op.execute(
+            f"CREATE TABLE audit_logs_{month:%Y_%m} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{upper:%Y-%m-%d}')"
+        )
+        month = upper
+
+    op.execute(f"INSERT INTO audit_logs ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs_unpartitioned")
+    op.execute("DROP TABLE audit_logs_unpartitioned")
+    # A primary key on a partitioned table must include the partition key.
+    op.execute("ALTER TABLE audit_logs ADD CONSTRAINT audit_logs_pkey PRIMARY KEY (id, created_at)")
+    for name, columns in INDEXES:
+        op.create_index(name, "audit_logs", columns)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY NONE")
+    for name, _ in INDEXES:
+        op.execute(f"DROP INDEX {name}")
+    op.execute("ALTER TABLE audit_logs_partitioned DROP CONSTRAINT audit_logs_pkey")
+    op.execute(
+        f"""
+        CREATE TABLE audit_logs (
+            id integer PRIMARY KEY DEFAULT nextval('audit_logs_id_seq'),
+            {COLUMN_DDL}
+        )
+        """
+    )
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    op.execute(f"INSERT INTO audit_logs ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs_partitioned")
+    # Drops every partition with it; archived months are not restored.
+    op.execute("DROP TABLE audit_logs_partitioned")
+    for name, columns in INDEXES:
+        op.create_index(name, "audit_logs", columns)
@@ -0,0 +1,22 @@
+"""post publish job id
+
+Revision ID: 0017_post_publish_job_id
+Revises: 0016_audit_logs_partitioning
+Create Date: 2026-10-18 00:17:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0017_post_publish_job_id"
+down_revision = "0016_audit_logs_partitioning"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("posts", sa.Column("publish_job_id", sa.String(32), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("posts", "publish_job_id")
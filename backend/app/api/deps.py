@@ -2,9 +2,10 @@ from fastapi import Depends, HTTPException, status, Request
 import logging
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.core.config import settings
-from app.db.deps import get_db
+from app.db.deps import get_async_db, get_db
 from app.models.user import User
 from app.models.enums import UserRole
 
@@ -13,11 +14,7 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/v1/auth/login", auto_error=False
 logger = logging.getLogger("auth")
 
 
-def get_current_user(
-    request: Request,
-    db: Session = Depends(get_db),
-    token: str | None = Depends(oauth2_scheme),
-) -> User:
+def _user_id_from_request(request: Request, token: str | None) -> int:
     if not token:
         cookie_token = request.cookies.get("access_token")
         token = cookie_token
@@ -39,8 +36,10 @@ def get_current_user(
     user_id = payload.get("sub")
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    return int(user_id)
+
 
-    user = db.get(User, int(user_id))
+def _active_user(user: User | None) -> User:
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     if not getattr(user, "is_active", True):
@@ -48,13 +47,39 @@ def get_current_user(
     return user
 
 
+def get_current_user(
+    request: Request,
+    db: Session = Depends(get_db),
+    token: str | None = Depends(oauth2_scheme),
+) -> User:
+    return _active_user(db.get(User, _user_id_from_request(request, token)))
+
+
+async def get_current_user_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    token: str | None = Depends(oauth2_scheme),
+) -> User:
+    """get_current_user for async endpoints; shares the request's AsyncSession."""
+    return _active_user(await db.get(User, _user_id_from_request(request, token)))
+
+
+def _check_roles(user: User, roles: tuple[UserRole, ...]) -> User:
+    if roles and user.role not in roles:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    return user
+
+
 def require_roles(*roles: UserRole):
     def _checker(user: User = Depends(get_current_user)) -> User:
-        if not roles:
-            return user
-        if user.role not in roles:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-        return user
+        return _check_roles(user, roles)
+
+    return _checker
+
+
+def require_roles_async(*roles: UserRole):
+    async def _checker(user: User = Depends(get_current_user_async)) -> User:
+        return _check_roles(user, roles)
 
     return _checker
 
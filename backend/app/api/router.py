@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import auth, users, channels, posts, stats, media, telegram, agent_settings, suggestions, dashboard, audit_logs, comments, inbox, schedule
+from app.api.v1 import auth, users, channels, posts, stats, media, telegram, agent_settings, suggestions, dashboard, audit_logs, comments, inbox, schedule, events
 
 api_router = APIRouter(prefix="/v1")
 api_router.include_router(auth.router)
@@ -16,3 +16,4 @@ api_router.include_router(inbox.router)
 api_router.include_router(schedule.router)
 api_router.include_router(dashboard.router)
 api_router.include_router(audit_logs.router)
+api_router.include_router(events.router)
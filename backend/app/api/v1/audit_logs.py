@@ -1,11 +1,13 @@
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import require_roles
-from app.db.deps import get_db
+from app.api.deps import require_roles, require_roles_async
+from app.db.deps import get_async_read_db, get_db
 from app.models.enums import UserRole
+from app.repositories.pagination import TotalMode
 from app.schemas.audit_log import AuditLogListOut, AuditLogOut
 from app.usecases import audit_logs as audit_usecase
 
@@ -13,7 +15,7 @@ router = APIRouter(prefix="/audit-logs", tags=["audit"])
 
 
 @router.get("", response_model=AuditLogListOut)
-def list_audit_logs(
+async def list_audit_logs(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     entity_type: str | None = None,
@@ -22,11 +24,13 @@ def list_audit_logs(
     action: str | None = None,
     since: datetime | None = None,
     until: datetime | None = None,
-    db: Session = Depends(get_db),
-    _admin=Depends(require_roles(UserRole.admin)),
+    cursor: str | None = None,
+    total_mode: TotalMode = "exact",
+    db: AsyncSession = Depends(get_async_read_db),
+    _admin=Depends(require_roles_async(UserRole.admin)),
 ):
-    return audit_usecase.list_audit_logs(
-        db,
+    return await db.run_sync(
+        audit_usecase.list_audit_logs,
         limit=limit,
         offset=offset,
         entity_type=entity_type,
@@ -35,6 +39,8 @@ def list_audit_logs(
         action=action,
         since=since,
         until=until,
+        cursor=cursor,
+        total_mode=total_mode,
     )
 
 
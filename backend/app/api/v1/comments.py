@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
 from app.db.deps import get_db
+from app.repositories.pagination import next_cursor
 from app.schemas.comments import PostCommentCreate, PostCommentOut
 from app.usecases import comments as comments_usecase
 
@@ -12,12 +13,18 @@ router = APIRouter(prefix="/posts/{post_id}/comments", tags=["comments"])
 @router.get("", response_model=list[PostCommentOut])
 def list_comments(
     post_id: int,
+    response: Response,
     limit: int = Query(100, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
     _user=Depends(get_current_user),
 ):
-    return comments_usecase.list_post_comments(db, post_id, limit=limit, offset=offset)
+    items = comments_usecase.list_post_comments(db, post_id, limit=limit, offset=offset, cursor=cursor)
+    page_cursor = next_cursor(comments_usecase.CURSOR_SCOPE, items, limit, "created_at")
+    if page_cursor:
+        response.headers["X-Next-Cursor"] = page_cursor
+    return items
 
 
 @router.post("", response_model=PostCommentOut)
@@ -1,15 +1,15 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.db.deps import get_db
+from app.api.deps import get_current_user_async
+from app.db.deps import get_async_read_db
 from app.schemas.dashboard import DashboardOverview
+from app.services import dashboard_cache
 from app.usecases import dashboard as dashboard_usecase
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
 @router.get("/overview", response_model=DashboardOverview)
-def overview(db: Session = Depends(get_db), _user=Depends(get_current_user)):
-    return dashboard_usecase.get_overview(db)
-
+async def overview(db: AsyncSession = Depends(get_async_read_db), _user=Depends(get_current_user_async)):
+    return await dashboard_cache.get_overview(lambda: db.run_sync(dashboard_usecase.get_overview))
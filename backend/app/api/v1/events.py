@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_current_user_async
+from app.services import events
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+@router.get("")
+async def stream_events(_user=Depends(get_current_user_async)):
+    return StreamingResponse(
+        events.stream(),
+        media_type="text/event-stream",
+        # X-Accel-Buffering: nginx would otherwise hold frames back until its buffer fills.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
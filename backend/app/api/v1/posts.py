@@ -1,9 +1,18 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.deps import get_db
-from app.api.deps import get_current_user, require_roles
+from app.db.deps import get_async_db, get_db
+from app.api.deps import get_current_user, get_current_user_async, require_roles
 from app.models.enums import PostStatus, UserRole
-from app.schemas.post import PostCreate, PostOut, PostUpdate, ScheduleRequest, RejectRequest, PostListOut
+from app.schemas.post import (
+    PostCreate,
+    PostOut,
+    PostUpdate,
+    ScheduleRequest,
+    RejectRequest,
+    PostListOut,
+    PublishJobOut,
+)
 from app.usecases import posts as post_usecase
 
 router = APIRouter(prefix="", tags=["posts"])
@@ -20,17 +29,23 @@ def create_post(
 
 
 @router.get("/channels/{channel_id}/posts", response_model=list[PostListOut])
-def list_posts(
+async def list_posts(
     channel_id: int,
+    response: Response,
     status_filter: PostStatus | None = None,
     status_filters: list[PostStatus] | None = Query(None),
     limit: int = 50,
     offset: int = 0,
-    db: Session = Depends(get_db),
-    _user=Depends(get_current_user),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    _user=Depends(get_current_user_async),
 ):
     filters = status_filters or ([status_filter] if status_filter else None)
-    return post_usecase.list_posts(db, channel_id, filters, limit=limit, offset=offset)
+    rows = await post_usecase.list_posts_async(db, channel_id, filters, limit=limit, offset=offset, cursor=cursor)
+    page_cursor = post_usecase.list_posts_next_cursor(rows, limit)
+    if page_cursor:
+        response.headers["X-Next-Cursor"] = page_cursor
+    return rows
 
 
 @router.get("/posts/{post_id}", response_model=PostOut)
@@ -93,7 +108,7 @@ def schedule_post(
     return post_usecase.schedule_post(db, post_id, payload, user)
 
 
-@router.post("/posts/{post_id}/publish-now", response_model=PostOut)
+@router.post("/posts/{post_id}/publish-now", response_model=PublishJobOut, status_code=202)
 def publish_now(
     post_id: int,
     db: Session = Depends(get_db),
@@ -103,6 +118,17 @@ def publish_now(
     return post_usecase.publish_now(db, post_id, user)
 
 
+@router.get("/posts/{post_id}/publish-jobs/{job_id}", response_model=PublishJobOut)
+async def get_publish_job(
+    post_id: int,
+    job_id: str,
+    wait: float = Query(0, ge=0, le=25, description="Long-poll up to this many seconds while pending"),
+    db: AsyncSession = Depends(get_async_db),
+    _user=Depends(get_current_user_async),
+):
+    return await post_usecase.get_publish_job(db, post_id, job_id, wait_seconds=wait)
+
+
 @router.delete("/posts/{post_id}", status_code=204)
 def delete_post(
     post_id: int,
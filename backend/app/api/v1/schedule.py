@@ -1,11 +1,13 @@
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, require_roles
-from app.db.deps import get_db
+from app.api.deps import get_current_user, get_current_user_async, require_roles
+from app.db.deps import get_async_read_db, get_db
 from app.models.enums import UserRole
+from app.repositories.pagination import TotalMode
 from app.schemas.post import PostOut
 from app.schemas.schedule import ScheduledPostListOut, RequeueRequest
 from app.usecases import schedule as schedule_usecase
@@ -15,22 +17,26 @@ router = APIRouter(prefix="/schedule", tags=["schedule"])
 
 
 @router.get("", response_model=ScheduledPostListOut)
-def list_schedule(
+async def list_schedule(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     channel_id: int | None = None,
     since: datetime | None = None,
     until: datetime | None = None,
-    db: Session = Depends(get_db),
-    _user=Depends(get_current_user),
+    cursor: str | None = None,
+    total_mode: TotalMode = "exact",
+    db: AsyncSession = Depends(get_async_read_db),
+    _user=Depends(get_current_user_async),
 ):
-    return schedule_usecase.list_scheduled_posts(
-        db,
+    return await db.run_sync(
+        schedule_usecase.list_scheduled_posts,
         limit=limit,
         offset=offset,
         channel_id=channel_id,
         since=since,
         until=until,
+        cursor=cursor,
+        total_mode=total_mode,
     )
 
 
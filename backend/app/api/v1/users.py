@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from app.db.deps import get_db
 from app.api.deps import get_current_user, require_roles
 from app.models.enums import UserRole
+from app.repositories.pagination import next_cursor
 from app.schemas.user import (
     UserOut,
     UserCreate,
@@ -36,11 +37,18 @@ def list_users(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     q: str | None = None,
+    cursor: str | None = None,
     db: Session = Depends(get_db),
     _admin=Depends(require_roles(UserRole.admin)),
 ):
-    items, total = user_service.list_users(db, limit=limit, offset=offset, q=q)
-    return UsersListOut(items=items, total=total, limit=limit, offset=offset)
+    items, total = user_service.list_users(db, limit=limit, offset=offset, q=q, cursor=cursor)
+    return UsersListOut(
+        items=items,
+        total=total,
+        limit=limit,
+        offset=0 if cursor else offset,
+        next_cursor=next_cursor(user_service.CURSOR_SCOPE, items, limit, "created_at"),
+    )
 
 
 @router.patch("/{user_id}/role", response_model=UserOut)
@@ -7,6 +7,23 @@ class Settings(BaseSettings):
     app_secret: str = "change_me"
 
     database_url: str
+    # Optional read replica for read-only endpoints (dashboard, audit logs, inbox, schedule).
+    database_read_url: str | None = None
+    # After a write, that client's reads stay on the primary this long (replication lag budget).
+    read_your_writes_seconds: float = 5.0
+    # "api" for the web process, "worker" for Celery workers, beat and the dispatcher.
+    db_pool_profile: str = "api"
+    # Sized for the API threadpool; each worker process runs one task at a time.
+    db_pool_size: int = 10
+    db_pool_max_overflow: int = 10
+    db_worker_pool_size: int = 2
+    db_worker_pool_max_overflow: int = 2
+    db_pool_timeout_seconds: float = 10.0
+    # Below the server/proxy idle timeout so stale connections are replaced, not pinged dead.
+    db_pool_recycle_seconds: int = 1800
+    # Server-side statement_timeout in milliseconds (Postgres only; 0 disables).
+    db_statement_timeout_ms: int = 30000
+    db_worker_statement_timeout_ms: int = 300000
 
     access_token_expire_minutes: int = 60
     docs_enabled: bool | None = None
@@ -17,17 +34,80 @@ class Settings(BaseSettings):
     n8n_api_key: str | None = None
     telegram_timeout_seconds: int = 10
     telegram_retries: int = 2
+    telegram_pool_max_connections: int = 20
+    telegram_pool_max_keepalive: int = 10
+    telegram_pool_keepalive_expiry_seconds: float = 30.0
+    # Requires the optional `h2` package (httpx[http2]).
+    telegram_http2: bool = False
+    telegram_rate_limit_enabled: bool = True
+    telegram_rate_limit_redis_url: str | None = None
+    telegram_global_rate_per_second: int = 30
+    telegram_chat_rate_per_minute: int = 20
+    telegram_rate_limit_max_wait_seconds: float = 30.0
+    telegram_retry_after_max_seconds: float = 30.0
 
     redis_url: str = "redis://redis:6379/0"
+    # After a Redis error, best-effort features (dashboard cache, change events) skip Redis this long.
+    redis_outage_backoff_seconds: float = 5.0
     celery_broker_url: str = "redis://redis:6379/0"
     celery_result_backend: str = "redis://redis:6379/0"
     rate_limit_enabled: bool = True
     rate_limit_redis_url: str | None = None
     metrics_enabled: bool = True
     metrics_token: str | None = None
+    # Dashboard overview shared through Redis for this long (0 disables). Post status changes evict it.
+    dashboard_cache_ttl_seconds: float = 3.0
+    # How long concurrent misses wait for the one request that recomputes before computing themselves.
+    dashboard_cache_wait_seconds: float = 2.0
+    # /v1/events: keep-alive comment interval on idle streams, and the client reconnect delay.
+    events_heartbeat_seconds: float = 15.0
+    events_retry_ms: int = 5000
 
     publish_retry_max: int = 3
+    # Retry n waits uniform(0, min(max_delay, delay * 2**(n-1))) seconds ("full jitter").
     publish_retry_delay_seconds: int = 300
+    publish_retry_max_delay_seconds: int = 3600
+    # After a retryable failure the whole channel pauses this long (0 disables).
+    publish_channel_cooldown_seconds: int = 0
+    publish_dispatch_batch_size: int = 50
+    publish_max_in_flight: int = 200
+    publish_inflight_ttl_seconds: int = 600
+    publish_dispatcher_poll_seconds: float = 0.25
+    # >1 publishes due posts in chunks per task with bulk audit writes.
+    publish_task_batch_size: int = 1
+    # Renewed before each Telegram attempt once less than one attempt's worth is left,
+    # so it only has to outlast a single attempt (telegram_attempt_seconds).
+    publish_lease_seconds: int = 120
+
+    telegram_outbox_batch_size: int = 50
+    telegram_outbox_max_attempts: int = 5
+    telegram_outbox_retry_delay_seconds: int = 10
+    telegram_outbox_lease_seconds: int = 120
+    # Saves of a published post within this quiet window become one Telegram edit,
+    # delayed at most telegram_edit_debounce_max_seconds after the first save.
+    telegram_edit_debounce_seconds: float = 3.0
+    telegram_edit_debounce_max_seconds: float = 30.0
+
+    # total_mode=estimated on list endpoints: totals are reused for this long per filter
+    # set, and Postgres planner estimates are trusted from this many rows up.
+    list_count_cache_seconds: int = 30
+    list_count_estimate_min_rows: int = 10000
+
+    # "db": audit entries are bulk-inserted when the request's transaction commits.
+    # "stream": they go to a Redis stream after the commit and app.workers.audit_writer inserts them.
+    audit_sink: str = "db"
+    # Approximate cap on the stream; only reached if the writer is down for a long time.
+    audit_stream_maxlen: int = 1_000_000
+    audit_writer_batch_size: int = 1000
+    audit_writer_block_ms: int = 1000
+    # Entries a crashed writer read but never acknowledged are taken over after this long.
+    audit_writer_claim_idle_ms: int = 60_000
+    # An entry that still fails to insert on its own after this many deliveries goes to the dead-letter stream.
+    audit_writer_max_deliveries: int = 5
+    # Postgres monthly audit_logs partitions: created this many months ahead; months older than
+    # the retention window are exported to <media_dir>/audit_archive and dropped (0 keeps all).
+    audit_partitions_ahead_months: int = 2
+    audit_retention_months: int = 12
 
     media_dir: str = "/app/media"
     media_max_bytes: int = 5 * 1024 * 1024
@@ -40,10 +120,28 @@ class Settings(BaseSettings):
             self.docs_enabled = self.app_env.lower() != "production"
         if self.app_env.lower() == "production" and self.app_secret == "change_me":
             raise ValueError("APP_SECRET must be set in production")
+        if self.db_pool_profile not in {"api", "worker"}:
+            raise ValueError("DB_POOL_PROFILE must be 'api' or 'worker'")
+        if self.audit_sink not in {"db", "stream"}:
+            raise ValueError("AUDIT_SINK must be 'db' or 'stream'")
         if self.rate_limit_enabled and not (self.rate_limit_redis_url or self.redis_url):
             raise ValueError("Rate limiting enabled but Redis URL is missing")
+        if self.publish_lease_seconds <= self.telegram_attempt_seconds:
+            raise ValueError(
+                f"PUBLISH_LEASE_SECONDS must exceed one Telegram attempt ({self.telegram_attempt_seconds:g}s: "
+                "rate limit wait + timeout + retry_after)"
+            )
         return self
 
+    @property
+    def telegram_attempt_seconds(self) -> float:
+        """Longest one Telegram attempt can take: limiter wait, the call, then a retry_after sleep."""
+        return (
+            self.telegram_rate_limit_max_wait_seconds
+            + self.telegram_timeout_seconds
+            + self.telegram_retry_after_max_seconds
+        )
+
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
 
 
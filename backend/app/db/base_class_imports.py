@@ -7,5 +7,8 @@ from app.models.source_item import SourceItem
 from app.models.audit_log import AuditLog
 from app.models.agent_settings import AgentSettings
 from app.models.suggestion import Suggestion
+from app.models.telegram_media_file import TelegramMediaFile
+from app.models.telegram_outbox import TelegramOutbox
+from app.models.channel_post_stats import ChannelPostStats
 
-__all__ = ["Base", "User", "Channel", "Post", "PostComment", "SourceItem", "AuditLog", "AgentSettings", "Suggestion"]
+__all__ = ["Base", "User", "Channel", "Post", "PostComment", "SourceItem", "AuditLog", "AgentSettings", "Suggestion", "TelegramMediaFile", "TelegramOutbox", "ChannelPostStats"]
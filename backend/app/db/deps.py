@@ -1,6 +1,15 @@
-from collections.abc import Generator
+import time
+from collections.abc import AsyncGenerator, Callable, Generator
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+
+from app.core.config import settings
+from app.db.session import AsyncReadSessionLocal, AsyncSessionLocal, SessionLocal
+
+# Set on responses to writes (see app.main) so the same client reads from the primary for a while.
+LAST_WRITE_COOKIE = "last_write_at"
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -9,3 +18,30 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def wrote_recently(request: Request) -> bool:
+    try:
+        last_write_at = float(request.cookies.get(LAST_WRITE_COOKIE, ""))
+    except ValueError:
+        return False
+    return time.time() - last_write_at < settings.read_your_writes_seconds
+
+
+def read_db_dependency(factory: async_sessionmaker) -> Callable[[Request], AsyncGenerator[AsyncSession, None]]:
+    async def _get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+        async with factory() as db:
+            if wrote_recently(request):
+                db.sync_session.info["use_primary"] = True
+            yield db
+
+    return _get_read_db
+
+
+# Read-only endpoints: served by DATABASE_READ_URL when set, else identical to get_async_db.
+get_async_read_db = read_db_dependency(AsyncReadSessionLocal)
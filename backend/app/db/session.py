@@ -1,6 +1,139 @@
+import time
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.sql.dml import UpdateBase
+
 from app.core.config import settings
+from app.metrics import (
+    DB_POOL_CHECKOUT_TIMEOUTS_TOTAL,
+    DB_POOL_CHECKOUT_WAIT_SECONDS,
+    DB_POOL_CONNECTIONS_IDLE,
+    DB_POOL_CONNECTIONS_IN_USE,
+)
+
+
+class _CheckoutTiming:
+    """Pool mixin that records how long callers wait for a connection."""
+
+    profile = "api"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS_TOTAL.labels(self.profile).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT_SECONDS.labels(self.profile).observe(time.perf_counter() - started)
+
+
+class InstrumentedQueuePool(_CheckoutTiming, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTiming, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(profile: str) -> dict:
+    """Pool and connection settings for the API (`api`) or Celery/dispatcher (`worker`) processes."""
+    worker = profile == "worker"
+    statement_timeout_ms = settings.db_worker_statement_timeout_ms if worker else settings.db_statement_timeout_ms
+    options = {
+        "pool_size": settings.db_worker_pool_size if worker else settings.db_pool_size,
+        "max_overflow": settings.db_worker_pool_max_overflow if worker else settings.db_pool_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+    }
+    if statement_timeout_ms > 0:
+        options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout_ms}"}
+    return options
+
+
+def _export_pool_gauges(engine, profile: str) -> None:
+    # Looked up on each scrape: dispose() swaps in a new pool object.
+    DB_POOL_CONNECTIONS_IN_USE.labels(profile).set_function(lambda: engine.pool.checkedout())
+    DB_POOL_CONNECTIONS_IDLE.labels(profile).set_function(lambda: engine.pool.checkedin())
+
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+def build_engine(url: str, profile: str):
+    if url.startswith("sqlite"):
+        # SQLite picks its own pool class; the sizing knobs do not apply.
+        return create_engine(url, pool_pre_ping=True)
+    pool_class = type(f"{profile.title()}QueuePool", (InstrumentedQueuePool,), {"profile": profile})
+    engine = create_engine(url, pool_pre_ping=True, poolclass=pool_class, **pool_options(profile))
+    _export_pool_gauges(engine, profile)
+    return engine
+
+
+def async_database_url(url: str) -> str:
+    """The same database through its asyncio driver (psycopg 3 serves both)."""
+    scheme, rest = url.split("://", 1)
+    if scheme.startswith("sqlite"):
+        return f"sqlite+aiosqlite://{rest}"
+    if scheme in {"postgresql", "postgresql+psycopg2"}:
+        return f"postgresql+psycopg://{rest}"
+    return url
+
+
+def build_async_engine(url: str, profile: str, label: str | None = None):
+    url = async_database_url(url)
+    if url.startswith("sqlite"):
+        return create_async_engine(url, pool_pre_ping=True)
+    label = label or f"{profile}_async"
+    pool_class = type(f"{profile.title()}AsyncQueuePool", (InstrumentedAsyncQueuePool,), {"profile": label})
+    engine = create_async_engine(url, pool_pre_ping=True, poolclass=pool_class, **pool_options(profile))
+    _export_pool_gauges(engine.sync_engine, label)
+    return engine
+
+
+class RoutingSession(Session):
+    """Session that sends reads to `info["replica"]` when one is configured.
+
+    Writes, flushes, and every statement after the session's first write go to
+    the primary. So do all statements once `info["use_primary"]` is set, which is
+    the read-your-writes fallback.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        replica = self.info.get("replica")
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["use_primary"] = True
+        if replica is None or self.info.get("use_primary"):
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        return replica
+
+
+def read_session_factory(primary, replica=None) -> async_sessionmaker:
+    return async_sessionmaker(
+        primary,
+        sync_session_class=RoutingSession,
+        info={"replica": replica.sync_engine if replica is not None else None},
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+engine = build_engine(settings.database_url, settings.db_pool_profile)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Read-heavy endpoints run on the event loop with this engine instead of a worker thread each.
+async_engine = build_async_engine(settings.database_url, settings.db_pool_profile)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+async_read_engine = (
+    build_async_engine(settings.database_read_url, settings.db_pool_profile, f"{settings.db_pool_profile}_replica")
+    if settings.database_read_url
+    else None
+)
+AsyncReadSessionLocal = read_session_factory(async_engine, async_read_engine)
+
+# Register the session hooks that keep channel_post_stats in step with posts and
+# evict the cached dashboard overview after commits that changed it.
+from app.repositories import channel_stats  # noqa: E402,F401
+from app.services import dashboard_cache  # noqa: E402,F401
@@ -1,4 +1,6 @@
 import logging
+import math
+import os
 import time
 from uuid import uuid4
 
@@ -13,7 +15,12 @@ from PIL import Image
 from app.api.router import api_router
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.db.deps import LAST_WRITE_COOKIE
+from app.db.session import async_engine, async_read_engine
 from app.metrics import HTTP_REQUESTS_TOTAL, HTTP_REQUEST_DURATION
+from app.services import audit_partitions
+from app.services import telegram as telegram_service
+from app.services import telegram_async as telegram_async_service
 
 try:
     # fastapi-limiter has multiple variants in the wild; some do not expose errors.RateLimitExceeded.
@@ -38,6 +45,9 @@ Image.MAX_IMAGE_PIXELS = settings.media_max_pixels
 
 class MediaStaticFiles(StaticFiles):
     async def get_response(self, path: str, scope) -> Response:
+        if path.split(os.sep, 1)[0] == audit_partitions.ARCHIVE_DIRNAME:
+            # Audit log archives share the media volume but are not public.
+            raise HTTPException(status_code=404)
         response = await super().get_response(path, scope)
         if response.status_code == 404 and path.startswith("previews/"):
             response = await super().get_response(path[len("previews/"):], scope)
@@ -67,6 +77,34 @@ async def setup_rate_limiter():
         logger.exception("rate_limiter_init_failed", extra={"redis_url": redis_url})
 
 
+@app.on_event("shutdown")
+async def close_telegram_clients():
+    telegram_service.close_client()
+    await telegram_async_service.close_async_client()
+
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await async_engine.dispose()
+    if async_read_engine is not None:
+        await async_read_engine.dispose()
+
+
+@app.middleware("http")
+async def mark_recent_write(request: Request, call_next):
+    response = await call_next(request)
+    if settings.database_read_url and request.method not in {"GET", "HEAD", "OPTIONS"} and response.status_code < 400:
+        # Read-your-writes: this client's replica-routed reads fall back to the primary for a while.
+        response.set_cookie(
+            LAST_WRITE_COOKIE,
+            f"{time.time():.3f}",
+            max_age=max(1, math.ceil(settings.read_your_writes_seconds)),
+            httponly=True,
+            samesite="lax",
+        )
+    return response
+
+
 @app.middleware("http")
 async def attach_request_id(request: Request, call_next):
     start = time.perf_counter()
@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 HTTP_REQUESTS_TOTAL = Counter(
     "http_requests_total",
@@ -43,3 +43,55 @@ PUBLISH_FAIL_TOTAL = Counter(
     "publish_fail_total",
     "Total failed publish operations",
 )
+
+TELEGRAM_OUTBOX_DELIVERED_TOTAL = Counter(
+    "telegram_outbox_delivered_total",
+    "Telegram outbox entries processed, by action and resulting status",
+    ["action", "status"],
+)
+
+TELEGRAM_EDITS_COALESCED_TOTAL = Counter(
+    "telegram_edits_coalesced_total",
+    "Post saves folded into an already queued Telegram edit",
+)
+
+TELEGRAM_RATE_LIMIT_WAIT_SECONDS = Histogram(
+    "telegram_rate_limit_wait_seconds",
+    "Time spent waiting for a Telegram send token",
+)
+
+TELEGRAM_FLOOD_WAIT_TOTAL = Counter(
+    "telegram_flood_wait_total",
+    "Telegram 429 responses carrying retry_after",
+)
+
+DB_POOL_CHECKOUT_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pool",
+    ["profile"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+DB_POOL_CHECKOUT_TIMEOUTS_TOTAL = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Pool checkouts that gave up after db_pool_timeout_seconds",
+    ["profile"],
+)
+
+DB_POOL_CONNECTIONS_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Database connections currently checked out of the pool",
+    ["profile"],
+)
+
+DB_POOL_CONNECTIONS_IDLE = Gauge(
+    "db_pool_connections_idle",
+    "Open database connections idle in the pool",
+    ["profile"],
+)
+
+DASHBOARD_CACHE_REQUESTS_TOTAL = Counter(
+    "dashboard_cache_requests_total",
+    "Dashboard overview requests by cache outcome (hit, waited, miss, bypass)",
+    ["result"],
+)
@@ -6,6 +6,9 @@ from app.models.source_item import SourceItem
 from app.models.audit_log import AuditLog
 from app.models.agent_settings import AgentSettings
 from app.models.suggestion import Suggestion
+from app.models.telegram_media_file import TelegramMediaFile
+from app.models.telegram_outbox import TelegramOutbox
+from app.models.channel_post_stats import ChannelPostStats
 from app.models.enums import UserRole, PostStatus
 
 __all__ = [
@@ -17,6 +20,9 @@ __all__ = [
     "AuditLog",
     "AgentSettings",
     "Suggestion",
+    "TelegramMediaFile",
+    "TelegramOutbox",
+    "ChannelPostStats",
     "UserRole",
     "PostStatus",
 ]
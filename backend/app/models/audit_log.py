@@ -1,11 +1,18 @@
 from datetime import datetime
-from sqlalchemy import String, DateTime, ForeignKey, JSON
+from sqlalchemy import String, DateTime, ForeignKey, Index, JSON
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
 
 
+# On Postgres the table is partitioned by month on created_at (migration 0016,
+# app.services.audit_partitions) and its primary key there is (id, created_at).
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_created_at_id", "created_at", "id"),
+        Index("ix_audit_logs_entity_created_at", "entity_type", "entity_id", "created_at"),
+        Index("ix_audit_logs_actor_created_at", "actor_user_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     entity_type: Mapped[str] = mapped_column(String(50))
@@ -0,0 +1,33 @@
+from datetime import datetime
+from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+from app.models.enums import PostStatus
+
+
+def count_column(status: PostStatus) -> str:
+    return f"{status.value}_count"
+
+
+# Per-channel post aggregates behind the dashboard, kept current on every post
+# change by app.repositories.channel_stats instead of GROUP BYs over posts.
+class ChannelPostStats(Base):
+    __tablename__ = "channel_post_stats"
+
+    channel_id: Mapped[int] = mapped_column(ForeignKey("channels.id", ondelete="CASCADE"), primary_key=True)
+    draft_count: Mapped[int] = mapped_column(default=0)
+    pending_count: Mapped[int] = mapped_column(default=0)
+    approved_count: Mapped[int] = mapped_column(default=0)
+    scheduled_count: Mapped[int] = mapped_column(default=0)
+    publishing_count: Mapped[int] = mapped_column(default=0)
+    published_count: Mapped[int] = mapped_column(default=0)
+    rejected_count: Mapped[int] = mapped_column(default=0)
+    failed_count: Mapped[int] = mapped_column(default=0)
+    # Earliest scheduled_at among scheduled posts; in the past means something is overdue.
+    first_scheduled_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_post_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_published_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    def status_counts(self) -> dict[PostStatus, int]:
+        counts = {status: int(getattr(self, count_column(status)) or 0) for status in PostStatus}
+        return {status: count for status, count in counts.items() if count}
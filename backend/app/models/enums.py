@@ -13,6 +13,8 @@ class PostStatus(str, enum.Enum):
     pending = "pending"
     approved = "approved"
     scheduled = "scheduled"
+    # Transient: claimed by a worker under a lease while the Telegram call runs.
+    publishing = "publishing"
     published = "published"
     rejected = "rejected"
     failed = "failed"
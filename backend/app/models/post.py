@@ -1,25 +1,69 @@
 from datetime import datetime
-from sqlalchemy import String, DateTime, ForeignKey, Text
+from sqlalchemy import Boolean, String, DateTime, ForeignKey, Index, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 from app.models.enums import PostStatus
 
 
+SCHEDULED = text("status = 'scheduled'")
+PUBLISHING = text("status = 'publishing'")
+HAS_ERROR = text("last_error IS NOT NULL")
+HAS_PUBLISHED_AT = text("published_at IS NOT NULL")
+
+
 class Post(Base):
     __tablename__ = "posts"
+    # Shaped after the hot queries (migration 0014): channel post lists, the
+    # dashboard aggregates, the publish beat/reaper and the recent-errors feed.
+    __table_args__ = (
+        Index("ix_posts_channel_status_created_at", "channel_id", "status", "created_at"),
+        Index("ix_posts_channel_created_at", "channel_id", "created_at"),
+        Index("ix_posts_scheduled_at_id", "scheduled_at", "id", postgresql_where=SCHEDULED, sqlite_where=SCHEDULED),
+        Index(
+            "ix_posts_scheduled_channel_at",
+            "channel_id",
+            "scheduled_at",
+            postgresql_where=SCHEDULED,
+            sqlite_where=SCHEDULED,
+        ),
+        Index(
+            "ix_posts_publishing_lease_expires_at",
+            "lease_expires_at",
+            postgresql_where=PUBLISHING,
+            sqlite_where=PUBLISHING,
+        ),
+        Index("ix_posts_errors_updated_at", "updated_at", postgresql_where=HAS_ERROR, sqlite_where=HAS_ERROR),
+        Index(
+            "ix_posts_channel_published_at",
+            "channel_id",
+            "published_at",
+            postgresql_where=HAS_PUBLISHED_AT,
+            sqlite_where=HAS_PUBLISHED_AT,
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    channel_id: Mapped[int] = mapped_column(ForeignKey("channels.id"), index=True)
+    # active_history: channel_post_stats needs the previous value even when it was never loaded.
+    channel_id: Mapped[int] = mapped_column(ForeignKey("channels.id"), index=True, active_history=True)
     title: Mapped[str] = mapped_column(String(255))
     body_text: Mapped[str] = mapped_column(Text)
     media_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
-    status: Mapped[PostStatus] = mapped_column(default=PostStatus.draft, index=True)
-    scheduled_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
-    published_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    status: Mapped[PostStatus] = mapped_column(default=PostStatus.draft, index=True, active_history=True)
+    scheduled_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, active_history=True)
+    published_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, active_history=True)
     telegram_message_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
     last_known_views: Mapped[int | None] = mapped_column(nullable=True)
     publish_attempts: Mapped[int] = mapped_column(default=0)
     last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    lease_owner: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    next_retry_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Latest publish-now job; GET /posts/{id}/publish-jobs/{job_id} only answers for it.
+    publish_job_id: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    # Digest of the text + media last accepted by Telegram (see services.post_render).
+    telegram_fingerprint: Mapped[str | None] = mapped_column(String(65), nullable=True)
+    # An edit of the published message is queued in telegram_outbox.
+    sync_pending: Mapped[bool] = mapped_column(Boolean, default=False)
     created_by: Mapped[int] = mapped_column(ForeignKey("users.id"))
     updated_by: Mapped[int] = mapped_column(ForeignKey("users.id"))
     editor_comment: Mapped[str | None] = mapped_column(Text, nullable=True)
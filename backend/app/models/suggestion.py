@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import String, DateTime, ForeignKey, Text, UniqueConstraint
+from sqlalchemy import String, DateTime, ForeignKey, Index, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 
@@ -8,6 +8,8 @@ class Suggestion(Base):
     __tablename__ = "suggestions"
     __table_args__ = (
         UniqueConstraint("channel_id", "source_hash", name="uq_suggestions_channel_source_hash"),
+        Index("ix_suggestions_created_at_id", "created_at", "id"),
+        Index("ix_suggestions_channel_created_at", "channel_id", "created_at"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -0,0 +1,20 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+# Telegram file_id of a local /media upload, so later sends can skip re-uploading the bytes.
+class TelegramMediaFile(Base):
+    __tablename__ = "telegram_media_files"
+    __table_args__ = (
+        UniqueConstraint("bot_id", "media_path", name="uq_telegram_media_files_bot_media_path"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # file_ids are only valid for the bot that uploaded the file.
+    bot_id: Mapped[str] = mapped_column(String(64))
+    media_path: Mapped[str] = mapped_column(String(500))
+    file_id: Mapped[str] = mapped_column(String(255))
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
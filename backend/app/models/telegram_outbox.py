@@ -0,0 +1,32 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime, Index, Integer, JSON, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+# Telegram side effects (edits, deletes) written in the same transaction as the
+# post change and delivered by a worker.
+class TelegramOutbox(Base):
+    __tablename__ = "telegram_outbox"
+    __table_args__ = (
+        Index("ix_telegram_outbox_status_available_at", "status", "available_at"),
+        Index("ix_telegram_outbox_post_id_status", "post_id", "status"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # No foreign key: a delete outlives its post row.
+    post_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    action: Mapped[str] = mapped_column(String(16))
+    chat_id: Mapped[str] = mapped_column(String(255))
+    message_id: Mapped[str] = mapped_column(String(64))
+    payload_json: Mapped[dict] = mapped_column(JSON, default=dict)
+    # pending | sent | failed | superseded | skipped
+    status: Mapped[str] = mapped_column(String(16), default="pending")
+    attempts: Mapped[int] = mapped_column(default=0)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # A claim pushes available_at forward by the lease, so a crashed worker's rows
+    # become deliverable again on their own.
+    available_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    lease_owner: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    delivered_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -0,0 +1,183 @@
+"""Incremental maintenance of channel_post_stats.
+
+Status counts move by deltas. The three timestamps are re-read from posts with a
+single index seek each (migration 0014's per-channel indexes), so keeping the
+table current costs the same however many posts a channel has. They are read
+only after the stats row is locked: under READ COMMITTED a statement started
+after the lock wait sees the posts of every writer that held the lock before.
+
+ORM changes to posts are picked up by the session flush hooks below. Bulk
+UPDATEs that bypass the unit of work (publish claims, the lease reaper) record
+their own deltas with `record_move` and `apply`.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+from sqlalchemy import delete, event, func, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.channel_post_stats import ChannelPostStats, count_column
+from app.models.enums import PostStatus
+from app.models.post import Post
+
+_PENDING_KEY = "channel_stats_pending"
+# Set on a session whose transaction changed channel_post_stats; read after commit (dashboard cache).
+CHANGED_KEY = "channel_stats_changed"
+
+
+@dataclass
+class ChannelDelta:
+    counts: Counter = field(default_factory=Counter)
+    scheduled: bool = False
+    created: bool = False
+    published: bool = False
+
+    def __bool__(self) -> bool:
+        return any(self.counts.values()) or self.scheduled or self.created or self.published
+
+
+Deltas = dict[int, ChannelDelta]
+
+
+def _delta(deltas: Deltas, channel_id: int) -> ChannelDelta:
+    return deltas.setdefault(int(channel_id), ChannelDelta())
+
+
+def record_move(deltas: Deltas, channel_id: int, from_status, to_status) -> None:
+    from_status, to_status = PostStatus(from_status), PostStatus(to_status)
+    delta = _delta(deltas, channel_id)
+    delta.counts[from_status] -= 1
+    delta.counts[to_status] += 1
+    if PostStatus.scheduled in (from_status, to_status):
+        delta.scheduled = True
+
+
+def _record_new(deltas: Deltas, post: Post) -> None:
+    delta = _delta(deltas, post.channel_id)
+    delta.counts[PostStatus(post.status)] += 1
+    delta.created = True
+    delta.scheduled |= post.status == PostStatus.scheduled
+    delta.published |= post.published_at is not None
+
+
+def _record_deleted(deltas: Deltas, post: Post) -> None:
+    delta = _delta(deltas, post.channel_id)
+    delta.counts[PostStatus(post.status)] -= 1
+    delta.created = True
+    delta.scheduled |= post.status == PostStatus.scheduled
+    delta.published |= post.published_at is not None
+
+
+def _change(state, key: str):
+    history = state.attrs[key].history
+    if not history.has_changes():
+        value = history.unchanged[0] if history.unchanged else getattr(state.obj(), key)
+        return value, value, False
+    old = history.deleted[0] if history.deleted else None
+    new = history.added[0] if history.added else None
+    return old, new, True
+
+
+def _record_dirty(deltas: Deltas, post: Post) -> None:
+    state = inspect(post)
+    old_channel, new_channel, moved = _change(state, "channel_id")
+    old_status, new_status, status_changed = _change(state, "status")
+    _, _, scheduled_changed = _change(state, "scheduled_at")
+    _, _, published_changed = _change(state, "published_at")
+    if not (moved or status_changed or scheduled_changed or published_changed):
+        return
+    if moved or status_changed:
+        _delta(deltas, old_channel).counts[PostStatus(old_status)] -= 1
+        _delta(deltas, new_channel).counts[PostStatus(new_status)] += 1
+    touches_scheduled = PostStatus.scheduled in (old_status, new_status)
+    for channel_id in {old_channel, new_channel}:
+        delta = _delta(deltas, channel_id)
+        delta.scheduled |= touches_scheduled and (moved or status_changed or scheduled_changed)
+        delta.created |= moved
+        delta.published |= moved or published_changed
+
+
+def _insert_missing_row(db, channel_id: int) -> None:
+    dialect = db.get_bind().dialect.name if isinstance(db, Session) else db.dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    db.execute(insert(ChannelPostStats).values(channel_id=channel_id).on_conflict_do_nothing())
+
+
+def _lock_row(db, channel_id: int) -> bool:
+    stmt = select(ChannelPostStats.channel_id).where(ChannelPostStats.channel_id == channel_id).with_for_update()
+    return db.execute(stmt).first() is not None
+
+
+def _timestamps(db, channel_id: int, delta: ChannelDelta) -> dict:
+    channel_posts = select().select_from(Post).where(Post.channel_id == channel_id)
+    values = {}
+    if delta.scheduled:
+        values["first_scheduled_at"] = db.execute(
+            channel_posts.add_columns(func.min(Post.scheduled_at)).where(Post.status == PostStatus.scheduled)
+        ).scalar()
+    if delta.created:
+        values["last_post_at"] = db.execute(channel_posts.add_columns(func.max(Post.created_at))).scalar()
+    if delta.published:
+        values["last_published_at"] = db.execute(
+            channel_posts.add_columns(func.max(Post.published_at)).where(Post.published_at.is_not(None))
+        ).scalar()
+    return values
+
+
+def apply(db, deltas: Deltas) -> None:
+    """Write `deltas` to channel_post_stats (Session or Connection; no commit).
+
+    Channels are updated in id order so concurrent writers lock rows in the same order.
+    """
+    for channel_id in sorted(deltas):
+        delta = deltas[channel_id]
+        if not delta:
+            continue
+        values = {}
+        for status, change in delta.counts.items():
+            if change:
+                column = getattr(ChannelPostStats, count_column(status))
+                values[column.key] = column + change
+        if delta.scheduled or delta.created or delta.published:
+            # Lock first, then read: a subquery inside the UPDATE would use the snapshot
+            # taken before the lock wait and miss the previous holder's posts.
+            if not _lock_row(db, channel_id):
+                _insert_missing_row(db, channel_id)
+                _lock_row(db, channel_id)
+            values.update(_timestamps(db, channel_id, delta))
+        stmt = update(ChannelPostStats).where(ChannelPostStats.channel_id == channel_id).values(values)
+        if db.execute(stmt.execution_options(synchronize_session=False)).rowcount == 0:
+            _insert_missing_row(db, channel_id)
+            db.execute(stmt.execution_options(synchronize_session=False))
+    if isinstance(db, Session) and any(deltas.values()):
+        db.info[CHANGED_KEY] = True
+
+
+def delete_for_channel(db: Session, channel_id: int) -> None:
+    db.execute(delete(ChannelPostStats).where(ChannelPostStats.channel_id == int(channel_id)))
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_changes(session: Session, _flush_context, _instances) -> None:
+    # Dirty and deleted rows are read before the flush, while their old state still exists.
+    deltas = session.info.setdefault(_PENDING_KEY, {})
+    for obj in session.dirty:
+        if isinstance(obj, Post):
+            _record_dirty(deltas, obj)
+    for obj in session.deleted:
+        if isinstance(obj, Post):
+            _record_deleted(deltas, obj)
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_changes(session: Session, _flush_context) -> None:
+    # New rows are read after it, once column defaults (e.g. status) are populated.
+    deltas = session.info.pop(_PENDING_KEY, {})
+    for obj in session.new:
+        if isinstance(obj, Post):
+            _record_new(deltas, obj)
+    if any(deltas.values()):
+        session.info[CHANGED_KEY] = True
+        apply(session.connection(), deltas)
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from app.models.channel import Channel
 from app.models.post import Post
 from app.models.source_item import SourceItem
+from app.repositories import channel_stats
 
 
 def list_channels(db: Session) -> list[Channel]:
@@ -25,6 +26,8 @@ def create_channel(db: Session, channel: Channel) -> Channel:
 
 
 def delete_channel(db: Session, channel: Channel) -> None:
+    # Its posts went through a bulk DELETE, which the stats flush hooks do not see.
+    channel_stats.delete_for_channel(db, channel.id)
     db.delete(channel)
     db.commit()
 
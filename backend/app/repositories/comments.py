@@ -1,7 +1,10 @@
+from datetime import datetime
+
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models.post_comment import PostComment
+from app.repositories.pagination import after
 
 
 def create_comment(db: Session, comment: PostComment) -> PostComment:
@@ -11,16 +14,20 @@ def create_comment(db: Session, comment: PostComment) -> PostComment:
     return comment
 
 
-def list_comments_for_post(db: Session, post_id: int, limit: int = 100, offset: int = 0) -> list[PostComment]:
+def list_comments_for_post(
+    db: Session,
+    post_id: int,
+    limit: int = 100,
+    offset: int = 0,
+    position: tuple[datetime, int] | None = None,
+) -> list[PostComment]:
     safe_limit = max(1, min(int(limit), 200))
     safe_offset = max(0, int(offset))
-    stmt = (
-        select(PostComment)
-        .where(PostComment.post_id == int(post_id))
-        .order_by(PostComment.created_at.asc())
-        .limit(safe_limit)
-        .offset(safe_offset)
-    )
+    stmt = select(PostComment).where(PostComment.post_id == int(post_id))
+    if position is not None:
+        stmt = stmt.where(after(PostComment.created_at, PostComment.id, position, descending=False))
+        safe_offset = 0
+    stmt = stmt.order_by(PostComment.created_at.asc(), PostComment.id.asc()).limit(safe_limit).offset(safe_offset)
     rows = db.execute(stmt).scalars().all()
     return list(rows)
 
@@ -0,0 +1,115 @@
+"""Opaque keyset cursors and list totals for list endpoints.
+
+A cursor encodes the (sort timestamp, id) of the last row of a page, so the next
+page is an index range scan from that point instead of an OFFSET that reads and
+discards every earlier row. Offsets keep working alongside for compatibility.
+"""
+
+import base64
+import binascii
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Literal
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, literal, or_, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+TotalMode = Literal["exact", "estimated", "none"]
+
+logger = logging.getLogger("pagination")
+_COUNT_CACHE_MAX_ENTRIES = 1024
+_count_cache: dict[tuple, tuple[float, int]] = {}
+
+
+def encode_cursor(scope: str, sort_value: datetime | None, row_id: int) -> str:
+    payload = {"s": scope, "k": sort_value.isoformat() if sort_value else None, "i": int(row_id)}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(scope: str, cursor: str) -> tuple[datetime | None, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload["s"] != scope:
+            raise ValueError("cursor scope mismatch")
+        sort_value = datetime.fromisoformat(payload["k"]) if payload["k"] is not None else None
+        return sort_value, int(payload["i"])
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def next_cursor(scope: str, rows, limit: int, sort_attr: str) -> str | None:
+    """Cursor for the page after `rows`, or None when this page was the last one."""
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    get = last.get if isinstance(last, dict) else lambda name: getattr(last, name)
+    return encode_cursor(scope, get(sort_attr), get("id"))
+
+
+def after(sort_col, id_col, position: tuple[datetime | None, int], *, descending: bool, nulls_last: bool = False):
+    """WHERE clause selecting rows strictly after `position` in (sort_col, id_col) order.
+
+    Uses a row-value comparison so Postgres can seek a composite index directly.
+    With `nulls_last`, rows whose sort value is NULL follow all others (ascending only).
+    """
+    sort_value, row_id = position
+    id_value = literal(row_id, id_col.type)
+    if sort_value is None:
+        return and_(sort_col.is_(None), id_col > id_value)
+    key = tuple_(sort_col, id_col)
+    bound = tuple_(literal(sort_value, sort_col.type), id_value)
+    clause = key < bound if descending else key > bound
+    if nulls_last:
+        clause = or_(clause, sort_col.is_(None))
+    return clause
+
+
+def _planner_rows(db: Session, rows_stmt) -> int | None:
+    try:
+        sql = str(rows_stmt.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}))
+        # Savepoint: a failed EXPLAIN must not abort the request's transaction.
+        with db.begin_nested():
+            plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+    except Exception as exc:  # pragma: no cover - depends on the statement and server
+        logger.warning("count_estimate_failed", extra={"error": str(exc)})
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_total(db: Session, count_stmt, rows_stmt, *, mode: TotalMode, cache_key: tuple) -> int | None:
+    """Total for a list page according to `mode`.
+
+    "estimated" serves a recently computed total for the same filters when there is
+    one. Otherwise, on Postgres, it takes the planner's row estimate for `rows_stmt`
+    when that is large (where exact counts hurt), and falls back to an exact count
+    that is cached for `list_count_cache_seconds`.
+    """
+    if mode == "none":
+        return None
+    if mode == "exact":
+        return int(db.execute(count_stmt).scalar_one())
+
+    now = time.monotonic()
+    cached = _count_cache.get(cache_key)
+    if cached and cached[0] > now:
+        return cached[1]
+    total = None
+    if db.get_bind().dialect.name == "postgresql":
+        estimate = _planner_rows(db, rows_stmt)
+        if estimate is not None and estimate >= settings.list_count_estimate_min_rows:
+            total = estimate
+    if total is None:
+        total = int(db.execute(count_stmt).scalar_one())
+    if len(_count_cache) >= _COUNT_CACHE_MAX_ENTRIES:
+        _count_cache.clear()
+    _count_cache[cache_key] = (now + settings.list_count_cache_seconds, total)
+    return total
@@ -1,8 +1,13 @@
-from sqlalchemy import func, select
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
+from app.models.enums import PostStatus
 from app.models.post import Post
 from app.models.source_item import SourceItem
+from app.repositories import channel_stats
+from app.repositories.pagination import after
 
 EXCERPT_CHARS = 200
 MAX_LIST_LIMIT = 200
@@ -19,7 +24,9 @@ def list_posts_compact(
     status_filters,
     limit: int = DEFAULT_LIST_LIMIT,
     offset: int = 0,
+    position: tuple[datetime, int] | None = None,
 ) -> list[dict]:
+    """Newest first; `position` (created_at, id of the previous page's last row) replaces `offset`."""
     safe_limit = max(1, min(limit, MAX_LIST_LIMIT))
     safe_offset = max(0, offset)
     stmt = select(
@@ -33,6 +40,7 @@ def list_posts_compact(
         Post.published_at,
         Post.telegram_message_id,
         Post.last_known_views,
+        Post.sync_pending,
         Post.last_error,
         Post.editor_comment,
         Post.created_at,
@@ -40,11 +48,21 @@ def list_posts_compact(
     ).where(Post.channel_id == channel_id)
     if status_filters:
         stmt = stmt.where(Post.status.in_(status_filters))
-    stmt = stmt.order_by(Post.created_at.desc()).limit(safe_limit).offset(safe_offset)
+    if position is not None:
+        stmt = stmt.where(after(Post.created_at, Post.id, position, descending=True))
+        safe_offset = 0
+    stmt = stmt.order_by(Post.created_at.desc(), Post.id.desc()).limit(safe_limit).offset(safe_offset)
     rows = db.execute(stmt).all()
     return [dict(row._mapping) for row in rows]
 
 
+def channel_ids_for_posts(db: Session, post_ids: list[int]) -> dict[int, int]:
+    if not post_ids:
+        return {}
+    rows = db.execute(select(Post.id, Post.channel_id).where(Post.id.in_(post_ids))).all()
+    return {int(row.id): int(row.channel_id) for row in rows}
+
+
 def update_last_known_views(db: Session, post_id: int, views: int) -> None:
     db.query(Post).filter(Post.id == post_id).update({Post.last_known_views: views}, synchronize_session=False)
     db.commit()
@@ -69,5 +87,124 @@ def delete_post(db: Session, post: Post) -> None:
     db.commit()
 
 
+def _claimable(post_ids: list[int], *, from_statuses, due_before: datetime | None) -> list:
+    conditions = [Post.id.in_(post_ids), Post.status.in_(list(from_statuses))]
+    if due_before is not None:
+        conditions += [Post.scheduled_at.is_not(None), Post.scheduled_at <= due_before]
+    return conditions
+
+
+def _claim(
+    db: Session, post_ids: list[int], *, owner: str, lease_seconds: int, from_statuses, due_before: datetime | None
+) -> list[int]:
+    conditions = _claimable(post_ids, from_statuses=from_statuses, due_before=due_before)
+    # Locked so the statuses read here are the ones the UPDATE replaces (for channel_post_stats).
+    candidates = db.execute(select(Post.id, Post.channel_id, Post.status).where(*conditions).with_for_update()).all()
+    if not candidates:
+        return []
+    now = datetime.utcnow()
+    db.execute(
+        update(Post)
+        .where(*conditions)
+        .values(
+            status=PostStatus.publishing,
+            lease_owner=owner,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    # The owner token is unique per claim, so it identifies exactly the rows this call won.
+    claimed = set(
+        db.execute(select(Post.id).where(Post.id.in_(post_ids)).where(Post.lease_owner == owner)).scalars().all()
+    )
+    deltas: channel_stats.Deltas = {}
+    for post_id, channel_id, from_status in candidates:
+        if post_id in claimed:
+            channel_stats.record_move(deltas, channel_id, from_status, PostStatus.publishing)
+    channel_stats.apply(db, deltas)
+    return [int(post_id) for post_id, _, _ in candidates if post_id in claimed]
+
+
+def claim_for_publishing(
+    db: Session,
+    post_id: int,
+    *,
+    owner: str,
+    lease_seconds: int,
+    from_statuses,
+    due_before: datetime | None = None,
+) -> bool:
+    """Atomically move a post to `publishing` under a lease and commit at once.
+
+    The conditional UPDATE is the claim: only one caller can match the row, and no
+    row lock is held while the Telegram call runs afterwards.
+    """
+    claimed = _claim(
+        db, [post_id], owner=owner, lease_seconds=lease_seconds, from_statuses=from_statuses, due_before=due_before
+    )
+    db.commit()
+    return bool(claimed)
+
+
+def claim_many_for_publishing(
+    db: Session,
+    post_ids: list[int],
+    *,
+    owner: str,
+    lease_seconds: int,
+    from_statuses,
+    due_before: datetime | None = None,
+) -> list[int]:
+    if not post_ids:
+        return []
+    claimed = _claim(
+        db, post_ids, owner=owner, lease_seconds=lease_seconds, from_statuses=from_statuses, due_before=due_before
+    )
+    db.commit()
+    return claimed
+
+
+def renew_leases(db: Session, post_ids: list[int], *, owner: str, lease_seconds: int) -> list[int]:
+    """Push back the expiry of the leases `owner` still holds; commits, returns their ids."""
+    if not post_ids:
+        return []
+    owned = [Post.id.in_(post_ids), Post.status == PostStatus.publishing, Post.lease_owner == owner]
+    db.execute(
+        update(Post)
+        .where(*owned)
+        .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=lease_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    held = db.execute(select(Post.id).where(*owned)).scalars().all()
+    db.commit()
+    return [int(post_id) for post_id in held]
+
+
+def release_expired_leases(db: Session, now: datetime | None = None) -> list[int]:
+    """Return posts whose publishing lease expired to the scheduled queue (due now)."""
+    now = now or datetime.utcnow()
+    expired = db.execute(
+        select(Post.id, Post.channel_id)
+        .where(Post.status == PostStatus.publishing)
+        .where(Post.lease_expires_at < now)
+        .with_for_update()
+    ).all()
+    if not expired:
+        return []
+    expired_ids = [int(post_id) for post_id, _ in expired]
+    db.execute(
+        update(Post)
+        .where(Post.id.in_(expired_ids))
+        .values(status=PostStatus.scheduled, scheduled_at=now, lease_owner=None, lease_expires_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    deltas: channel_stats.Deltas = {}
+    for _, channel_id in expired:
+        channel_stats.record_move(deltas, channel_id, PostStatus.publishing, PostStatus.scheduled)
+    channel_stats.apply(db, deltas)
+    db.commit()
+    return expired_ids
+
+
 def delete_source_items_for_post(db: Session, post_id: int) -> None:
     db.query(SourceItem).filter(SourceItem.post_id == post_id).delete(synchronize_session=False)
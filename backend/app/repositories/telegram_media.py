@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.telegram_media_file import TelegramMediaFile
+
+
+def get_file_id(db: Session, bot_id: str, media_path: str) -> str | None:
+    stmt = select(TelegramMediaFile.file_id).where(
+        TelegramMediaFile.bot_id == bot_id,
+        TelegramMediaFile.media_path == media_path,
+    )
+    return db.execute(stmt).scalar_one_or_none()
+
+
+def save_file_id(db: Session, bot_id: str, media_path: str, file_id: str) -> None:
+    # Upsert so that two workers uploading the same image concurrently cannot fail
+    # the caller's transaction on the unique constraint. Does not commit.
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    now = datetime.utcnow()
+    stmt = insert(TelegramMediaFile).values(
+        bot_id=bot_id,
+        media_path=media_path,
+        file_id=file_id,
+        created_at=now,
+        updated_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TelegramMediaFile.bot_id, TelegramMediaFile.media_path],
+        set_={"file_id": file_id, "updated_at": now},
+    )
+    db.execute(stmt)
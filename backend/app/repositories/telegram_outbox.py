@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session, aliased
+
+from app.models.telegram_outbox import TelegramOutbox
+
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+SUPERSEDED = "superseded"
+SKIPPED = "skipped"
+
+
+def add_entry(db: Session, entry: TelegramOutbox) -> TelegramOutbox:
+    # Does not commit: the entry must land in the caller's transaction.
+    db.add(entry)
+    return entry
+
+
+def claim_batch(db: Session, *, owner: str, limit: int, lease_seconds: int) -> list[TelegramOutbox]:
+    """Claim deliverable entries and commit the claim.
+
+    Only the oldest pending entry of each post is claimable, so the operations
+    on one message are delivered in order even with several workers.
+    """
+    now = datetime.utcnow()
+    older = aliased(TelegramOutbox)
+    oldest_of_post = (
+        select(func.min(older.id))
+        .where(older.post_id == TelegramOutbox.post_id)
+        .where(older.status == PENDING)
+        .scalar_subquery()
+    )
+    candidates = (
+        select(TelegramOutbox.id)
+        .where(TelegramOutbox.status == PENDING)
+        .where(TelegramOutbox.available_at <= now)
+        .where((TelegramOutbox.post_id.is_(None)) | (TelegramOutbox.id == oldest_of_post))
+        .order_by(TelegramOutbox.id.asc())
+        .limit(limit)
+    )
+    ids = [int(row_id) for row_id in db.execute(candidates).scalars().all()]
+    if not ids:
+        return []
+    db.execute(
+        update(TelegramOutbox)
+        .where(TelegramOutbox.id.in_(ids))
+        .where(TelegramOutbox.status == PENDING)
+        .where(TelegramOutbox.available_at <= now)
+        .values(lease_owner=owner, available_at=now + timedelta(seconds=lease_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    stmt = (
+        select(TelegramOutbox)
+        .where(TelegramOutbox.id.in_(ids))
+        .where(TelegramOutbox.lease_owner == owner)
+        .order_by(TelegramOutbox.id.asc())
+    )
+    return list(db.execute(stmt).scalars().all())
+
+
+def coalesce_edit(
+    db: Session,
+    post_id: int,
+    payload: dict,
+    *,
+    now: datetime,
+    window_seconds: float,
+    max_delay_seconds: float,
+) -> bool:
+    """Fold new content into the post's pending, not yet claimed edit; does not commit.
+
+    Each fold restarts the quiet window, bounded by `max_delay_seconds` after the
+    first save of the burst. Returns False when there is nothing to fold into.
+    """
+    entry = db.execute(
+        select(TelegramOutbox)
+        .where(TelegramOutbox.post_id == post_id)
+        .where(TelegramOutbox.action == "edit")
+        .where(TelegramOutbox.status == PENDING)
+        .where(TelegramOutbox.lease_owner.is_(None))
+        .where(TelegramOutbox.attempts == 0)
+        .order_by(TelegramOutbox.id.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+    if entry is None:
+        return False
+    available_at = min(
+        now + timedelta(seconds=window_seconds),
+        entry.created_at + timedelta(seconds=max_delay_seconds),
+    )
+    # Conditional on the row still being unclaimed: a worker may claim it concurrently.
+    stmt = (
+        update(TelegramOutbox)
+        .where(TelegramOutbox.id == entry.id)
+        .where(TelegramOutbox.status == PENDING)
+        .where(TelegramOutbox.lease_owner.is_(None))
+        .values(payload_json=payload, available_at=available_at)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).rowcount == 1
+
+
+def supersede_unclaimed_edits(db: Session, post_id: int, now: datetime) -> None:
+    # Does not commit.
+    db.execute(
+        update(TelegramOutbox)
+        .where(TelegramOutbox.post_id == post_id)
+        .where(TelegramOutbox.action == "edit")
+        .where(TelegramOutbox.status == PENDING)
+        .where(TelegramOutbox.lease_owner.is_(None))
+        .values(status=SUPERSEDED, delivered_at=now)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def has_newer_pending(db: Session, entry: TelegramOutbox) -> bool:
+    stmt = (
+        select(TelegramOutbox.id)
+        .where(TelegramOutbox.post_id == entry.post_id)
+        .where(TelegramOutbox.status == PENDING)
+        .where(TelegramOutbox.id > entry.id)
+        .limit(1)
+    )
+    return db.execute(stmt).first() is not None
+
+
+def count_pending_for_post(db: Session, post_id: int) -> int:
+    stmt = (
+        select(func.count())
+        .select_from(TelegramOutbox)
+        .where(TelegramOutbox.post_id == post_id)
+        .where(TelegramOutbox.status == PENDING)
+    )
+    return int(db.execute(stmt).scalar_one())
@@ -16,7 +16,11 @@ class AuditLogOut(BaseModel):
 
 class AuditLogListOut(BaseModel):
     items: list[AuditLogOut]
-    total: int
+    # None with total_mode=none; approximate with total_mode=estimated.
+    total: int | None
+    total_mode: str = "exact"
     limit: int
     offset: int
+    # Pass back as `cursor` to fetch the next page; None on the last page.
+    next_cursor: str | None = None
 
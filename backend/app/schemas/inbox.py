@@ -17,7 +17,9 @@ class SuggestionInboxItem(BaseModel):
 
 class SuggestionInboxOut(BaseModel):
     items: list[SuggestionInboxItem]
-    total: int
+    total: int | None
+    total_mode: str = "exact"
     limit: int
     offset: int
+    next_cursor: str | None = None
 
@@ -27,6 +27,8 @@ class PostOut(BaseModel):
     telegram_message_id: str | None
     last_known_views: int | None
     publish_attempts: int
+    next_retry_at: datetime | None = None
+    sync_pending: bool = False
     last_error: str | None
     editor_comment: str | None
     created_at: datetime
@@ -46,12 +48,21 @@ class PostListOut(BaseModel):
     scheduled_at: datetime | None
     published_at: datetime | None
     last_known_views: int | None
+    sync_pending: bool = False
     last_error: str | None
     editor_comment: str | None
     created_at: datetime
     updated_at: datetime
 
 
+class PublishJobOut(BaseModel):
+    job_id: str
+    post_id: int
+    # pending | published | retry_scheduled | failed
+    state: str
+    post: PostOut
+
+
 class ScheduleRequest(BaseModel):
     scheduled_at: datetime
 
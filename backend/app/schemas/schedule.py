@@ -18,9 +18,11 @@ class ScheduledPostItem(BaseModel):
 
 class ScheduledPostListOut(BaseModel):
     items: list[ScheduledPostItem]
-    total: int
+    total: int | None
+    total_mode: str = "exact"
     limit: int
     offset: int
+    next_cursor: str | None = None
 
 
 class RequeueRequest(BaseModel):
@@ -25,6 +25,7 @@ class UsersListOut(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: str | None = None
 
 
 class UserRoleUpdate(BaseModel):
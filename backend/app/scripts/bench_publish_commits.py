@@ -0,0 +1,148 @@
+"""Count database commits per published post: baseline vs per-post tasks vs batch tasks.
+
+Runs against an in-memory SQLite database with Telegram, Redis-backed services
+(publish queue, change events, dashboard cache) stubbed out, so it measures the
+transaction pattern, not network latency. "baseline" replays the flow before
+single-commit outcomes on the same seeded rows: due posts locked in one
+transaction, then per post a commit for the status update and one for the audit
+row. Per-post tasks also cost two commits per post (the claim must be committed
+before Telegram is called); only batch mode reduces commits per post.
+
+    python -m app.scripts.bench_publish_commits --posts 500 --batch 50
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("APP_SECRET", "bench")
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+from sqlalchemy import create_engine, event, func, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.db import base_class_imports  # noqa: F401,E402
+from app.db.base import Base  # noqa: E402
+from app.models.audit_log import AuditLog  # noqa: E402
+from app.models.channel import Channel  # noqa: E402
+from app.models.enums import PostStatus, UserRole  # noqa: E402
+from app.models.post import Post  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services import dashboard_cache, events, publisher  # noqa: E402
+from app.services.audit import log_action  # noqa: E402
+from app.services.telegram import TelegramResult  # noqa: E402
+from app.workers import tasks  # noqa: E402
+
+
+def _seed(session_factory, posts: int) -> list[int]:
+    db = session_factory()
+    try:
+        channel = Channel(title="Bench", telegram_channel_identifier="@bench")
+        user = User(email="bench@example.com", password_hash="-", role=UserRole.editor)
+        db.add_all([channel, user])
+        db.commit()
+        due = datetime.utcnow() - timedelta(minutes=1)
+        rows = [
+            Post(
+                channel_id=channel.id,
+                title=f"Post {i}",
+                body_text="Body",
+                status=PostStatus.scheduled,
+                scheduled_at=due,
+                created_by=user.id,
+                updated_by=user.id,
+            )
+            for i in range(posts)
+        ]
+        db.add_all(rows)
+        db.commit()
+        return [post.id for post in rows]
+    finally:
+        db.close()
+
+
+def _publish_baseline(session_factory) -> None:
+    db = session_factory()
+    try:
+        posts = (
+            db.query(Post)
+            .filter(Post.status == PostStatus.scheduled)
+            .filter(Post.scheduled_at <= datetime.utcnow())
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        for post in posts:
+            actor_user_id = post.updated_by or post.created_by
+            result = publisher.publish_message(post.channel_id, post.body_text, post.media_url)
+            post.status = PostStatus.published
+            post.published_at = datetime.utcnow()
+            post.telegram_message_id = result.message_id
+            post.updated_by = actor_user_id
+            db.commit()
+            log_action(db, "post", post.id, "publish", actor_user_id, {"status": post.status})
+            db.commit()
+    finally:
+        db.close()
+
+
+def _run(mode: str, posts: int, batch: int) -> float:
+    engine = create_engine("sqlite+pysqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    post_ids = _seed(session_factory, posts)
+
+    commits = 0
+
+    def _count(_conn):
+        nonlocal commits
+        commits += 1
+
+    event.listen(engine, "commit", _count)
+    tasks.SessionLocal = session_factory
+    started = time.perf_counter()
+    if mode == "baseline":
+        _publish_baseline(session_factory)
+    elif mode == "per-post":
+        for post_id in post_ids:
+            tasks.publish_post_task(post_id)
+    else:
+        for start in range(0, len(post_ids), batch):
+            tasks.publish_posts_batch_task(post_ids[start : start + batch])
+    elapsed = time.perf_counter() - started
+
+    with session_factory() as db:
+        published = db.scalar(select(func.count()).select_from(Post).where(Post.status == PostStatus.published))
+        audited = db.scalar(select(func.count()).select_from(AuditLog))
+    per_post = commits / max(published, 1)
+    print(
+        f"{mode:>8}: {published} published, {audited} audit rows, {commits} commits "
+        f"({per_post:.2f}/post), {elapsed:.2f}s"
+    )
+    return per_post
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=50)
+    args = parser.parse_args()
+
+    publisher.publish_message = lambda *_args, **_kwargs: TelegramResult(ok=True, message_id="1", error=None)
+    tasks.publish_queue.release = lambda _post_id: None
+    tasks.publish_queue.schedule = lambda _post_id, _when: None
+    events.publish = lambda _event_type, _data: None
+    dashboard_cache.invalidate = lambda: None
+
+    baseline = _run("baseline", args.posts, args.batch)
+    per_post = _run("per-post", args.posts, args.batch)
+    batch = _run("batch", args.posts, args.batch)
+    print(
+        f"per-post tasks: {per_post:.2f} vs baseline {baseline:.2f} commits/post (no reduction); "
+        f"batch tasks: {batch:.2f} vs baseline {baseline:.2f} commits/post"
+    )
+
+
+if __name__ == "__main__":
+    main()
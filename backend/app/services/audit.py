@@ -1,16 +1,142 @@
+"""Audit log writes, batched per unit of work.
+
+`log_action` only buffers the entry on the session. When the session commits,
+everything it buffered is written at once: a multi-row INSERT, or COPY on
+Postgres for large batches. With AUDIT_SINK=stream the entries are instead
+appended to a Redis stream after the commit, and `app.workers.audit_writer`
+inserts them in bulk off the request path.
+"""
+
+import json
+import logging
+from datetime import datetime
+
+import redis
+from sqlalchemy import event, insert
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Session
+
+from app.core.config import settings
 from app.models.audit_log import AuditLog
 
+logger = logging.getLogger("audit")
+
+STREAM_KEY = "audit:entries"
+_PENDING_KEY = "audit_pending"
+_COLUMNS = ("entity_type", "entity_id", "action", "actor_user_id", "payload_json", "created_at")
+# Bind parameters per statement stay well under the Postgres limit of 65535.
+_INSERT_CHUNK_ROWS = 5000
+# Below this COPY's round trips cost more than the multi-row INSERT it replaces.
+_COPY_MIN_ROWS = 500
+
+_redis_client: redis.Redis | None = None
+
+
+def _redis() -> redis.Redis:
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.redis_url, socket_timeout=1, socket_connect_timeout=1)
+    return _redis_client
+
+
+def _copy_rows(connection: Connection, rows: list[dict]) -> None:
+    # psycopg 3 COPY on the same DBAPI connection, so it joins the current transaction.
+    cursor = connection.connection.driver_connection.cursor()
+    with cursor, cursor.copy(f"COPY audit_logs ({', '.join(_COLUMNS)}) FROM STDIN") as copy:
+        for row in rows:
+            copy.write_row([json.dumps(row[c]) if c == "payload_json" else row[c] for c in _COLUMNS])
+
+
+def write_entries(db: Session | Connection, rows: list[dict]) -> int:
+    """Insert audit rows in bulk (does not commit)."""
+    if not rows:
+        return 0
+    connection = db.connection() if isinstance(db, Session) else db
+    if len(rows) >= _COPY_MIN_ROWS and connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg":
+        _copy_rows(connection, rows)
+        return len(rows)
+    for start in range(0, len(rows), _INSERT_CHUNK_ROWS):
+        connection.execute(insert(AuditLog).values(rows[start : start + _INSERT_CHUNK_ROWS]))
+    return len(rows)
+
+
+def send_to_stream(rows: list[dict]) -> None:
+    pipe = _redis().pipeline(transaction=False)
+    for row in rows:
+        entry = {**row, "created_at": row["created_at"].isoformat()}
+        pipe.xadd(STREAM_KEY, {"entry": json.dumps(entry)}, maxlen=settings.audit_stream_maxlen, approximate=True)
+    pipe.execute()
+
+
+def parse_stream_entry(fields: dict) -> dict:
+    row = json.loads(fields[b"entry"])
+    row["created_at"] = datetime.fromisoformat(row["created_at"])
+    return row
+
+
+class AuditBuffer:
+    """Collects audit entries and writes them with one bulk INSERT."""
+
+    def __init__(self) -> None:
+        self._rows: list[dict] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, entity_type: str, entity_id: int, action: str, actor_user_id: int, payload: dict) -> None:
+        self._rows.append(
+            {
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "action": action,
+                "actor_user_id": actor_user_id,
+                "payload_json": payload,
+                "created_at": datetime.utcnow(),
+            }
+        )
+
+    def take(self) -> list[dict]:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def flush(self, db: Session) -> int:
+        # Like log_action, does not commit.
+        return write_entries(db, self.take())
+
 
 def log_action(db: Session, entity_type: str, entity_id: int, action: str, actor_user_id: int, payload: dict) -> None:
     # Intentionally does not commit.
     # Callers should commit as part of their transaction boundary to avoid
-    # surprising partial commits from this helper.
-    entry = AuditLog(
-        entity_type=entity_type,
-        entity_id=entity_id,
-        action=action,
-        actor_user_id=actor_user_id,
-        payload_json=payload,
-    )
-    db.add(entry)
+    # surprising partial commits from this helper. Entries of a rolled back
+    # transaction are dropped with it.
+    if not db.in_transaction():
+        db.begin()
+    db.info.setdefault(_PENDING_KEY, AuditBuffer()).add(entity_type, entity_id, action, actor_user_id, payload)
+
+
+@event.listens_for(Session, "before_commit")
+def _write_pending(session: Session) -> None:
+    buffer = session.info.get(_PENDING_KEY)
+    if buffer and settings.audit_sink == "db":
+        buffer.flush(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _send_pending(session: Session) -> None:
+    buffer = session.info.pop(_PENDING_KEY, None)
+    if not buffer or settings.audit_sink != "stream":
+        return
+    rows = buffer.take()
+    try:
+        send_to_stream(rows)
+    except redis.RedisError:
+        # Graceful degradation: write them here after all, in a transaction of their own.
+        logger.warning("audit_stream_unavailable", extra={"entries": len(rows)}, exc_info=True)
+        with session.get_bind().begin() as connection:
+            write_entries(connection, rows)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_pending(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,178 @@
+"""Monthly partitions of audit_logs on Postgres (migration 0016).
+
+Partitions are created a few months ahead so inserts never land in the default
+partition. If they did (maintenance not running over a month boundary), the rows
+are moved out of the default partition when their month is created. Months older
+than AUDIT_RETENTION_MONTHS are detached, exported to gzipped JSONL under the
+media volume, and dropped. The export directory is never served by the /media
+mount.
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import JSON, DateTime, Integer, String, column, select, table, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger("audit_partitions")
+
+ARCHIVE_DIRNAME = "audit_archive"
+_PARTITION_RE = re.compile(r"^audit_logs_(\d{4})_(\d{2})$")
+_EXPORT_BATCH_ROWS = 5000
+
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"audit_logs_{month:%Y_%m}"
+
+
+def partition_month(name: str) -> datetime | None:
+    match = _PARTITION_RE.match(name)
+    return datetime(int(match[1]), int(match[2]), 1) if match else None
+
+
+def archive_dir() -> Path:
+    return Path(settings.media_dir) / ARCHIVE_DIRNAME
+
+
+def expired_partitions(names, now: datetime) -> list[str]:
+    """Monthly partitions that lie entirely before the retention window, oldest first."""
+    if settings.audit_retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(now), -settings.audit_retention_months)
+    months = {name: partition_month(name) for name in names}
+    return sorted(name for name, month in months.items() if month and add_months(month, 1) <= cutoff)
+
+
+def _partition_tables(db: Session) -> dict[str, bool]:
+    """Monthly audit tables by name -> still attached (detached ones are left over from a failed archive)."""
+    rows = db.execute(
+        text(
+            """
+            SELECT c.relname, i.inhparent IS NOT NULL
+            FROM pg_class c
+            LEFT JOIN pg_inherits i ON i.inhrelid = c.oid
+            WHERE c.relkind = 'r'
+              AND c.relnamespace = current_schema()::regnamespace
+              AND c.relname ~ '^audit_logs_[0-9]{4}_[0-9]{2}$'
+            """
+        )
+    ).all()
+    return {name: bool(attached) for name, attached in rows}
+
+
+def _default_months(db: Session) -> set[datetime]:
+    rows = db.execute(text("SELECT DISTINCT date_trunc('month', created_at) FROM audit_logs_default"))
+    return set(rows.scalars())
+
+
+def _create_partition(db: Session, month: datetime, has_default_rows: bool) -> None:
+    name = partition_name(month)
+    lower, upper = f"{month:%Y-%m-%d}", f"{add_months(month, 1):%Y-%m-%d}"
+    bounds = f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    if not has_default_rows:
+        db.execute(text(f"CREATE TABLE {name} PARTITION OF audit_logs {bounds}"))
+        return
+    # CREATE ... PARTITION OF fails while the default partition holds rows of the
+    # month: build the table, move those rows into it, then attach it.
+    db.execute(text(f"CREATE TABLE {name} (LIKE audit_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    db.execute(
+        text(
+            f"""
+            WITH moved AS (
+                DELETE FROM audit_logs_default
+                WHERE created_at >= '{lower}' AND created_at < '{upper}'
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+            """
+        )
+    )
+    db.execute(text(f"ALTER TABLE audit_logs ATTACH PARTITION {name} {bounds}"))
+
+
+def ensure_partitions(db: Session, now: datetime | None = None) -> list[str]:
+    """Create the monthly partitions from this month to AUDIT_PARTITIONS_AHEAD_MONTHS ahead,
+    plus any month with rows in the default partition. Each month commits on its own."""
+    month = month_start(now or datetime.utcnow())
+    existing = _partition_tables(db)
+    default_months = _default_months(db)
+    months = set(default_months)
+    for _ in range(settings.audit_partitions_ahead_months + 1):
+        months.add(month)
+        month = add_months(month, 1)
+    created = []
+    for month in sorted(months):
+        name = partition_name(month)
+        if name in existing:
+            continue
+        try:
+            _create_partition(db, month, month in default_months)
+            db.commit()
+        except SQLAlchemyError:
+            # One bad month must not keep the others (or archiving) from running.
+            db.rollback()
+            logger.exception("audit_partition_create_failed", extra={"partition": name})
+            continue
+        created.append(name)
+    if created:
+        logger.info("audit_partitions_created", extra={"partitions": created})
+    return created
+
+
+def export_partition(db: Session, name: str) -> Path:
+    """Write every row of `name` to <media>/audit_archive/<name>.jsonl.gz, oldest first."""
+    source = table(
+        name,
+        column("id", Integer),
+        column("entity_type", String),
+        column("entity_id", Integer),
+        column("action", String),
+        column("actor_user_id", Integer),
+        column("payload_json", JSON),
+        column("created_at", DateTime),
+    )
+    target = archive_dir() / f"{name}.jsonl.gz"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(f"{target.name}.partial")
+    rows = db.execute(
+        select(source).order_by(source.c.created_at, source.c.id),
+        execution_options={"yield_per": _EXPORT_BATCH_ROWS},
+    )
+    with gzip.open(partial, "wt", encoding="utf-8") as out:
+        for row in rows.mappings():
+            out.write(json.dumps({**row, "created_at": row["created_at"].isoformat()}, ensure_ascii=False) + "\n")
+    # Only a complete export takes the final name.
+    os.replace(partial, target)
+    return target
+
+
+def archive_expired(db: Session, now: datetime | None = None) -> list[Path]:
+    tables = _partition_tables(db)
+    archived = []
+    for name in expired_partitions(tables, now or datetime.utcnow()):
+        if tables[name]:
+            db.execute(text(f"ALTER TABLE audit_logs DETACH PARTITION {name}"))
+            db.commit()
+        path = export_partition(db, name)
+        db.execute(text(f"DROP TABLE {name}"))
+        db.commit()
+        logger.info("audit_partition_archived", extra={"partition": name, "path": str(path)})
+        archived.append(path)
+    return archived
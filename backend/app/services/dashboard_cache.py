@@ -0,0 +1,133 @@
+"""Short-lived shared cache of the dashboard overview.
+
+Every open editor tab polls the overview and, within a few seconds, they all get
+the same answer. The result is kept in Redis under a generation number. Any
+commit that changed channel_post_stats (a post created, deleted, rescheduled or
+moved to another status, by the API or the publisher) bumps the generation, so
+the next poll recomputes. Concurrent misses are single-flighted with a Redis
+lock: one request recomputes and the others wait briefly for its result.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+
+import redis
+import redis.asyncio as aioredis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.metrics import DASHBOARD_CACHE_REQUESTS_TOTAL
+from app.repositories.channel_stats import CHANGED_KEY
+from app.schemas.dashboard import DashboardOverview
+from app.services.redis_backoff import RedisBackoff
+
+logger = logging.getLogger("dashboard_cache")
+
+GENERATION_KEY = "dashboard:overview:generation"
+_POLL_SECONDS = 0.05
+
+_redis_client: redis.Redis | None = None
+_async_redis_client: aioredis.Redis | None = None
+_backoff = RedisBackoff()
+
+
+def _redis() -> redis.Redis:
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.redis_url, socket_timeout=1, socket_connect_timeout=1)
+    return _redis_client
+
+
+def _async_redis() -> aioredis.Redis:
+    global _async_redis_client
+    if _async_redis_client is None:
+        _async_redis_client = aioredis.Redis.from_url(settings.redis_url, socket_timeout=1, socket_connect_timeout=1)
+    return _async_redis_client
+
+
+def _value_key(generation: str) -> str:
+    return f"dashboard:overview:{generation}"
+
+
+def _lock_key(generation: str) -> str:
+    return f"dashboard:overview:lock:{generation}"
+
+
+async def _wait_for(client: aioredis.Redis, key: str) -> bytes | None:
+    deadline = time.monotonic() + settings.dashboard_cache_wait_seconds
+    while time.monotonic() < deadline:
+        await asyncio.sleep(_POLL_SECONDS)
+        cached = await client.get(key)
+        if cached is not None:
+            return cached
+    return None
+
+
+async def get_overview(compute: Callable[[], Awaitable[DashboardOverview]]) -> DashboardOverview:
+    """The cached overview, or `compute()`'s result (shared with concurrent callers)."""
+    if settings.dashboard_cache_ttl_seconds <= 0 or not _backoff.available():
+        DASHBOARD_CACHE_REQUESTS_TOTAL.labels("bypass").inc()
+        return await compute()
+    client = _async_redis()
+    try:
+        generation = (await client.get(GENERATION_KEY) or b"0").decode()
+        value_key, lock_key = _value_key(generation), _lock_key(generation)
+        cached = await client.get(value_key)
+        if cached is not None:
+            DASHBOARD_CACHE_REQUESTS_TOTAL.labels("hit").inc()
+            return DashboardOverview.model_validate_json(cached)
+        lock_ms = max(1, int(settings.dashboard_cache_wait_seconds * 1000))
+        leader = bool(await client.set(lock_key, uuid.uuid4().hex, nx=True, px=lock_ms))
+        if not leader:
+            cached = await _wait_for(client, value_key)
+            if cached is not None:
+                DASHBOARD_CACHE_REQUESTS_TOTAL.labels("waited").inc()
+                return DashboardOverview.model_validate_json(cached)
+    except redis.RedisError:
+        # Graceful degradation: without Redis every poll computes its own overview.
+        _unavailable()
+        DASHBOARD_CACHE_REQUESTS_TOTAL.labels("bypass").inc()
+        return await compute()
+
+    # The leader, or a waiter whose leader did not deliver in time.
+    DASHBOARD_CACHE_REQUESTS_TOTAL.labels("miss").inc()
+    try:
+        overview = await compute()
+        # Stored under the generation read before computing: if a change committed
+        # meanwhile, the generation has moved on and nobody reads this value.
+        await client.set(value_key, overview.model_dump_json(), px=int(settings.dashboard_cache_ttl_seconds * 1000))
+    except redis.RedisError:
+        _unavailable()
+    finally:
+        if leader:
+            try:
+                await client.delete(lock_key)
+            except redis.RedisError:
+                _unavailable()
+    return overview
+
+
+def _unavailable() -> None:
+    if _backoff.failed():
+        logger.warning("dashboard_cache_unavailable", exc_info=True)
+
+
+def invalidate() -> None:
+    # Skipped while Redis is backed off; cached values still expire after the TTL.
+    if not _backoff.available():
+        return
+    try:
+        _redis().incr(GENERATION_KEY)
+    except redis.RedisError:
+        # The cached value still expires after dashboard_cache_ttl_seconds.
+        _unavailable()
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop(CHANGED_KEY, False) and settings.dashboard_cache_ttl_seconds > 0:
+        invalidate()
@@ -0,0 +1,175 @@
+"""Change notifications pushed to browsers over server-sent events.
+
+Writers publish small JSON deltas to one Redis pub/sub channel after their commit.
+Each API process holds a single subscription to it (`EventHub`) and fans every
+message out to its open `/v1/events` connections, which relay it as an SSE
+frame, so open tabs refetch what changed instead of polling on a timer.
+Delivery is best effort: a client that was disconnected refetches on reconnect.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.models.enums import PostStatus
+from app.models.post import Post
+from app.models.suggestion import Suggestion
+from app.services.redis_backoff import RedisBackoff
+
+logger = logging.getLogger("events")
+
+CHANNEL = "events"
+# Frames buffered per connection; a client that falls this far behind is disconnected.
+_QUEUE_SIZE = 256
+
+_redis_client: redis.Redis | None = None
+_backoff = RedisBackoff()
+
+
+def _redis() -> redis.Redis:
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.redis_url, socket_timeout=1, socket_connect_timeout=1)
+    return _redis_client
+
+
+def _subscriber() -> aioredis.Redis:
+    # No socket_timeout: the subscription sits idle until something is published.
+    return aioredis.Redis.from_url(settings.redis_url, socket_connect_timeout=1)
+
+
+def _iso(value: datetime | None) -> str | None:
+    return value.isoformat() if value else None
+
+
+def publish(event_type: str, data: dict) -> None:
+    if not _backoff.available():
+        return
+    try:
+        _redis().publish(CHANNEL, json.dumps({"type": event_type, "data": data}))
+    except redis.RedisError:
+        # Clients still converge: they refetch on reconnect and on their own actions.
+        if _backoff.failed():
+            logger.warning("events_unavailable", extra={"event_type": event_type}, exc_info=True)
+
+
+def post_changed(post: Post, previous_status: PostStatus | None = None) -> None:
+    publish(
+        "post.updated",
+        {
+            "post_id": post.id,
+            "channel_id": post.channel_id,
+            "status": post.status,
+            "previous_status": previous_status,
+            "scheduled_at": _iso(post.scheduled_at),
+            "published_at": _iso(post.published_at),
+        },
+    )
+
+
+def post_deleted(post_id: int, channel_id: int) -> None:
+    publish("post.deleted", {"post_id": post_id, "channel_id": channel_id})
+
+
+def suggestion_changed(event_type: str, suggestion_id: int, channel_id: int) -> None:
+    publish(event_type, {"suggestion_id": suggestion_id, "channel_id": channel_id})
+
+
+def suggestion_created(suggestion: Suggestion) -> None:
+    suggestion_changed("suggestion.created", suggestion.id, suggestion.channel_id)
+
+
+def _frame(message: dict) -> str:
+    event = json.loads(message["data"])
+    return f"event: {event['type']}\ndata: {json.dumps(event['data'], separators=(',', ':'))}\n\n"
+
+
+class EventHub:
+    """One Redis subscription per process, fanned out to a queue per open stream.
+
+    The reader starts with the first stream and stops with the last one. A None
+    in a queue ends that stream: Redis failed, or the client fell behind.
+    """
+
+    def __init__(self) -> None:
+        self._queues: set[asyncio.Queue] = set()
+        self._reader: asyncio.Task | None = None
+        self._ready: asyncio.Event | None = None
+
+    async def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+        self._queues.add(queue)
+        if self._reader is None or self._reader.done() or self._reader.get_loop() is not asyncio.get_running_loop():
+            self._ready = asyncio.Event()
+            self._reader = asyncio.create_task(self._read(self._ready))
+        # Events published after this returns reach the queue.
+        await self._ready.wait()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._queues.discard(queue)
+        if not self._queues and self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+
+    def _close(self, queue: asyncio.Queue) -> None:
+        self._queues.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    async def _read(self, ready: asyncio.Event) -> None:
+        subscriber = _subscriber()
+        pubsub = subscriber.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(CHANNEL)
+            ready.set()
+            while True:
+                message = await pubsub.get_message(timeout=None)
+                if message is None:
+                    continue
+                frame = _frame(message)
+                for queue in list(self._queues):
+                    try:
+                        queue.put_nowait(frame)
+                    except asyncio.QueueFull:
+                        # It reconnects and refetches rather than holding frames for everyone.
+                        self._close(queue)
+        except redis.RedisError:
+            # The browsers reconnect after the retry interval and refetch.
+            logger.warning("events_stream_failed", exc_info=True)
+            for queue in list(self._queues):
+                self._close(queue)
+        finally:
+            ready.set()
+            await pubsub.aclose()
+            await subscriber.aclose()
+
+
+_hub = EventHub()
+
+
+async def stream() -> AsyncIterator[str]:
+    """SSE frames for one client until it disconnects (Starlette then cancels the generator)."""
+    hub = _hub
+    queue = await hub.subscribe()
+    try:
+        yield f"retry: {settings.events_retry_ms}\n\n"
+        while True:
+            try:
+                frame = await asyncio.wait_for(queue.get(), timeout=settings.events_heartbeat_seconds)
+            except asyncio.TimeoutError:
+                # A comment line keeps proxies from closing an idle stream.
+                yield ": keepalive\n\n"
+                continue
+            if frame is None:
+                return
+            yield frame
+    finally:
+        hub.unsubscribe(queue)
@@ -0,0 +1,25 @@
+import hashlib
+
+from app.models.post import Post
+
+
+def render_text(post: Post) -> str:
+    """Message text/caption exactly as sent to Telegram."""
+    return f"{post.title}\n\n{post.body_text}"
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:32]
+
+
+def fingerprint(text: str, media_url: str | None) -> str:
+    """`<text digest>:<media digest>`, compared per part to tell caption-only edits apart."""
+    return f"{_digest(text)}:{_digest(media_url or '')}"
+
+
+def post_fingerprint(post: Post) -> str:
+    return fingerprint(render_text(post), post.media_url)
+
+
+def media_part(value: str | None) -> str | None:
+    return value.split(":", 1)[1] if value else None
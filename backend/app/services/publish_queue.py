@@ -0,0 +1,130 @@
+import logging
+from collections import deque
+from datetime import datetime, timezone
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger("publish_queue")
+
+INFLIGHT_KEY = "publish:inflight"
+SCHEDULE_KEY = "publish:scheduled"
+
+# Atomically drops stale entries, then adds as many of the given post ids as the
+# in-flight cap allows. Ids already in flight are skipped, which also keeps two
+# beat ticks from dispatching the same post twice.
+_RESERVE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1])
+local ttl = tonumber(ARGV[1])
+local cap = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - ttl)
+local free = cap - redis.call('ZCARD', KEYS[1])
+local reserved = {}
+for i = 3, #ARGV do
+  if free <= 0 then
+    break
+  end
+  if redis.call('ZADD', KEYS[1], 'NX', now, ARGV[i]) == 1 then
+    table.insert(reserved, ARGV[i])
+    free = free - 1
+  end
+end
+return reserved
+"""
+
+# Pops every member of the delay queue whose score (unix seconds) is <= ARGV[1].
+_POP_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+if #due > 0 then
+  redis.call('ZREM', KEYS[1], unpack(due))
+end
+return due
+"""
+
+_redis_client: redis.Redis | None = None
+_reserve = None
+_pop_due = None
+
+
+def _redis() -> redis.Redis:
+    global _redis_client, _reserve, _pop_due
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.redis_url, socket_timeout=1, socket_connect_timeout=1)
+        _reserve = _redis_client.register_script(_RESERVE_SCRIPT)
+        _pop_due = _redis_client.register_script(_POP_DUE_SCRIPT)
+    return _redis_client
+
+
+def fair_order(post_ids: list[int], channel_of: dict[int, int]) -> list[int]:
+    """Round-robin the ids across channels, keeping each channel's own order.
+
+    A channel with hundreds of due posts then delays another channel's post by at
+    most one slot per channel instead of its whole backlog.
+    """
+    queues: dict[int | None, deque[int]] = {}
+    for post_id in post_ids:
+        queues.setdefault(channel_of.get(post_id), deque()).append(post_id)
+    ordered: list[int] = []
+    while queues:
+        for channel_id in list(queues):
+            queue = queues[channel_id]
+            ordered.append(queue.popleft())
+            if not queue:
+                del queues[channel_id]
+    return ordered
+
+
+def _score(when: datetime) -> float:
+    # Post timestamps are naive UTC.
+    return when.replace(tzinfo=timezone.utc).timestamp()
+
+
+def reserve(post_ids: list[int]) -> list[int]:
+    """Mark posts as dispatched and return the ones that fit under the in-flight cap."""
+    if not post_ids:
+        return []
+    try:
+        _redis()
+        reserved = _reserve(
+            keys=[INFLIGHT_KEY],
+            args=[settings.publish_inflight_ttl_seconds, settings.publish_max_in_flight, *post_ids],
+        )
+    except redis.RedisError:
+        # Graceful degradation: the per-post task re-checks the row under a lock,
+        # so dispatching without the registry is safe, just less economical.
+        logger.warning("publish_queue_unavailable", exc_info=True)
+        return list(post_ids)
+    return [int(post_id) for post_id in reserved]
+
+
+def release(post_id: int) -> None:
+    try:
+        _redis().zrem(INFLIGHT_KEY, post_id)
+    except redis.RedisError:
+        logger.warning("publish_queue_unavailable", exc_info=True)
+
+
+def schedule(post_id: int, scheduled_at: datetime) -> None:
+    """Add (or move) a post in the delay queue; the beat poll stays as the safety net."""
+    try:
+        _redis().zadd(SCHEDULE_KEY, {str(post_id): _score(scheduled_at)})
+    except redis.RedisError:
+        logger.warning("publish_queue_unavailable", exc_info=True)
+
+
+def pop_due(limit: int, now: datetime | None = None) -> list[int]:
+    now = now or datetime.utcnow()
+    _redis()
+    due = _pop_due(keys=[SCHEDULE_KEY], args=[_score(now), limit])
+    return [int(post_id) for post_id in due]
+
+
+def next_due_in(now: datetime | None = None) -> float | None:
+    """Seconds until the earliest queued post is due, or None if the queue is empty."""
+    now = now or datetime.utcnow()
+    head = _redis().zrange(SCHEDULE_KEY, 0, 0, withscores=True)
+    if not head:
+        return None
+    return max(0.0, head[0][1] - _score(now))
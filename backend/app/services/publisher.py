@@ -1,4 +1,9 @@
+import os
+import random
+import socket
+from collections.abc import Callable
 from datetime import datetime, timedelta
+from uuid import uuid4
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
@@ -7,83 +12,279 @@ from app.models.post import Post
 from app.models.enums import PostStatus
 import logging
 from app.services.telegram import publish_message
+from app.services.telegram_media import cached_file_id, remember_file_id
+from app.services.post_render import fingerprint, render_text
+from app.repositories import posts as post_repo
+from app.services import events, publish_queue
 from app.services.audit import log_action
 from app.metrics import PUBLISH_SUCCESS_TOTAL, PUBLISH_RETRY_TOTAL, PUBLISH_FAIL_TOTAL, POST_STATUS_TRANSITIONS_TOTAL
 
 
-def publish_post(db: Session, post: Post, actor_user_id: int, channel: Channel | None = None) -> Post:
+def new_lease_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+
+def claim_post(
+    db: Session,
+    post_id: int,
+    *,
+    from_statuses,
+    due_before: datetime | None = None,
+    owner: str | None = None,
+) -> bool:
+    """Claim a post for publishing under a lease; commits immediately, holds no lock."""
+    return post_repo.claim_for_publishing(
+        db,
+        post_id,
+        owner=owner or new_lease_owner(),
+        lease_seconds=settings.publish_lease_seconds,
+        from_statuses=from_statuses,
+        due_before=due_before,
+    )
+
+
+def claim_posts(
+    db: Session, post_ids: list[int], *, from_statuses, due_before: datetime | None = None, owner: str | None = None
+) -> list[int]:
+    """Batch variant of claim_post: one UPDATE and one commit for the whole batch."""
+    return post_repo.claim_many_for_publishing(
+        db,
+        post_ids,
+        owner=owner or new_lease_owner(),
+        lease_seconds=settings.publish_lease_seconds,
+        from_statuses=from_statuses,
+        due_before=due_before,
+    )
+
+
+def renew_leases(db: Session, post_ids: list[int], owner: str) -> list[int]:
+    """Extend the leases `owner` still holds on `post_ids`; commits, returns those ids."""
+    return post_repo.renew_leases(db, post_ids, owner=owner, lease_seconds=settings.publish_lease_seconds)
+
+
+def _clear_lease(post: Post) -> None:
+    post.lease_owner = None
+    post.lease_expires_at = None
+
+
+def retry_delay_seconds(attempt: int) -> float:
+    """Exponential backoff with full jitter for the given (1-based) retry attempt.
+
+    Spreading retries over the whole window keeps posts that failed together
+    during an outage from coming back in the same second.
+    """
+    ceiling = min(
+        settings.publish_retry_max_delay_seconds,
+        settings.publish_retry_delay_seconds * 2 ** (attempt - 1),
+    )
+    return random.uniform(0, ceiling)
+
+
+def _lease_lost(db: Session, post: Post, owner: str | None) -> bool:
+    """Re-read the post under a row lock before writing an outcome.
+
+    True when the lease expired and the reaper (or another worker after it) took
+    the post over; the outcome must then not overwrite what they wrote. The lock
+    keeps the reaper out until the outcome is committed.
+    """
+    if owner is None:
+        return False
+    db.refresh(post, with_for_update=True)
+    if post.lease_owner == owner:
+        return False
+    db.rollback()
+    return True
+
+
+def _lease_heartbeat(db: Session, post: Post, owner: str | None) -> Callable[[], None] | None:
+    """Renew `owner`'s lease before a Telegram attempt that could outlast what is left of it.
+
+    Retries, limiter waits and retry_after sleeps can run a send past the lease;
+    renewing per attempt means the lease only has to cover a single one.
+    """
+    if owner is None:
+        return None
+
+    def heartbeat() -> None:
+        remaining = post.lease_expires_at - datetime.utcnow() if post.lease_expires_at else timedelta(0)
+        if remaining.total_seconds() <= settings.telegram_attempt_seconds:
+            renew_leases(db, [post.id], owner)
+
+    return heartbeat
+
+
+def _defer(db: Session, post: Post, until: datetime, actor_user_id: int, payload: dict) -> None:
+    """Hand the post back to the schedule without counting a publish attempt (commits)."""
+    post.status = PostStatus.scheduled
+    post.scheduled_at = until
+    post.next_retry_at = until
+    _clear_lease(post)
+    post.updated_by = actor_user_id
+    post.updated_at = datetime.utcnow()
+    log_action(db, "post", post.id, "defer", actor_user_id, {"until": str(until), **payload})
+    db.commit()
+
+
+def publish_post(
+    db: Session,
+    post: Post,
+    actor_user_id: int,
+    channel: Channel | None = None,
+    respect_cooldown: bool = True,
+) -> Post:
+    """Publish a post and record the outcome (publish/retry/defer/fail) in a single commit.
+
+    The audit row rides on the outcome commit. For a claimed post the outcome is
+    only written while this caller still holds the lease. Posts of a channel in
+    cool-down are deferred without calling Telegram unless `respect_cooldown` is off.
+    """
     logger = logging.getLogger("publisher")
     previous_status = post.status
     if post.status == PostStatus.published and post.telegram_message_id:
         return post
+    owner = post.lease_owner if post.status == PostStatus.publishing else None
     if channel is None:
         channel = db.get(Channel, post.channel_id)
     if not channel:
+        if _lease_lost(db, post, owner):
+            logger.warning("publish_lease_lost", extra={"post_id": post.id})
+            return post
         post.status = PostStatus.failed
         post.last_error = "Channel not found"
+        _clear_lease(post)
         post.updated_by = actor_user_id
         post.updated_at = datetime.utcnow()
+        log_action(db, "post", post.id, "fail", actor_user_id, {"error": post.last_error})
         db.commit()
+        events.post_changed(post, previous_status)
         PUBLISH_FAIL_TOTAL.inc()
         logger.warning("publish_fail", extra={"post_id": post.id, "error": post.last_error})
-        log_action(db, "post", post.id, "fail", actor_user_id, {"error": post.last_error})
-        db.commit()
         return post
 
+    now = datetime.utcnow()
+    if respect_cooldown and channel.publish_cooldown_until and channel.publish_cooldown_until > now:
+        if _lease_lost(db, post, owner):
+            logger.warning("publish_lease_lost", extra={"post_id": post.id})
+            return post
+        # Jitter within one cool-down window so the channel's backlog does not resume at once.
+        until = channel.publish_cooldown_until + timedelta(
+            seconds=random.uniform(0, settings.publish_channel_cooldown_seconds)
+        )
+        _defer(db, post, until, actor_user_id, {})
+        POST_STATUS_TRANSITIONS_TOTAL.labels(previous_status.value, post.status.value).inc()
+        events.post_changed(post, previous_status)
+        logger.info("publish_deferred", extra={"post_id": post.id, "channel_id": channel.id})
+        publish_queue.schedule(post.id, post.scheduled_at)
+        return post
+
+    text = render_text(post)
     result = publish_message(
         channel.telegram_channel_identifier,
-        f"{post.title}\n\n{post.body_text}",
+        text,
         post.media_url,
+        file_id=cached_file_id(db, post.media_url),
+        heartbeat=_lease_heartbeat(db, post, owner),
     )
+    if _lease_lost(db, post, owner):
+        # Another worker may publish it again; the message id makes the duplicate traceable.
+        logger.error(
+            "publish_lease_lost",
+            extra={"post_id": post.id, "published": result.ok, "message_id": result.message_id},
+        )
+        return post
     now = datetime.utcnow()
+    if result.throttled:
+        # Our own limiter held the call back: Telegram was never asked, so this is
+        # neither a failed attempt nor a reason to cool the channel down.
+        wait = settings.telegram_rate_limit_max_wait_seconds
+        until = now + timedelta(seconds=wait + random.uniform(0, wait))
+        _defer(db, post, until, actor_user_id, {"reason": "rate_limited"})
+        POST_STATUS_TRANSITIONS_TOTAL.labels(previous_status.value, post.status.value).inc()
+        events.post_changed(post, previous_status)
+        logger.info("publish_throttled", extra={"post_id": post.id, "channel_id": channel.id})
+        publish_queue.schedule(post.id, post.scheduled_at)
+        return post
+
     if result.ok:
+        remember_file_id(db, post.media_url, result)
         post.status = PostStatus.published
         post.published_at = now
         post.telegram_message_id = result.message_id
+        post.telegram_fingerprint = fingerprint(text, post.media_url)
         post.last_error = None
+        post.next_retry_at = None
+        _clear_lease(post)
         post.updated_by = actor_user_id
         post.updated_at = now
+        log_action(db, "post", post.id, "publish", actor_user_id, {"status": post.status})
         db.commit()
         POST_STATUS_TRANSITIONS_TOTAL.labels(previous_status.value, post.status.value).inc()
+        events.post_changed(post, previous_status)
         PUBLISH_SUCCESS_TOTAL.inc()
         logger.info("publish_success", extra={"post_id": post.id})
-        log_action(db, "post", post.id, "publish", actor_user_id, {"status": post.status})
-        db.commit()
         return post
 
     if not result.retryable:
         post.status = PostStatus.failed
         post.last_error = result.error
+        post.next_retry_at = None
+        _clear_lease(post)
         post.updated_by = actor_user_id
         post.updated_at = now
+        log_action(db, "post", post.id, "fail", actor_user_id, {"error": result.error, "retryable": False})
         db.commit()
         POST_STATUS_TRANSITIONS_TOTAL.labels(previous_status.value, post.status.value).inc()
+        events.post_changed(post, previous_status)
         PUBLISH_FAIL_TOTAL.inc()
         logger.warning("publish_fail", extra={"post_id": post.id, "error": result.error, "retryable": False})
-        log_action(db, "post", post.id, "fail", actor_user_id, {"error": result.error, "retryable": False})
-        db.commit()
         return post
 
     post.publish_attempts += 1
     post.last_error = result.error
+    _clear_lease(post)
     post.updated_by = actor_user_id
     post.updated_at = now
+    if settings.publish_channel_cooldown_seconds > 0:
+        cooldown_until = now + timedelta(seconds=settings.publish_channel_cooldown_seconds)
+        if not channel.publish_cooldown_until or channel.publish_cooldown_until < cooldown_until:
+            channel.publish_cooldown_until = cooldown_until
     if post.publish_attempts < settings.publish_retry_max:
+        retry_at = now + timedelta(seconds=retry_delay_seconds(post.publish_attempts))
+        if channel.publish_cooldown_until and channel.publish_cooldown_until > retry_at:
+            retry_at = channel.publish_cooldown_until
         post.status = PostStatus.scheduled
-        post.scheduled_at = now + timedelta(seconds=settings.publish_retry_delay_seconds)
+        post.scheduled_at = retry_at
+        post.next_retry_at = retry_at
+        log_action(
+            db,
+            "post",
+            post.id,
+            "retry",
+            actor_user_id,
+            {"error": result.error, "attempt": post.publish_attempts, "next_retry_at": str(retry_at)},
+        )
         db.commit()
         POST_STATUS_TRANSITIONS_TOTAL.labels(previous_status.value, post.status.value).inc()
+        events.post_changed(post, previous_status)
         PUBLISH_RETRY_TOTAL.inc()
-        logger.info("publish_retry", extra={"post_id": post.id, "error": result.error})
-        log_action(db, "post", post.id, "retry", actor_user_id, {"error": result.error})
-        db.commit()
+        logger.info(
+            "publish_retry",
+            extra={
+                "post_id": post.id,
+                "error": result.error,
+                "attempt": post.publish_attempts,
+                "next_retry_at": str(retry_at),
+            },
+        )
+        publish_queue.schedule(post.id, post.scheduled_at)
         return post
 
     post.status = PostStatus.failed
+    post.next_retry_at = None
+    log_action(db, "post", post.id, "fail", actor_user_id, {"error": result.error})
     db.commit()
     POST_STATUS_TRANSITIONS_TOTAL.labels(previous_status.value, post.status.value).inc()
+    events.post_changed(post, previous_status)
     PUBLISH_FAIL_TOTAL.inc()
     logger.warning("publish_fail", extra={"post_id": post.id, "error": result.error})
-    log_action(db, "post", post.id, "fail", actor_user_id, {"error": result.error})
-    db.commit()
     return post
@@ -0,0 +1,27 @@
+import time
+
+from app.core.config import settings
+
+
+class RedisBackoff:
+    """Stops calling Redis for a while after a failure.
+
+    Best-effort Redis features (dashboard cache, change events) run in the commit
+    path; during an outage each call would otherwise pay the socket timeout and
+    log a traceback.
+    """
+
+    def __init__(self) -> None:
+        self._retry_at = 0.0
+
+    def available(self) -> bool:
+        return time.monotonic() >= self._retry_at
+
+    def failed(self) -> bool:
+        """Record a failure; True when it is the first one since Redis was last usable."""
+        first = self.available()
+        self._retry_at = time.monotonic() + settings.redis_outage_backoff_seconds
+        return first
+
+    def reset(self) -> None:
+        self._retry_at = 0.0
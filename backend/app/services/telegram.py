@@ -1,10 +1,17 @@
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 import json
+import logging
+import os
+import threading
 import time
 import httpx
 from app.core.config import settings
 from app.metrics import TELEGRAM_ERRORS_TOTAL
+from app.services import telegram_rate_limit
+
+logger = logging.getLogger("telegram")
 
 
 @dataclass
@@ -13,6 +20,10 @@ class TelegramResult:
     message_id: str | None
     error: str | None
     retryable: bool = False
+    # Set when local media bytes were uploaded; callers cache it for later sends.
+    file_id: str | None = None
+    # Not sent: the local rate limiter would have made the call wait past its cap.
+    throttled: bool = False
 
 
 def _local_media_path(photo_url: str) -> Path:
@@ -20,14 +31,80 @@ def _local_media_path(photo_url: str) -> Path:
     return Path(settings.media_dir) / filename
 
 
+def bot_id() -> str | None:
+    """Public part of the bot token (before ':'), used to scope per-bot caches."""
+    if not settings.telegram_bot_token:
+        return None
+    return settings.telegram_bot_token.split(":", 1)[0]
+
+
 def _base_url() -> str:
     if not settings.telegram_bot_token:
         raise ValueError("Bot token not configured")
     return f"https://api.telegram.org/bot{settings.telegram_bot_token}"
 
 
+_client_lock = threading.Lock()
+_shared_client: httpx.Client | None = None
+_shared_client_pid: int | None = None
+
+
+def _client_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.telegram_pool_max_connections,
+        max_keepalive_connections=settings.telegram_pool_max_keepalive,
+        keepalive_expiry=settings.telegram_pool_keepalive_expiry_seconds,
+    )
+
+
+def _http2_enabled() -> bool:
+    """settings.telegram_http2, falling back to HTTP/1.1 when `h2` is not installed."""
+    if not settings.telegram_http2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("telegram_http2_unavailable", extra={"reason": "h2 is not installed, using HTTP/1.1"})
+        return False
+    return True
+
+
+def _build_client() -> httpx.Client:
+    return httpx.Client(
+        timeout=settings.telegram_timeout_seconds,
+        limits=_client_limits(),
+        http2=_http2_enabled(),
+    )
+
+
 def _client() -> httpx.Client:
-    return httpx.Client(timeout=settings.telegram_timeout_seconds)
+    """Return the process-wide keep-alive client, creating it on first use.
+
+    The owning pid is tracked so that forked Celery workers never reuse sockets
+    inherited from the parent process.
+    """
+    global _shared_client, _shared_client_pid
+    pid = os.getpid()
+    client = _shared_client
+    if client is not None and not client.is_closed and _shared_client_pid == pid:
+        return client
+    with _client_lock:
+        if _shared_client is None or _shared_client.is_closed or _shared_client_pid != pid:
+            _shared_client = _build_client()
+            _shared_client_pid = pid
+        return _shared_client
+
+
+def close_client() -> None:
+    global _shared_client, _shared_client_pid
+    with _client_lock:
+        client = _shared_client
+        owner_pid = _shared_client_pid
+        _shared_client = None
+        _shared_client_pid = None
+    # Only the owning process may close the pool; a forked child just drops its reference.
+    if client is not None and owner_pid == os.getpid():
+        client.close()
 
 
 def _is_retryable_error(exc: Exception) -> bool:
@@ -41,50 +118,136 @@ def _is_retryable_error(exc: Exception) -> bool:
     return False
 
 
-def _backoff(attempt: int) -> None:
-    time.sleep(0.5 * (2 ** attempt))
+def _backoff_delay(attempt: int) -> float:
+    return 0.5 * (2 ** attempt)
 
 
-def _request_with_retries(method: str, url: str, *, action: str, data=None, json=None, files=None, params=None) -> dict:
+def _retry_after(exc: Exception) -> float | None:
+    if not isinstance(exc, httpx.HTTPStatusError) or exc.response.status_code != 429:
+        return None
+    try:
+        value = (exc.response.json().get("parameters") or {}).get("retry_after")
+        return float(value) if value is not None else None
+    except Exception:
+        return None
+
+
+def _next_delay(exc: Exception, attempt: int, chat_id: str | None) -> float | None:
+    """Seconds to wait before the next attempt, or None to stop retrying.
+
+    A 429 carries Telegram's retry_after; it is shared through the rate limiter so
+    every worker sending to the same chat backs off, not just this caller.
+    """
+    retry_after = _retry_after(exc)
+    if retry_after is not None:
+        telegram_rate_limit.penalize(chat_id, retry_after)
+    if attempt >= settings.telegram_retries or not _is_retryable_error(exc):
+        return None
+    if retry_after is not None:
+        if retry_after > settings.telegram_retry_after_max_seconds:
+            # Long flood waits are handed back to the caller (publisher reschedules)
+            # instead of pinning a worker.
+            return None
+        return retry_after
+    return _backoff_delay(attempt)
+
+
+def _rate_limited_payload(action: str) -> dict:
+    TELEGRAM_ERRORS_TOTAL.labels(action, "true").inc()
+    return {"ok": False, "description": "Telegram rate limit wait exceeded", "retryable": True, "throttled": True}
+
+
+def _parse_response(response: httpx.Response) -> dict:
+    try:
+        return response.json()
+    except Exception:
+        return {"ok": False, "description": response.text}
+
+
+def _error_body(exc: Exception) -> dict:
+    """Telegram's own error body of an HTTP error response ({"ok": false, "error_code", "description"})."""
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return {}
+    try:
+        body = exc.response.json()
+    except Exception:
+        return {}
+    return body if isinstance(body, dict) and body.get("description") else {}
+
+
+def _failure_payload(action: str, last_exc: Exception | None) -> dict:
+    if last_exc is None:
+        TELEGRAM_ERRORS_TOTAL.labels(action, "false").inc()
+        return {"ok": False, "description": "Unknown error"}
+    retryable = _is_retryable_error(last_exc)
+    TELEGRAM_ERRORS_TOTAL.labels(action, "true" if retryable else "false").inc()
+    # Callers match on Telegram's description ("wrong file identifier", "message to delete
+    # not found", ...), not on httpx's "Client error '400 Bad Request'" message.
+    body = _error_body(last_exc)
+    return {
+        "ok": False,
+        "description": str(body.get("description") or last_exc),
+        "error_code": body.get("error_code"),
+        "retryable": retryable,
+    }
+
+
+def _record_download_failure(last_exc: Exception | None) -> None:
+    if last_exc is not None:
+        retryable = _is_retryable_error(last_exc)
+        TELEGRAM_ERRORS_TOTAL.labels("downloadFile", "true" if retryable else "false").inc()
+
+
+def _request_with_retries(
+    method: str,
+    url: str,
+    *,
+    action: str,
+    chat_id: str | None = None,
+    data=None,
+    json=None,
+    files=None,
+    params=None,
+    heartbeat: Callable[[], None] | None = None,
+) -> dict:
+    """`heartbeat` runs before every attempt, e.g. to keep the caller's lease alive."""
     last_exc: Exception | None = None
     for attempt in range(settings.telegram_retries + 1):
+        if heartbeat is not None:
+            heartbeat()
+        if not telegram_rate_limit.acquire(chat_id):
+            # Throttled only while Telegram was never asked; a held-back retry reports
+            # the error of the attempt before it.
+            if attempt == 0:
+                return _rate_limited_payload(action)
+            break
         try:
-            with _client() as client:
-                response = client.request(method, url, data=data, json=json, files=files, params=params)
+            response = _client().request(method, url, data=data, json=json, files=files, params=params)
             response.raise_for_status()
-            try:
-                return response.json()
-            except Exception:
-                return {"ok": False, "description": response.text}
+            return _parse_response(response)
         except Exception as exc:
             last_exc = exc
-            if attempt >= settings.telegram_retries or not _is_retryable_error(exc):
+            delay = _next_delay(exc, attempt, chat_id)
+            if delay is None:
                 break
-            _backoff(attempt)
-    if last_exc is None:
-        TELEGRAM_ERRORS_TOTAL.labels(action, "false").inc()
-        return {"ok": False, "description": "Unknown error"}
-    retryable = _is_retryable_error(last_exc)
-    TELEGRAM_ERRORS_TOTAL.labels(action, "true" if retryable else "false").inc()
-    return {"ok": False, "description": str(last_exc), "retryable": retryable}
+            time.sleep(delay)
+    return _failure_payload(action, last_exc)
 
 
 def _download_bytes_with_retries(url: str) -> bytes | None:
     last_exc: Exception | None = None
     for attempt in range(settings.telegram_retries + 1):
         try:
-            with _client() as client:
-                response = client.get(url)
+            response = _client().get(url)
             response.raise_for_status()
             return response.content
         except Exception as exc:
             last_exc = exc
-            if attempt >= settings.telegram_retries or not _is_retryable_error(exc):
+            delay = _next_delay(exc, attempt, None)
+            if delay is None:
                 break
-            _backoff(attempt)
-    if last_exc is not None:
-        retryable = _is_retryable_error(last_exc)
-        TELEGRAM_ERRORS_TOTAL.labels("downloadFile", "true" if retryable else "false").inc()
+            time.sleep(delay)
+    _record_download_failure(last_exc)
     return None
 
 
@@ -110,19 +273,27 @@ def _normalize_identifier(identifier: str) -> str:
 def _get_chat(chat_id_or_username: str) -> dict:
     base_url = _base_url()
     data = _request_with_retries("GET", f"{base_url}/getChat", action="getChat", params={"chat_id": chat_id_or_username})
+    return _chat_from_response(data)
+
+
+def _chat_from_response(data: dict) -> dict:
     if not data.get("ok"):
         raise ValueError(str(data))
     return data.get("result", {})
 
 
+def _avatar_file_id(chat: dict) -> str | None:
+    photo = chat.get("photo") or {}
+    return photo.get("big_file_id") or photo.get("small_file_id")
+
+
 def lookup_channel_profile(identifier: str) -> dict:
     if not settings.telegram_bot_token:
         raise ValueError("Bot token not configured")
     chat_id = _normalize_identifier(identifier)
     result = _get_chat(chat_id)
     title = result.get("title") or chat_id
-    photo = result.get("photo") or {}
-    file_id = photo.get("big_file_id") or photo.get("small_file_id")
+    file_id = _avatar_file_id(result)
     avatar_url = None
     if file_id:
         avatar_url = _download_avatar(file_id)
@@ -132,16 +303,23 @@ def lookup_channel_profile(identifier: str) -> dict:
 def _download_avatar(file_id: str) -> str | None:
     base_url = _base_url()
     file_data = _request_with_retries("GET", f"{base_url}/getFile", action="getFile", params={"file_id": file_id})
-    if not file_data.get("ok"):
-        return None
-    file_path = file_data.get("result", {}).get("file_path")
+    file_path = _file_path_from_response(file_data)
     if not file_path:
         return None
     file_url = _file_url(file_path)
     content = _download_bytes_with_retries(file_url)
     if content is None:
         return None
+    return _store_avatar(file_id, file_path, content)
+
+
+def _file_path_from_response(data: dict) -> str | None:
+    if not data.get("ok"):
+        return None
+    return data.get("result", {}).get("file_path")
+
 
+def _store_avatar(file_id: str, file_path: str, content: bytes) -> str:
     extension = Path(file_path).suffix or ".jpg"
     avatars_dir = Path(settings.media_dir) / "avatars"
     avatars_dir.mkdir(parents=True, exist_ok=True)
@@ -152,7 +330,36 @@ def _download_avatar(file_id: str) -> str | None:
     return f"/media/avatars/{filename}"
 
 
-def publish_message(channel_identifier: str, text: str, photo_url: str | None = None) -> TelegramResult:
+def _uploaded_file_id(data: dict) -> str | None:
+    photos = (data.get("result") or {}).get("photo") or []
+    if not photos:
+        return None
+    # Telegram returns every generated size; the last one is the original resolution.
+    return photos[-1].get("file_id")
+
+
+def _is_stale_file_id(data: dict) -> bool:
+    description = str(data.get("description") or "").lower()
+    return "file identifier" in description or "file_reference" in description or "file reference" in description
+
+
+def _with_uploaded_file_id(result: TelegramResult, data: dict) -> TelegramResult:
+    if result.ok:
+        result.file_id = _uploaded_file_id(data)
+    return result
+
+
+def publish_message(
+    channel_identifier: str,
+    text: str,
+    photo_url: str | None = None,
+    file_id: str | None = None,
+    heartbeat: Callable[[], None] | None = None,
+) -> TelegramResult:
+    """Send a post; `file_id` is a cached upload of the local `photo_url` to send instead of its bytes.
+
+    `heartbeat` is called before each attempt (see _request_with_retries).
+    """
     if not settings.telegram_bot_token:
         return TelegramResult(ok=False, message_id=None, error="Bot token not configured")
 
@@ -161,8 +368,19 @@ def publish_message(channel_identifier: str, text: str, photo_url: str | None =
     endpoint = "/sendPhoto" if photo_url else "/sendMessage"
 
     if photo_url and photo_url.startswith("/media/"):
-        filename = photo_url.split("/media/", 1)[1]
-        file_path = Path(settings.media_dir) / filename
+        if file_id:
+            data = _request_with_retries(
+                "POST",
+                base_url + endpoint,
+                action="sendPhoto",
+                chat_id=channel_identifier,
+                json={**payload, "photo": file_id},
+                heartbeat=heartbeat,
+            )
+            # Fall through to a fresh upload only if Telegram no longer knows the file.
+            if data.get("ok") or not _is_stale_file_id(data):
+                return _publish_result(data)
+        file_path = _local_media_path(photo_url)
         if not file_path.exists():
             return TelegramResult(ok=False, message_id=None, error="Media file not found")
         with file_path.open("rb") as file_obj:
@@ -170,27 +388,41 @@ def publish_message(channel_identifier: str, text: str, photo_url: str | None =
                 "POST",
                 base_url + endpoint,
                 action="sendPhoto",
+                chat_id=channel_identifier,
                 data={"chat_id": channel_identifier, "caption": text},
                 files={"photo": file_obj},
+                heartbeat=heartbeat,
             )
-    else:
-        if photo_url:
-            payload["photo"] = photo_url
-        data = _request_with_retries("POST", base_url + endpoint, action="sendMessage", json=payload)
+        return _with_uploaded_file_id(_publish_result(data), data)
+
+    if photo_url:
+        payload["photo"] = photo_url
+    data = _request_with_retries(
+        "POST", base_url + endpoint, action="sendMessage", chat_id=channel_identifier, json=payload, heartbeat=heartbeat
+    )
+    return _publish_result(data)
 
-    if not data.get("ok"):
-        return TelegramResult(
-            ok=False,
-            message_id=None,
-            error=str(data.get("description") or data),
-            retryable=bool(data.get("retryable")),
-        )
 
+def _failed_result(data: dict) -> TelegramResult:
+    return TelegramResult(
+        ok=False,
+        message_id=None,
+        error=str(data.get("description") or data),
+        retryable=bool(data.get("retryable")),
+        throttled=bool(data.get("throttled")),
+    )
+
+
+def _publish_result(data: dict) -> TelegramResult:
+    if not data.get("ok"):
+        return _failed_result(data)
     message_id = data.get("result", {}).get("message_id")
     return TelegramResult(ok=True, message_id=str(message_id) if message_id else None, error=None)
 
 
-def edit_message(channel_identifier: str, message_id: str, text: str, photo_url: str | None = None) -> TelegramResult:
+def edit_message(
+    channel_identifier: str, message_id: str, text: str, photo_url: str | None = None, file_id: str | None = None
+) -> TelegramResult:
     if not settings.telegram_bot_token:
         return TelegramResult(ok=False, message_id=None, error="Bot token not configured")
 
@@ -198,6 +430,20 @@ def edit_message(channel_identifier: str, message_id: str, text: str, photo_url:
 
     if photo_url:
         if photo_url.startswith("/media/"):
+            if file_id:
+                data = _request_with_retries(
+                    "POST",
+                    base_url + "/editMessageMedia",
+                    action="editMessageMedia",
+                    chat_id=channel_identifier,
+                    json={
+                        "chat_id": channel_identifier,
+                        "message_id": message_id,
+                        "media": {"type": "photo", "media": file_id, "caption": text},
+                    },
+                )
+                if data.get("ok") or not _is_stale_file_id(data):
+                    return _edit_result(data, message_id)
             file_path = _local_media_path(photo_url)
             if not file_path.exists():
                 return TelegramResult(ok=False, message_id=None, error="Media file not found")
@@ -211,15 +457,18 @@ def edit_message(channel_identifier: str, message_id: str, text: str, photo_url:
                     "POST",
                     base_url + "/editMessageMedia",
                     action="editMessageMedia",
+                    chat_id=channel_identifier,
                     data={"chat_id": channel_identifier, "message_id": message_id, "media": json.dumps(media)},
                     files={"photo": file_obj},
                 )
+            return _with_uploaded_file_id(_edit_result(data, message_id), data)
         else:
             media = {"type": "photo", "media": photo_url, "caption": text}
             data = _request_with_retries(
                 "POST",
                 base_url + "/editMessageMedia",
                 action="editMessageMedia",
+                chat_id=channel_identifier,
                 json={"chat_id": channel_identifier, "message_id": message_id, "media": media},
             )
     else:
@@ -227,20 +476,34 @@ def edit_message(channel_identifier: str, message_id: str, text: str, photo_url:
             "POST",
             base_url + "/editMessageText",
             action="editMessageText",
+            chat_id=channel_identifier,
             json={"chat_id": channel_identifier, "message_id": message_id, "text": text},
         )
 
+    return _edit_result(data, message_id)
+
+
+def edit_caption(channel_identifier: str, message_id: str, caption: str) -> TelegramResult:
+    """Change only the caption of a media message; the media is not re-sent."""
+    if not settings.telegram_bot_token:
+        return TelegramResult(ok=False, message_id=None, error="Bot token not configured")
+
+    data = _request_with_retries(
+        "POST",
+        _base_url() + "/editMessageCaption",
+        action="editMessageCaption",
+        chat_id=channel_identifier,
+        json={"chat_id": channel_identifier, "message_id": message_id, "caption": caption},
+    )
+    return _edit_result(data, message_id)
+
+
+def _edit_result(data: dict, message_id: str) -> TelegramResult:
     if not data.get("ok"):
         description = str(data.get("description") or data)
         if "message is not modified" in description.lower():
             return TelegramResult(ok=True, message_id=str(message_id), error=None)
-        return TelegramResult(
-            ok=False,
-            message_id=None,
-            error=description,
-            retryable=bool(data.get("retryable")),
-        )
-
+        return _failed_result(data)
     return TelegramResult(ok=True, message_id=str(message_id), error=None)
 
 
@@ -253,17 +516,20 @@ def delete_message(channel_identifier: str, message_id: str) -> TelegramResult:
         "POST",
         base_url + "/deleteMessage",
         action="deleteMessage",
+        chat_id=channel_identifier,
         json={"chat_id": channel_identifier, "message_id": message_id},
     )
 
-    if not data.get("ok"):
-        return TelegramResult(
-            ok=False,
-            message_id=None,
-            error=str(data.get("description") or data),
-            retryable=bool(data.get("retryable")),
-        )
+    return _delete_result(data, message_id)
+
 
+def _delete_result(data: dict, message_id: str) -> TelegramResult:
+    if not data.get("ok"):
+        description = str(data.get("description") or data)
+        # Already gone, e.g. a redelivered delete: the desired state is reached.
+        if "message to delete not found" in description.lower():
+            return TelegramResult(ok=True, message_id=str(message_id), error=None)
+        return _failed_result(data)
     return TelegramResult(ok=True, message_id=str(message_id), error=None)
 
 
@@ -278,7 +544,10 @@ def get_message_views(channel_identifier: str, message_id: str) -> int | None:
         action="getMessage",
         params={"chat_id": channel_identifier, "message_id": message_id},
     )
+    return _views_from_response(data)
+
 
+def _views_from_response(data: dict) -> int | None:
     if not data.get("ok"):
         return None
 
@@ -0,0 +1,311 @@
+import asyncio
+import json
+
+import httpx
+
+from app.core.config import settings
+from app.services import telegram_rate_limit
+from app.services.telegram import (
+    TelegramResult,
+    _avatar_file_id,
+    _base_url,
+    _chat_from_response,
+    _client_limits,
+    _delete_result,
+    _edit_result,
+    _failure_payload,
+    _file_path_from_response,
+    _file_url,
+    _http2_enabled,
+    _is_stale_file_id,
+    _local_media_path,
+    _next_delay,
+    _normalize_identifier,
+    _parse_response,
+    _publish_result,
+    _rate_limited_payload,
+    _record_download_failure,
+    _store_avatar,
+    _views_from_response,
+    _with_uploaded_file_id,
+)
+
+
+class AsyncTelegramClient:
+    """asyncio twin of `app.services.telegram` built on `httpx.AsyncClient`.
+
+    Methods mirror the module-level sync functions and return the same
+    `TelegramResult`, so callers can switch between them without reshaping results.
+    """
+
+    def __init__(self, client: httpx.AsyncClient | None = None):
+        self._client = client or httpx.AsyncClient(
+            timeout=settings.telegram_timeout_seconds,
+            limits=_client_limits(),
+            http2=_http2_enabled(),
+        )
+
+    @property
+    def is_closed(self) -> bool:
+        return self._client.is_closed
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncTelegramClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _request_with_retries(
+        self,
+        method: str,
+        url: str,
+        *,
+        action: str,
+        chat_id: str | None = None,
+        data=None,
+        json=None,
+        files=None,
+        params=None,
+    ) -> dict:
+        last_exc: Exception | None = None
+        for attempt in range(settings.telegram_retries + 1):
+            if not await telegram_rate_limit.acquire_async(chat_id):
+                # Throttled only while Telegram was never asked; a held-back retry reports
+                # the error of the attempt before it.
+                if attempt == 0:
+                    return _rate_limited_payload(action)
+                break
+            try:
+                response = await self._client.request(method, url, data=data, json=json, files=files, params=params)
+                response.raise_for_status()
+                return _parse_response(response)
+            except Exception as exc:
+                last_exc = exc
+                delay = await asyncio.to_thread(_next_delay, exc, attempt, chat_id)
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
+        return _failure_payload(action, last_exc)
+
+    async def _download_bytes_with_retries(self, url: str) -> bytes | None:
+        last_exc: Exception | None = None
+        for attempt in range(settings.telegram_retries + 1):
+            try:
+                response = await self._client.get(url)
+                response.raise_for_status()
+                return response.content
+            except Exception as exc:
+                last_exc = exc
+                delay = await asyncio.to_thread(_next_delay, exc, attempt, None)
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
+        _record_download_failure(last_exc)
+        return None
+
+    async def _get_chat(self, chat_id_or_username: str) -> dict:
+        data = await self._request_with_retries(
+            "GET", f"{_base_url()}/getChat", action="getChat", params={"chat_id": chat_id_or_username}
+        )
+        return _chat_from_response(data)
+
+    async def _download_avatar(self, file_id: str) -> str | None:
+        file_data = await self._request_with_retries(
+            "GET", f"{_base_url()}/getFile", action="getFile", params={"file_id": file_id}
+        )
+        file_path = _file_path_from_response(file_data)
+        if not file_path:
+            return None
+        content = await self._download_bytes_with_retries(_file_url(file_path))
+        if content is None:
+            return None
+        return await asyncio.to_thread(_store_avatar, file_id, file_path, content)
+
+    async def lookup_channel_profile(self, identifier: str) -> dict:
+        if not settings.telegram_bot_token:
+            raise ValueError("Bot token not configured")
+        chat_id = _normalize_identifier(identifier)
+        result = await self._get_chat(chat_id)
+        title = result.get("title") or chat_id
+        file_id = _avatar_file_id(result)
+        avatar_url = None
+        if file_id:
+            avatar_url = await self._download_avatar(file_id)
+        return {"title": title, "avatar_url": avatar_url}
+
+    async def publish_message(
+        self, channel_identifier: str, text: str, photo_url: str | None = None, file_id: str | None = None
+    ) -> TelegramResult:
+        if not settings.telegram_bot_token:
+            return TelegramResult(ok=False, message_id=None, error="Bot token not configured")
+
+        base_url = _base_url()
+        if photo_url and photo_url.startswith("/media/"):
+            if file_id:
+                data = await self._request_with_retries(
+                    "POST",
+                    base_url + "/sendPhoto",
+                    action="sendPhoto",
+                    chat_id=channel_identifier,
+                    json={"chat_id": channel_identifier, "caption": text, "photo": file_id},
+                )
+                if data.get("ok") or not _is_stale_file_id(data):
+                    return _publish_result(data)
+            file_path = _local_media_path(photo_url)
+            if not file_path.exists():
+                return TelegramResult(ok=False, message_id=None, error="Media file not found")
+            content = await asyncio.to_thread(file_path.read_bytes)
+            data = await self._request_with_retries(
+                "POST",
+                base_url + "/sendPhoto",
+                action="sendPhoto",
+                chat_id=channel_identifier,
+                data={"chat_id": channel_identifier, "caption": text},
+                files={"photo": (file_path.name, content)},
+            )
+            return _with_uploaded_file_id(_publish_result(data), data)
+        if photo_url:
+            data = await self._request_with_retries(
+                "POST",
+                base_url + "/sendPhoto",
+                action="sendMessage",
+                chat_id=channel_identifier,
+                json={"chat_id": channel_identifier, "caption": text, "photo": photo_url},
+            )
+        else:
+            data = await self._request_with_retries(
+                "POST",
+                base_url + "/sendMessage",
+                action="sendMessage",
+                chat_id=channel_identifier,
+                json={"chat_id": channel_identifier, "text": text},
+            )
+        return _publish_result(data)
+
+    async def edit_message(
+        self,
+        channel_identifier: str,
+        message_id: str,
+        text: str,
+        photo_url: str | None = None,
+        file_id: str | None = None,
+    ) -> TelegramResult:
+        if not settings.telegram_bot_token:
+            return TelegramResult(ok=False, message_id=None, error="Bot token not configured")
+
+        base_url = _base_url()
+        if photo_url and photo_url.startswith("/media/"):
+            if file_id:
+                data = await self._request_with_retries(
+                    "POST",
+                    base_url + "/editMessageMedia",
+                    action="editMessageMedia",
+                    chat_id=channel_identifier,
+                    json={
+                        "chat_id": channel_identifier,
+                        "message_id": message_id,
+                        "media": {"type": "photo", "media": file_id, "caption": text},
+                    },
+                )
+                if data.get("ok") or not _is_stale_file_id(data):
+                    return _edit_result(data, message_id)
+            file_path = _local_media_path(photo_url)
+            if not file_path.exists():
+                return TelegramResult(ok=False, message_id=None, error="Media file not found")
+            content = await asyncio.to_thread(file_path.read_bytes)
+            media = {"type": "photo", "media": "attach://photo", "caption": text}
+            data = await self._request_with_retries(
+                "POST",
+                base_url + "/editMessageMedia",
+                action="editMessageMedia",
+                chat_id=channel_identifier,
+                data={"chat_id": channel_identifier, "message_id": message_id, "media": json.dumps(media)},
+                files={"photo": (file_path.name, content)},
+            )
+            return _with_uploaded_file_id(_edit_result(data, message_id), data)
+        if photo_url:
+            media = {"type": "photo", "media": photo_url, "caption": text}
+            data = await self._request_with_retries(
+                "POST",
+                base_url + "/editMessageMedia",
+                action="editMessageMedia",
+                chat_id=channel_identifier,
+                json={"chat_id": channel_identifier, "message_id": message_id, "media": media},
+            )
+        else:
+            data = await self._request_with_retries(
+                "POST",
+                base_url + "/editMessageText",
+                action="editMessageText",
+                chat_id=channel_identifier,
+                json={"chat_id": channel_identifier, "message_id": message_id, "text": text},
+            )
+        return _edit_result(data, message_id)
+
+    async def edit_caption(self, channel_identifier: str, message_id: str, caption: str) -> TelegramResult:
+        if not settings.telegram_bot_token:
+            return TelegramResult(ok=False, message_id=None, error="Bot token not configured")
+
+        data = await self._request_with_retries(
+            "POST",
+            _base_url() + "/editMessageCaption",
+            action="editMessageCaption",
+            chat_id=channel_identifier,
+            json={"chat_id": channel_identifier, "message_id": message_id, "caption": caption},
+        )
+        return _edit_result(data, message_id)
+
+    async def delete_message(self, channel_identifier: str, message_id: str) -> TelegramResult:
+        if not settings.telegram_bot_token:
+            return TelegramResult(ok=False, message_id=None, error="Bot token not configured")
+
+        data = await self._request_with_retries(
+            "POST",
+            _base_url() + "/deleteMessage",
+            action="deleteMessage",
+            chat_id=channel_identifier,
+            json={"chat_id": channel_identifier, "message_id": message_id},
+        )
+        return _delete_result(data, message_id)
+
+    async def get_message_views(self, channel_identifier: str, message_id: str) -> int | None:
+        if not settings.telegram_bot_token:
+            return None
+
+        data = await self._request_with_retries(
+            "GET",
+            f"{_base_url()}/getMessage",
+            action="getMessage",
+            params={"chat_id": channel_identifier, "message_id": message_id},
+        )
+        return _views_from_response(data)
+
+
+_shared_client: AsyncTelegramClient | None = None
+_shared_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_async_client() -> AsyncTelegramClient:
+    """Return the client bound to the running event loop.
+
+    httpx async connections cannot cross event loops, so a new client is created
+    whenever the loop changes (e.g. between test clients).
+    """
+    global _shared_client, _shared_loop
+    loop = asyncio.get_running_loop()
+    if _shared_client is None or _shared_client.is_closed or _shared_loop is not loop:
+        _shared_client = AsyncTelegramClient()
+        _shared_loop = loop
+    return _shared_client
+
+
+async def close_async_client() -> None:
+    global _shared_client, _shared_loop
+    client = _shared_client
+    _shared_client = None
+    _shared_loop = None
+    if client is not None and not client.is_closed:
+        await client.aclose()
@@ -0,0 +1,19 @@
+from sqlalchemy.orm import Session
+
+from app.repositories import telegram_media as telegram_media_repo
+from app.services.telegram import TelegramResult, bot_id
+
+
+def cached_file_id(db: Session, media_url: str | None) -> str | None:
+    bot = bot_id()
+    if not bot or not media_url or not media_url.startswith("/media/"):
+        return None
+    return telegram_media_repo.get_file_id(db, bot, media_url)
+
+
+def remember_file_id(db: Session, media_url: str | None, result: TelegramResult) -> None:
+    # Intentionally does not commit; the row rides on the caller's post update.
+    bot = bot_id()
+    if not bot or not media_url or not result.file_id:
+        return
+    telegram_media_repo.save_file_id(db, bot, media_url, result.file_id)
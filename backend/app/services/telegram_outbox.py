@@ -0,0 +1,188 @@
+import logging
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.metrics import TELEGRAM_EDITS_COALESCED_TOTAL, TELEGRAM_OUTBOX_DELIVERED_TOTAL
+from app.models.channel import Channel
+from app.models.post import Post
+from app.models.telegram_outbox import TelegramOutbox
+from app.repositories import telegram_outbox as outbox_repo
+from app.services.post_render import media_part, post_fingerprint, render_text
+from app.services.publisher import new_lease_owner
+from app.services.telegram import delete_message, edit_caption, edit_message
+from app.services.telegram_media import cached_file_id, remember_file_id
+from app.workers.celery_app import send_task_nowait
+
+logger = logging.getLogger("telegram_outbox")
+
+DELIVER_TASK = "app.workers.tasks.deliver_telegram_outbox"
+RETRY_MAX_DELAY_SECONDS = 300
+
+
+def enqueue_edit(db: Session, post: Post, channel: Channel) -> bool:
+    """Queue an edit of the published message; does not commit.
+
+    The edit waits for a quiet window (telegram_edit_debounce_seconds); saves
+    within it are folded into the same entry, so a burst of saves becomes one
+    Telegram call with the latest content. Returns False when the rendered text
+    and media match what Telegram already shows and no other edit is in flight.
+    """
+    new_fingerprint = post_fingerprint(post)
+    if new_fingerprint == post.telegram_fingerprint and not outbox_repo.count_pending_for_post(db, post.id):
+        return False
+    post.sync_pending = True
+    payload = {"text": render_text(post), "photo_url": post.media_url, "fingerprint": new_fingerprint}
+    now = datetime.utcnow()
+    window = settings.telegram_edit_debounce_seconds
+    if window > 0 and outbox_repo.coalesce_edit(
+        db,
+        post.id,
+        payload,
+        now=now,
+        window_seconds=window,
+        max_delay_seconds=settings.telegram_edit_debounce_max_seconds,
+    ):
+        TELEGRAM_EDITS_COALESCED_TOTAL.inc()
+        return True
+    outbox_repo.add_entry(
+        db,
+        TelegramOutbox(
+            post_id=post.id,
+            action="edit",
+            chat_id=channel.telegram_channel_identifier,
+            message_id=post.telegram_message_id,
+            payload_json=payload,
+            available_at=now + timedelta(seconds=window),
+            created_at=now,
+        ),
+    )
+    return True
+
+
+def enqueue_delete(db: Session, post: Post, channel: Channel) -> TelegramOutbox:
+    """Queue a delete of the published message; does not commit."""
+    # Debounced edits that have not been picked up yet would only delay the delete.
+    outbox_repo.supersede_unclaimed_edits(db, post.id, datetime.utcnow())
+    return outbox_repo.add_entry(
+        db,
+        TelegramOutbox(
+            post_id=post.id,
+            action="delete",
+            chat_id=channel.telegram_channel_identifier,
+            message_id=post.telegram_message_id,
+            payload_json={},
+        ),
+    )
+
+
+def notify(countdown: float | None = None) -> None:
+    # Wakes a worker once the entry is deliverable (right after the commit, or after
+    # the debounce window). If the broker is unreachable the beat poll still
+    # delivers the entry.
+    send_task_nowait(DELIVER_TASK, countdown=countdown or None)
+
+
+def _retry_delay_seconds(attempt: int) -> float:
+    ceiling = min(RETRY_MAX_DELAY_SECONDS, settings.telegram_outbox_retry_delay_seconds * 2 ** (attempt - 1))
+    return random.uniform(0, ceiling)
+
+
+def deliver_pending(db: Session) -> int:
+    entries = outbox_repo.claim_batch(
+        db,
+        owner=new_lease_owner(),
+        limit=settings.telegram_outbox_batch_size,
+        lease_seconds=settings.telegram_outbox_lease_seconds,
+    )
+    for entry in entries:
+        _deliver(db, entry)
+    return len(entries)
+
+
+def _deliver(db: Session, entry: TelegramOutbox) -> None:
+    now = datetime.utcnow()
+    entry.lease_owner = None
+    if entry.action == "edit" and outbox_repo.has_newer_pending(db, entry):
+        # A later edit (or the delete) of the same message makes this one moot.
+        entry.status = outbox_repo.SUPERSEDED
+        entry.delivered_at = now
+        db.commit()
+        TELEGRAM_OUTBOX_DELIVERED_TOTAL.labels(entry.action, entry.status).inc()
+        return
+
+    photo_url = entry.payload_json.get("photo_url")
+    new_fingerprint = entry.payload_json.get("fingerprint")
+    post = db.get(Post, entry.post_id) if entry.post_id is not None else None
+    if entry.action == "edit" and post is not None and new_fingerprint:
+        if new_fingerprint == post.telegram_fingerprint:
+            # E.g. an edit that reverted a superseded one: Telegram already shows this.
+            entry.status = outbox_repo.SKIPPED
+            entry.delivered_at = now
+            db.flush()
+            post.sync_pending = outbox_repo.count_pending_for_post(db, post.id) > 0
+            db.commit()
+            TELEGRAM_OUTBOX_DELIVERED_TOTAL.labels(entry.action, entry.status).inc()
+            return
+
+    if entry.action == "edit":
+        # Decided against what Telegram last accepted, not what was current at enqueue
+        # time, so an earlier media edit that was delivered meanwhile is accounted for.
+        caption_only = (
+            photo_url
+            and post is not None
+            and new_fingerprint
+            and post.telegram_fingerprint
+            and media_part(new_fingerprint) == media_part(post.telegram_fingerprint)
+        )
+        if caption_only:
+            result = edit_caption(entry.chat_id, entry.message_id, entry.payload_json.get("text", ""))
+        else:
+            result = edit_message(
+                entry.chat_id,
+                entry.message_id,
+                entry.payload_json.get("text", ""),
+                photo_url,
+                file_id=cached_file_id(db, photo_url),
+            )
+    else:
+        result = delete_message(entry.chat_id, entry.message_id)
+
+    entry.attempts += 1
+    if result.ok:
+        entry.status = outbox_repo.SENT
+        entry.last_error = None
+        entry.delivered_at = now
+        if entry.action == "edit":
+            remember_file_id(db, photo_url, result)
+            if post is not None and new_fingerprint:
+                post.telegram_fingerprint = new_fingerprint
+    elif result.retryable and entry.attempts < settings.telegram_outbox_max_attempts:
+        entry.last_error = result.error
+        entry.available_at = now + timedelta(seconds=_retry_delay_seconds(entry.attempts))
+    else:
+        entry.status = outbox_repo.FAILED
+        entry.last_error = result.error
+
+    if entry.status != outbox_repo.PENDING and post is not None:
+        db.flush()
+        post.sync_pending = outbox_repo.count_pending_for_post(db, post.id) > 0
+        if entry.status == outbox_repo.FAILED:
+            post.last_error = result.error
+    db.commit()
+
+    TELEGRAM_OUTBOX_DELIVERED_TOTAL.labels(entry.action, entry.status).inc()
+    log = logger.info if result.ok else logger.warning
+    log(
+        "telegram_outbox_delivery",
+        extra={
+            "outbox_id": entry.id,
+            "post_id": entry.post_id,
+            "action": entry.action,
+            "status": entry.status,
+            "attempts": entry.attempts,
+            "error": result.error,
+        },
+    )
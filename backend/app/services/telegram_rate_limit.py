@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import time
+
+import redis
+
+from app.core.config import settings
+from app.metrics import TELEGRAM_FLOOD_WAIT_TOTAL, TELEGRAM_RATE_LIMIT_WAIT_SECONDS
+from app.services.redis_backoff import RedisBackoff
+
+logger = logging.getLogger("telegram_rate_limit")
+
+KEY_PREFIX = "tg:rl"
+
+# GCRA over two buckets (bot-wide and per-chat) plus a per-chat "blocked until"
+# key set from Telegram's retry_after. Tokens are only consumed when both buckets
+# admit the call, so a caller that has to wait never skews the other bucket.
+# Returns 0 when admitted, otherwise the number of milliseconds to wait.
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local blocked_until = tonumber(redis.call('GET', KEYS[3]) or '0')
+local global_blocked_until = tonumber(redis.call('GET', KEYS[4]) or '0')
+blocked_until = math.max(blocked_until, global_blocked_until)
+if blocked_until > now then
+  return blocked_until - now
+end
+
+local function tat_for(key)
+  local tat = tonumber(redis.call('GET', key) or '0')
+  if tat < now then
+    tat = now
+  end
+  return tat
+end
+
+local g_interval = tonumber(ARGV[1])
+local g_tolerance = tonumber(ARGV[2])
+local c_interval = tonumber(ARGV[3])
+local c_tolerance = tonumber(ARGV[4])
+
+local g_tat = tat_for(KEYS[1])
+local wait = g_tat - g_tolerance - now
+local c_tat = 0
+if c_interval > 0 then
+  c_tat = tat_for(KEYS[2])
+  wait = math.max(wait, c_tat - c_tolerance - now)
+end
+if wait > 0 then
+  return wait
+end
+
+g_tat = g_tat + g_interval
+redis.call('SET', KEYS[1], g_tat, 'PX', g_tat - now + 1000)
+if c_interval > 0 then
+  c_tat = c_tat + c_interval
+  redis.call('SET', KEYS[2], c_tat, 'PX', c_tat - now + 1000)
+end
+return 0
+"""
+
+_PENALIZE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local until_ms = now + tonumber(ARGV[1])
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if until_ms > current then
+  redis.call('SET', KEYS[1], until_ms, 'PX', tonumber(ARGV[1]) + 1000)
+end
+return until_ms
+"""
+
+_redis_client: redis.Redis | None = None
+_acquire = None
+_penalize = None
+_backoff = RedisBackoff()
+
+
+def _redis() -> redis.Redis:
+    global _redis_client, _acquire, _penalize
+    if _redis_client is None:
+        url = settings.telegram_rate_limit_redis_url or settings.redis_url
+        _redis_client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        _acquire = _redis_client.register_script(_ACQUIRE_SCRIPT)
+        _penalize = _redis_client.register_script(_PENALIZE_SCRIPT)
+    return _redis_client
+
+
+def _bot_key() -> str:
+    # Limits are per bot token; key by the bot id part so the secret never lands in Redis.
+    token = settings.telegram_bot_token or ""
+    return token.split(":", 1)[0] or "default"
+
+
+def _keys(chat_id: str | None) -> list[str]:
+    bot = _bot_key()
+    chat = str(chat_id) if chat_id is not None else "-"
+    return [
+        f"{KEY_PREFIX}:{bot}:global",
+        f"{KEY_PREFIX}:{bot}:chat:{chat}",
+        f"{KEY_PREFIX}:{bot}:blocked:{chat}",
+        f"{KEY_PREFIX}:{bot}:blocked:-",
+    ]
+
+
+def _gcra_args(chat_id: str | None) -> list[int]:
+    g_interval = max(1, int(1000 / settings.telegram_global_rate_per_second))
+    g_tolerance = g_interval * (settings.telegram_global_rate_per_second - 1)
+    if chat_id is None:
+        return [g_interval, g_tolerance, 0, 0]
+    c_interval = max(1, int(60_000 / settings.telegram_chat_rate_per_minute))
+    c_tolerance = c_interval * (settings.telegram_chat_rate_per_minute - 1)
+    return [g_interval, g_tolerance, c_interval, c_tolerance]
+
+
+def _unavailable() -> None:
+    if _backoff.failed():
+        logger.warning("telegram_rate_limit_unavailable", exc_info=True)
+
+
+def try_acquire(chat_id: str | None = None) -> float:
+    """Try to take a send token; returns 0 when admitted, else seconds to wait."""
+    # Graceful degradation: an unavailable limiter must not stop publishing, nor
+    # make every send wait out the Redis socket timeout first.
+    if not settings.telegram_rate_limit_enabled or not _backoff.available():
+        return 0.0
+    try:
+        _redis()
+        wait_ms = int(_acquire(keys=_keys(chat_id), args=_gcra_args(chat_id)))
+    except redis.RedisError:
+        _unavailable()
+        return 0.0
+    return wait_ms / 1000.0
+
+
+def acquire(chat_id: str | None = None) -> bool:
+    """Block until a send token is available; False if the wait would exceed the cap."""
+    deadline = time.monotonic() + settings.telegram_rate_limit_max_wait_seconds
+    waited = 0.0
+    while True:
+        wait = try_acquire(chat_id)
+        if wait <= 0:
+            TELEGRAM_RATE_LIMIT_WAIT_SECONDS.observe(waited)
+            return True
+        if time.monotonic() + wait > deadline:
+            return False
+        time.sleep(wait)
+        waited += wait
+
+
+async def acquire_async(chat_id: str | None = None) -> bool:
+    deadline = time.monotonic() + settings.telegram_rate_limit_max_wait_seconds
+    waited = 0.0
+    while True:
+        wait = await asyncio.to_thread(try_acquire, chat_id)
+        if wait <= 0:
+            TELEGRAM_RATE_LIMIT_WAIT_SECONDS.observe(waited)
+            return True
+        if time.monotonic() + wait > deadline:
+            return False
+        await asyncio.sleep(wait)
+        waited += wait
+
+
+def penalize(chat_id: str | None, retry_after: float) -> None:
+    """Apply a server-provided retry_after to every caller of the chat (or the whole bot)."""
+    TELEGRAM_FLOOD_WAIT_TOTAL.inc()
+    if not settings.telegram_rate_limit_enabled or not _backoff.available():
+        return
+    try:
+        _redis()
+        _penalize(keys=[_keys(chat_id)[2]], args=[int(retry_after * 1000)])
+    except redis.RedisError:
+        _unavailable()
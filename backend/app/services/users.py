@@ -3,9 +3,12 @@ from fastapi import HTTPException, status
 from app.models.user import User
 from app.schemas.user import UserCreate
 from app.core.security import hash_password
+from app.repositories.pagination import after, decode_cursor
 import secrets
 from app.services.audit import log_action
 
+CURSOR_SCOPE = "users"
+
 
 def create_user(db: Session, payload: UserCreate, *, actor_user_id: int) -> User:
     existing = db.query(User).filter(User.email == payload.email).first()
@@ -27,7 +30,9 @@ def create_user(db: Session, payload: UserCreate, *, actor_user_id: int) -> User
     return user
 
 
-def list_users(db: Session, *, limit: int = 50, offset: int = 0, q: str | None = None) -> tuple[list[User], int]:
+def list_users(
+    db: Session, *, limit: int = 50, offset: int = 0, q: str | None = None, cursor: str | None = None
+) -> tuple[list[User], int]:
     safe_limit = max(1, min(int(limit), 200))
     safe_offset = max(0, int(offset))
     base = db.query(User)
@@ -36,7 +41,10 @@ def list_users(db: Session, *, limit: int = 50, offset: int = 0, q: str | None =
         base = base.filter(User.email.ilike(like))
     # Using Query.count() avoids cross-dialect quirks with with_entities(func.count()).
     total = base.order_by(None).count()
-    items = base.order_by(User.created_at.desc()).limit(safe_limit).offset(safe_offset).all()
+    if cursor:
+        base = base.filter(after(User.created_at, User.id, decode_cursor(CURSOR_SCOPE, cursor), descending=True))
+        safe_offset = 0
+    items = base.order_by(User.created_at.desc(), User.id.desc()).limit(safe_limit).offset(safe_offset).all()
     return items, int(total)
 
 
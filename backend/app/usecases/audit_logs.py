@@ -8,9 +8,11 @@ from sqlalchemy.orm import Session
 
 from app.models.audit_log import AuditLog
 from app.models.user import User
+from app.repositories.pagination import TotalMode, after, count_total, decode_cursor, next_cursor
 from app.schemas.audit_log import AuditLogListOut, AuditLogOut
 
 MAX_LIMIT = 200
+CURSOR_SCOPE = "audit_logs"
 
 
 def list_audit_logs(
@@ -24,9 +26,13 @@ def list_audit_logs(
     action: str | None = None,
     since: datetime | None = None,
     until: datetime | None = None,
+    cursor: str | None = None,
+    total_mode: TotalMode = "exact",
 ) -> AuditLogListOut:
+    """Newest first. A `cursor` from the previous page takes precedence over `offset`."""
     safe_limit = max(1, min(int(limit), MAX_LIMIT))
     safe_offset = max(0, int(offset))
+    position = decode_cursor(CURSOR_SCOPE, cursor) if cursor else None
 
     stmt = (
         select(
@@ -62,8 +68,18 @@ def list_audit_logs(
     stmt = apply_filters(stmt)
     count_stmt = apply_filters(count_stmt)
 
-    total = db.execute(count_stmt).scalar_one()
-    rows = db.execute(stmt.order_by(AuditLog.created_at.desc()).limit(safe_limit).offset(safe_offset)).all()
+    total = count_total(
+        db,
+        count_stmt,
+        apply_filters(select(AuditLog.id)),
+        mode=total_mode,
+        cache_key=(CURSOR_SCOPE, entity_type, entity_id, actor_user_id, action, since, until),
+    )
+    stmt = stmt.order_by(AuditLog.created_at.desc(), AuditLog.id.desc()).limit(safe_limit)
+    if position is not None:
+        stmt = stmt.where(after(AuditLog.created_at, AuditLog.id, position, descending=True))
+        safe_offset = 0
+    rows = db.execute(stmt.offset(safe_offset)).all()
 
     items = [
         AuditLogOut(
@@ -79,7 +95,14 @@ def list_audit_logs(
         for r in rows
     ]
 
-    return AuditLogListOut(items=items, total=int(total), limit=safe_limit, offset=safe_offset)
+    return AuditLogListOut(
+        items=items,
+        total=total,
+        total_mode=total_mode,
+        limit=safe_limit,
+        offset=safe_offset,
+        next_cursor=next_cursor(CURSOR_SCOPE, rows, safe_limit, "created_at"),
+    )
 
 
 def get_audit_log(db: Session, audit_id: int) -> AuditLogOut:
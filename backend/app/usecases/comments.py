@@ -6,15 +6,21 @@ from app.models.post import Post
 from app.models.post_comment import PostComment
 from app.models.user import User
 from app.repositories import comments as comment_repo
+from app.repositories.pagination import decode_cursor
 from app.schemas.comments import PostCommentCreate, PostCommentOut
 
+CURSOR_SCOPE = "comments"
 
-def list_post_comments(db: Session, post_id: int, limit: int = 100, offset: int = 0) -> list[PostCommentOut]:
+
+def list_post_comments(
+    db: Session, post_id: int, limit: int = 100, offset: int = 0, cursor: str | None = None
+) -> list[PostCommentOut]:
     post = db.get(Post, int(post_id))
     if not post:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
 
-    comments = comment_repo.list_comments_for_post(db, post_id, limit=limit, offset=offset)
+    position = decode_cursor(CURSOR_SCOPE, cursor) if cursor else None
+    comments = comment_repo.list_comments_for_post(db, post_id, limit=limit, offset=offset, position=position)
     if not comments:
         return []
 
@@ -6,6 +6,7 @@ from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.models.channel import Channel
+from app.models.channel_post_stats import ChannelPostStats
 from app.models.enums import PostStatus
 from app.models.post import Post
 from app.schemas.dashboard import (
@@ -19,63 +20,51 @@ from app.schemas.dashboard import (
 def get_overview(db: Session, *, now: datetime | None = None, upcoming_limit: int = 20, errors_limit: int = 10) -> DashboardOverview:
     now = now or datetime.utcnow()
 
-    # Status counts per channel and total.
-    counts_rows = db.execute(
-        select(Post.channel_id, Post.status, func.count().label("cnt")).group_by(Post.channel_id, Post.status)
-    ).all()
-
-    per_channel_counts: dict[int, dict[PostStatus, int]] = {}
+    # Per-channel aggregates are maintained incrementally in channel_post_stats.
+    stats_by_channel = {int(row.channel_id): row for row in db.query(ChannelPostStats).all()}
     total_counts: dict[PostStatus, int] = {}
-    for channel_id, status, cnt in counts_rows:
-        per_channel_counts.setdefault(int(channel_id), {})[status] = int(cnt)
-        total_counts[status] = int(total_counts.get(status, 0) + int(cnt))
-
-    # Next scheduled in the future per channel.
-    next_rows = db.execute(
-        select(Post.channel_id, func.min(Post.scheduled_at).label("next_at"))
-        .where(Post.status == PostStatus.scheduled)
-        .where(Post.scheduled_at.is_not(None))
-        .where(Post.scheduled_at > now)
-        .group_by(Post.channel_id)
-    ).all()
-    next_by_channel = {int(r[0]): r[1] for r in next_rows}
-
-    # Overdue scheduled count per channel.
-    overdue_rows = db.execute(
-        select(Post.channel_id, func.count().label("cnt"))
-        .where(Post.status == PostStatus.scheduled)
-        .where(Post.scheduled_at.is_not(None))
-        .where(Post.scheduled_at <= now)
-        .group_by(Post.channel_id)
-    ).all()
-    overdue_by_channel = {int(r[0]): int(r[1]) for r in overdue_rows}
-
-    # Last post time per channel (any status).
-    last_rows = db.execute(
-        select(Post.channel_id, func.max(Post.created_at).label("last_post_at")).group_by(Post.channel_id)
-    ).all()
-    last_by_channel = {int(r[0]): r[1] for r in last_rows}
-
-    # Last published time per channel.
-    last_pub_rows = db.execute(
-        select(Post.channel_id, func.max(Post.published_at).label("last_published_at"))
-        .where(Post.published_at.is_not(None))
-        .group_by(Post.channel_id)
-    ).all()
-    last_published_by_channel = {int(r[0]): r[1] for r in last_pub_rows}
+    for stats in stats_by_channel.values():
+        for status, cnt in stats.status_counts().items():
+            total_counts[status] = total_counts.get(status, 0) + cnt
+
+    # Only channels whose earliest scheduled post is already due need a look at posts:
+    # everywhere else nothing is overdue and first_scheduled_at is the next one.
+    overdue_channel_ids = [
+        channel_id
+        for channel_id, stats in stats_by_channel.items()
+        if stats.first_scheduled_at is not None and stats.first_scheduled_at <= now
+    ]
+    next_by_channel: dict[int, datetime | None] = {
+        channel_id: stats.first_scheduled_at for channel_id, stats in stats_by_channel.items()
+    }
+    overdue_by_channel: dict[int, int] = {}
+    if overdue_channel_ids:
+        scheduled = (
+            select(Post.channel_id)
+            .where(Post.status == PostStatus.scheduled)
+            .where(Post.channel_id.in_(overdue_channel_ids))
+            .group_by(Post.channel_id)
+        )
+        overdue_rows = db.execute(scheduled.add_columns(func.count()).where(Post.scheduled_at <= now)).all()
+        overdue_by_channel = {int(r[0]): int(r[1]) for r in overdue_rows}
+        next_rows = db.execute(scheduled.add_columns(func.min(Post.scheduled_at)).where(Post.scheduled_at > now)).all()
+        for channel_id in overdue_channel_ids:
+            next_by_channel[channel_id] = None
+        next_by_channel.update({int(r[0]): r[1] for r in next_rows})
 
     # Build channel summaries using channel list as ground truth so channels with zero posts still appear.
     channels = db.query(Channel).order_by(Channel.created_at.desc()).all()
     channel_summaries: list[DashboardChannelSummary] = []
     for ch in channels:
+        stats = stats_by_channel.get(int(ch.id))
         channel_summaries.append(
             DashboardChannelSummary(
                 channel_id=int(ch.id),
                 next_scheduled_at=next_by_channel.get(int(ch.id)),
                 overdue_scheduled_count=int(overdue_by_channel.get(int(ch.id), 0)),
-                last_post_at=last_by_channel.get(int(ch.id)),
-                last_published_at=last_published_by_channel.get(int(ch.id)),
-                status_counts=per_channel_counts.get(int(ch.id), {}),
+                last_post_at=stats.last_post_at if stats else None,
+                last_published_at=stats.last_published_at if stats else None,
+                status_counts=stats.status_counts() if stats else {},
             )
         )
 
@@ -5,9 +5,11 @@ from sqlalchemy.orm import Session
 
 from app.models.channel import Channel
 from app.models.suggestion import Suggestion
+from app.repositories.pagination import TotalMode, after, count_total, decode_cursor, next_cursor
 from app.schemas.inbox import SuggestionInboxItem, SuggestionInboxOut
 
 MAX_LIMIT = 200
+CURSOR_SCOPE = "inbox"
 
 
 def list_suggestions_inbox(
@@ -17,9 +19,12 @@ def list_suggestions_inbox(
     offset: int = 0,
     channel_id: int | None = None,
     q: str | None = None,
+    cursor: str | None = None,
+    total_mode: TotalMode = "exact",
 ) -> SuggestionInboxOut:
     safe_limit = max(1, min(int(limit), MAX_LIMIT))
     safe_offset = max(0, int(offset))
+    position = decode_cursor(CURSOR_SCOPE, cursor) if cursor else None
 
     base = (
         select(
@@ -52,8 +57,12 @@ def list_suggestions_inbox(
         base = base.where(filt)
         count_stmt = count_stmt.where(filt)
 
-    total = int(db.execute(count_stmt).scalar_one())
-    rows = db.execute(base.order_by(Suggestion.created_at.desc()).limit(safe_limit).offset(safe_offset)).all()
+    total = count_total(db, count_stmt, base, mode=total_mode, cache_key=(CURSOR_SCOPE, channel_id, q))
+    page = base.order_by(Suggestion.created_at.desc(), Suggestion.id.desc()).limit(safe_limit)
+    if position is not None:
+        page = page.where(after(Suggestion.created_at, Suggestion.id, position, descending=True))
+        safe_offset = 0
+    rows = db.execute(page.offset(safe_offset)).all()
 
     items = [
         SuggestionInboxItem(
@@ -69,5 +78,12 @@ def list_suggestions_inbox(
         )
         for r in rows
     ]
-    return SuggestionInboxOut(items=items, total=total, limit=safe_limit, offset=safe_offset)
+    return SuggestionInboxOut(
+        items=items,
+        total=total,
+        total_mode=total_mode,
+        limit=safe_limit,
+        offset=safe_offset,
+        next_cursor=next_cursor(CURSOR_SCOPE, rows, safe_limit, "created_at"),
+    )
 
@@ -1,6 +1,10 @@
+import asyncio
+import time
 from datetime import datetime
+from uuid import uuid4
 
 from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
@@ -8,14 +12,21 @@ from app.models.channel import Channel
 from app.models.enums import PostStatus
 from app.models.post import Post
 from app.repositories import posts as post_repo
+from app.repositories.pagination import decode_cursor, next_cursor
 from app.schemas.post import PostCreate, PostUpdate, ScheduleRequest, RejectRequest
+from app.services import events, publish_queue
 from app.services.audit import log_action
-from app.services.telegram import edit_message, delete_message, get_message_views
-from app.services.publisher import publish_post
+from app.services import telegram_outbox
+from app.services.telegram import get_message_views
+from app.services.telegram_async import get_async_client
+from app.services.publisher import claim_post, publish_post
+from app.workers.celery_app import send_task_nowait
 from app.metrics import POST_STATUS_TRANSITIONS_TOTAL
 from app.models.post_comment import PostComment
 from app.repositories import comments as comment_repo
 
+CURSOR_SCOPE = "posts"
+
 
 def create_post(db: Session, channel_id: int, payload: PostCreate, user) -> Post:
     channel = db.get(Channel, channel_id)
@@ -32,11 +43,21 @@ def create_post(db: Session, channel_id: int, payload: PostCreate, user) -> Post
     post = post_repo.create_post(db, post)
     log_action(db, "post", post.id, "create", user.id, {"status": post.status})
     db.commit()
+    events.post_changed(post)
     return post
 
 
-def list_posts(db: Session, channel_id: int, status_filters, limit: int, offset: int) -> list[dict]:
-    rows = post_repo.list_posts_compact(db, channel_id, status_filters, limit=limit, offset=offset)
+def _rows_with_views(rows: list[dict]):
+    for row in rows:
+        if row.get("status") == PostStatus.published and row.get("telegram_message_id"):
+            yield row
+
+
+def list_posts(
+    db: Session, channel_id: int, status_filters, limit: int, offset: int, cursor: str | None = None
+) -> list[dict]:
+    position = decode_cursor(CURSOR_SCOPE, cursor) if cursor else None
+    rows = post_repo.list_posts_compact(db, channel_id, status_filters, limit=limit, offset=offset, position=position)
     if not settings.telegram_feature_views:
         return rows
 
@@ -44,13 +65,8 @@ def list_posts(db: Session, channel_id: int, status_filters, limit: int, offset:
     if not channel:
         return rows
 
-    for row in rows:
-        if row.get("status") != PostStatus.published:
-            continue
-        message_id = row.get("telegram_message_id")
-        if not message_id:
-            continue
-        views = get_message_views(channel.telegram_channel_identifier, message_id)
+    for row in _rows_with_views(rows):
+        views = get_message_views(channel.telegram_channel_identifier, row["telegram_message_id"])
         if views is None:
             continue
         if row.get("last_known_views") != views:
@@ -59,6 +75,36 @@ def list_posts(db: Session, channel_id: int, status_filters, limit: int, offset:
     return rows
 
 
+async def list_posts_async(
+    db: AsyncSession, channel_id: int, status_filters, limit: int, offset: int, cursor: str | None = None
+) -> list[dict]:
+    """list_posts for async endpoints: view counts come from the async Telegram client."""
+    position = decode_cursor(CURSOR_SCOPE, cursor) if cursor else None
+    rows = await db.run_sync(
+        post_repo.list_posts_compact, channel_id, status_filters, limit=limit, offset=offset, position=position
+    )
+    if not settings.telegram_feature_views:
+        return rows
+
+    channel = await db.get(Channel, channel_id)
+    if not channel:
+        return rows
+
+    client = get_async_client()
+    for row in _rows_with_views(rows):
+        views = await client.get_message_views(channel.telegram_channel_identifier, row["telegram_message_id"])
+        if views is None:
+            continue
+        if row.get("last_known_views") != views:
+            await db.run_sync(post_repo.update_last_known_views, row["id"], views)
+            row["last_known_views"] = views
+    return rows
+
+
+def list_posts_next_cursor(rows: list[dict], limit: int) -> str | None:
+    return next_cursor(CURSOR_SCOPE, rows, max(1, min(limit, post_repo.MAX_LIST_LIMIT)), "created_at")
+
+
 def get_post(db: Session, post_id: int) -> Post:
     post = post_repo.get_post(db, post_id)
     if not post:
@@ -68,28 +114,25 @@ def get_post(db: Session, post_id: int) -> Post:
 
 def update_post(db: Session, post_id: int, payload: PostUpdate, user) -> Post:
     post = get_post(db, post_id)
+    channel = None
+    if post.status == PostStatus.published and post.telegram_message_id:
+        channel = db.get(Channel, post.channel_id)
+        if not channel:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Channel not found")
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(post, field, value)
     post.updated_by = user.id
     post.updated_at = datetime.utcnow()
-    post = post_repo.save_post(db, post)
+    queued = False
+    if channel is not None:
+        # The Telegram edit is delivered by a worker; it commits together with the post.
+        # Saves that leave the rendered message unchanged queue nothing.
+        queued = telegram_outbox.enqueue_edit(db, post, channel)
     log_action(db, "post", post.id, "update", user.id, {"status": post.status})
-    db.commit()
-
-    if post.status == PostStatus.published and post.telegram_message_id:
-        channel = db.get(Channel, post.channel_id)
-        if not channel:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Channel not found")
-        edit_result = edit_message(
-            channel.telegram_channel_identifier,
-            post.telegram_message_id,
-            f"{post.title}\n\n{post.body_text}",
-            post.media_url,
-        )
-        if not edit_result.ok:
-            post.last_error = edit_result.error
-            post_repo.save_post(db, post)
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=edit_result.error or "Edit failed")
+    post = post_repo.save_post(db, post)
+    events.post_changed(post)
+    if queued:
+        telegram_outbox.notify(countdown=settings.telegram_edit_debounce_seconds)
     return post
 
 
@@ -104,6 +147,7 @@ def submit_approval(db: Session, post_id: int, user) -> Post:
     post.updated_at = datetime.utcnow()
     post = post_repo.save_post(db, post)
     POST_STATUS_TRANSITIONS_TOTAL.labels(previous.value, post.status.value).inc()
+    events.post_changed(post, previous)
     return post
 
 
@@ -121,6 +165,7 @@ def approve_post(db: Session, post_id: int, user) -> Post:
     POST_STATUS_TRANSITIONS_TOTAL.labels(previous.value, post.status.value).inc()
     log_action(db, "post", post.id, "approve", user.id, {"status": post.status})
     db.commit()
+    events.post_changed(post, previous)
     return post
 
 
@@ -148,6 +193,7 @@ def reject_post(db: Session, post_id: int, payload: RejectRequest, user) -> Post
     POST_STATUS_TRANSITIONS_TOTAL.labels(previous.value, post.status.value).inc()
     log_action(db, "post", post.id, "reject", user.id, {"status": post.status, "comment": payload.comment})
     db.commit()
+    events.post_changed(post, previous)
     return post
 
 
@@ -171,6 +217,7 @@ def schedule_post(db: Session, post_id: int, payload: ScheduleRequest, user) ->
     previous = post.status
     post.status = PostStatus.scheduled
     post.scheduled_at = scheduled_at
+    post.next_retry_at = None
     post.updated_by = user.id
     post.updated_at = datetime.utcnow()
     post = post_repo.save_post(db, post)
@@ -179,40 +226,95 @@ def schedule_post(db: Session, post_id: int, payload: ScheduleRequest, user) ->
         POST_STATUS_TRANSITIONS_TOTAL.labels(original.value, previous.value).inc()
     log_action(db, "post", post.id, "schedule", user.id, {"status": post.status, "scheduled_at": str(payload.scheduled_at)})
     db.commit()
+    events.post_changed(post, original)
+    publish_queue.schedule(post.id, post.scheduled_at)
     return post
 
 
-def publish_now(db: Session, post_id: int, user) -> Post:
-    # Prevent duplicate publishes by locking the row before calling Telegram.
-    post = (
-        db.query(Post)  # type: ignore[attr-defined]
-        .filter(Post.id == post_id)
-        .with_for_update()
-        .first()
-    )
-    if not post:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
-    if post.status in {PostStatus.draft, PostStatus.rejected}:
-        post.status = PostStatus.pending
-    if post.status == PostStatus.pending:
-        post.status = PostStatus.approved
-        post.editor_comment = None
-    if post.status not in {PostStatus.approved, PostStatus.scheduled}:
+PUBLISHABLE_STATUSES = {
+    PostStatus.draft,
+    PostStatus.rejected,
+    PostStatus.pending,
+    PostStatus.approved,
+    PostStatus.scheduled,
+}
+
+
+PUBLISH_NOW_TASK = "app.workers.tasks.publish_now_task"
+PUBLISH_JOB_POLL_SECONDS = 0.5
+
+
+def _publish_job(post: Post, job_id: str) -> dict:
+    if post.status == PostStatus.published:
+        state = "published"
+    elif post.status == PostStatus.failed:
+        state = "failed"
+    elif post.status == PostStatus.scheduled:
+        state = "retry_scheduled"
+    else:
+        state = "pending"
+    return {"job_id": job_id, "post_id": post.id, "state": state, "post": post}
+
+
+def publish_now(db: Session, post_id: int, user) -> dict:
+    post = get_post(db, post_id)
+    if post.status == PostStatus.publishing:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Post is already being published")
+    if post.status not in PUBLISHABLE_STATUSES:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status")
 
-    return publish_post(db, post, user.id)
+    previous = post.status
+    # The claim (lease owned by the job id) prevents duplicate publishes; the
+    # Telegram call itself runs on the priority worker queue.
+    job_id = uuid4().hex
+    if not claim_post(db, post.id, from_statuses={previous}, owner=job_id):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Post is already being published")
+    db.refresh(post)
+    post.publish_job_id = job_id
+    if previous in {PostStatus.draft, PostStatus.rejected, PostStatus.pending}:
+        post.editor_comment = None
+    db.commit()
+    events.post_changed(post, previous)
+    if not send_task_nowait(PUBLISH_NOW_TASK, args=(post.id, user.id, job_id), task_id=job_id):
+        # Broker unreachable: publish in the request rather than leave the post
+        # claimed until its lease expires.
+        publish_post(db, post, user.id, respect_cooldown=False)
+    return _publish_job(post, job_id)
+
+
+async def get_publish_job(db: AsyncSession, post_id: int, job_id: str, wait_seconds: float = 0) -> dict:
+    """Current state of a publish-now job; long-polls up to `wait_seconds` while pending."""
+    post = await db.get(Post, post_id)
+    if not post:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+    if post.publish_job_id != job_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Publish job not found")
+    deadline = time.monotonic() + wait_seconds
+    job = _publish_job(post, job_id)
+    while job["state"] == "pending" and time.monotonic() < deadline:
+        # End the read transaction so the pooled connection is not held while waiting.
+        await db.commit()
+        await asyncio.sleep(PUBLISH_JOB_POLL_SECONDS)
+        await db.refresh(post)
+        job = _publish_job(post, job_id)
+    return job
 
 
 def delete_post(db: Session, post_id: int, user) -> None:
     post = get_post(db, post_id)
+    channel_id = post.channel_id
+    queued = False
     if post.status == PostStatus.published and post.telegram_message_id:
         channel = db.get(Channel, post.channel_id)
         if not channel:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Channel not found")
-        delete_result = delete_message(channel.telegram_channel_identifier, post.telegram_message_id)
-        if not delete_result.ok:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=delete_result.error or "Delete failed")
+        # Delivered by a worker; the entry commits together with the row delete.
+        telegram_outbox.enqueue_delete(db, post, channel)
+        queued = True
     post_repo.delete_source_items_for_post(db, post_id)
     post_repo.delete_post(db, post)
     log_action(db, "post", post_id, "delete", user.id, {})
     db.commit()
+    events.post_deleted(post_id, channel_id)
+    if queued:
+        telegram_outbox.notify()
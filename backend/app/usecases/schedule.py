@@ -9,10 +9,13 @@ from sqlalchemy.orm import Session
 from app.models.channel import Channel
 from app.models.enums import PostStatus
 from app.models.post import Post
+from app.repositories.pagination import TotalMode, after, count_total, decode_cursor, next_cursor
 from app.schemas.schedule import ScheduledPostItem, ScheduledPostListOut
+from app.services import publish_queue
 from app.services.audit import log_action
 
 MAX_LIMIT = 200
+CURSOR_SCOPE = "schedule"
 
 
 def list_scheduled_posts(
@@ -23,9 +26,12 @@ def list_scheduled_posts(
     channel_id: int | None = None,
     since: datetime | None = None,
     until: datetime | None = None,
+    cursor: str | None = None,
+    total_mode: TotalMode = "exact",
 ) -> ScheduledPostListOut:
     safe_limit = max(1, min(int(limit), MAX_LIMIT))
     safe_offset = max(0, int(offset))
+    position = decode_cursor(CURSOR_SCOPE, cursor) if cursor else None
 
     base = (
         select(
@@ -54,8 +60,14 @@ def list_scheduled_posts(
         base = base.where(Post.scheduled_at.is_not(None)).where(Post.scheduled_at <= until)
         count_stmt = count_stmt.where(Post.scheduled_at.is_not(None)).where(Post.scheduled_at <= until)
 
-    total = int(db.execute(count_stmt).scalar_one())
-    rows = db.execute(base.order_by(Post.scheduled_at.asc().nullslast()).limit(safe_limit).offset(safe_offset)).all()
+    total = count_total(
+        db, count_stmt, base, mode=total_mode, cache_key=(CURSOR_SCOPE, channel_id, since, until)
+    )
+    page = base.order_by(Post.scheduled_at.asc().nullslast(), Post.id.asc()).limit(safe_limit)
+    if position is not None:
+        page = page.where(after(Post.scheduled_at, Post.id, position, descending=False, nulls_last=True))
+        safe_offset = 0
+    rows = db.execute(page.offset(safe_offset)).all()
     items = [
         ScheduledPostItem(
             id=int(r.id),
@@ -69,7 +81,14 @@ def list_scheduled_posts(
         )
         for r in rows
     ]
-    return ScheduledPostListOut(items=items, total=total, limit=safe_limit, offset=safe_offset)
+    return ScheduledPostListOut(
+        items=items,
+        total=total,
+        total_mode=total_mode,
+        limit=safe_limit,
+        offset=safe_offset,
+        next_cursor=next_cursor(CURSOR_SCOPE, rows, safe_limit, "scheduled_at"),
+    )
 
 
 def requeue_failed_post(db: Session, *, post_id: int, actor_user_id: int, delay_seconds: int = 60) -> Post:
@@ -82,8 +101,10 @@ def requeue_failed_post(db: Session, *, post_id: int, actor_user_id: int, delay_
     now = datetime.utcnow()
     post.status = PostStatus.scheduled
     post.scheduled_at = now + timedelta(seconds=delay)
+    post.next_retry_at = None
     post.updated_by = actor_user_id
     post.updated_at = now
     log_action(db, "post", post.id, "requeue", actor_user_id, {"delay_seconds": delay})
     db.commit()
+    publish_queue.schedule(post.id, post.scheduled_at)
     return post
@@ -9,6 +9,7 @@ from app.models.suggestion import Suggestion
 from app.repositories import suggestions as suggestion_repo
 from app.repositories import posts as post_repo
 from app.schemas.suggestion import SuggestionCreate
+from app.services import events
 from app.services.audit import log_action
 from app.metrics import SUGGESTION_CREATED_TOTAL
 
@@ -30,6 +31,7 @@ def create_suggestion(db: Session, channel_id: int, payload: SuggestionCreate) -
     try:
         created = suggestion_repo.create_suggestion(db, suggestion)
         SUGGESTION_CREATED_TOTAL.inc()
+        events.suggestion_created(created)
         return created
     except IntegrityError:
         db.rollback()
@@ -61,6 +63,8 @@ def accept_suggestion(db: Session, channel_id: int, suggestion_id: int, user) ->
     suggestion_repo.delete_suggestion(db, suggestion)
     log_action(db, "suggestion", suggestion_id, "accept", user.id, {"post_id": post.id})
     db.commit()
+    events.suggestion_changed("suggestion.accepted", suggestion_id, channel_id)
+    events.post_changed(post)
     return post
 
 
@@ -73,3 +77,4 @@ def reject_suggestion(db: Session, channel_id: int, suggestion_id: int, user) ->
     suggestion_repo.delete_suggestion(db, suggestion)
     log_action(db, "suggestion", suggestion_id, "reject", user.id, {})
     db.commit()
+    events.suggestion_changed("suggestion.rejected", suggestion_id, channel_id)
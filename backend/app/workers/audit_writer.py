@@ -0,0 +1,167 @@
+"""Background writer for audit entries sent through the Redis stream (AUDIT_SINK=stream).
+
+Run as a separate lightweight process:
+
+    python -m app.workers.audit_writer
+
+It reads entries as a member of a consumer group, inserts each batch with one
+bulk write, and acknowledges the batch only after the commit, so a crash
+re-delivers instead of losing entries. Several writers can run side by side;
+entries left unacknowledged by a dead one are claimed after
+audit_writer_claim_idle_ms.
+
+A batch the database rejects for its content (a constraint or data error) is
+split until the offending entries are isolated; the rest is written. Offending
+entries stay pending and are retried, and after audit_writer_max_deliveries
+they are moved to the DEAD_LETTER_KEY stream with the error.
+"""
+
+import logging
+import os
+import signal
+import socket
+import time
+
+import redis
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.db.session import SessionLocal
+from app.services import audit
+
+logger = logging.getLogger("audit_writer")
+
+GROUP = "audit-writers"
+DEAD_LETTER_KEY = "audit:entries:dead"
+# SQLSTATE classes of errors caused by the rows themselves: data exceptions, constraint violations.
+_ROW_ERROR_CLASSES = {"22", "23"}
+
+_stopping = False
+
+
+def _stop(_signum, _frame) -> None:
+    global _stopping
+    _stopping = True
+
+
+def ensure_group(client: redis.Redis) -> None:
+    try:
+        client.xgroup_create(audit.STREAM_KEY, GROUP, id="0", mkstream=True)
+    except redis.ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+def _row_error(exc: Exception) -> bool:
+    """Whether `exc` is about the rows written rather than the database being unusable."""
+    if isinstance(exc, (IntegrityError, DataError)):
+        return True
+    # COPY runs on the raw psycopg cursor, so its errors arrive unwrapped.
+    driver_exc = exc.orig if isinstance(exc, DBAPIError) else exc
+    return str(getattr(driver_exc, "sqlstate", None) or "")[:2] in _ROW_ERROR_CLASSES
+
+
+def _insert(entries: list[tuple]) -> list[tuple]:
+    """Insert (message_id, fields, row) entries; returns those rejected on their own, with the error."""
+    try:
+        with SessionLocal() as db:
+            audit.write_entries(db, [row for _, _, row in entries])
+            db.commit()
+        return []
+    except Exception as exc:
+        if not _row_error(exc):
+            raise
+        if len(entries) == 1:
+            message_id, fields, _ = entries[0]
+            return [(message_id, fields, str(exc))]
+        middle = len(entries) // 2
+        return _insert(entries[:middle]) + _insert(entries[middle:])
+
+
+def _deliveries(client: redis.Redis, message_id: bytes) -> int:
+    pending = client.xpending_range(audit.STREAM_KEY, GROUP, min=message_id, max=message_id, count=1)
+    return int(pending[0]["times_delivered"]) if pending else 0
+
+
+def _dead_letter(client: redis.Redis, entries: list[tuple]) -> None:
+    pipe = client.pipeline(transaction=False)
+    for message_id, fields, error in entries:
+        pipe.xadd(DEAD_LETTER_KEY, {**fields, b"message_id": message_id, b"error": error[:1000]})
+    pipe.execute()
+    logger.error("audit_entries_dead_lettered", extra={"message_ids": [m.decode() for m, _, _ in entries]})
+
+
+def _write(client: redis.Redis, messages: list) -> int:
+    if not messages:
+        return 0
+    entries, dead = [], []
+    for message_id, fields in messages:
+        if not fields:
+            # Trimmed from the stream while pending; nothing left to write.
+            continue
+        try:
+            entries.append((message_id, fields, audit.parse_stream_entry(fields)))
+        except (KeyError, ValueError):
+            dead.append((message_id, fields, "malformed entry"))
+    rejected = _insert(entries) if entries else []
+    retry = set()
+    for message_id, fields, error in rejected:
+        if _deliveries(client, message_id) >= settings.audit_writer_max_deliveries:
+            dead.append((message_id, fields, error))
+        else:
+            # Left pending: XAUTOCLAIM delivers it again after audit_writer_claim_idle_ms.
+            retry.add(message_id)
+            logger.warning("audit_entry_rejected", extra={"message_id": message_id.decode(), "error": error})
+    if dead:
+        # Dead-lettered before the acknowledgement, so a crash in between cannot lose them.
+        _dead_letter(client, dead)
+    ids = [message_id for message_id, _ in messages if message_id not in retry]
+    if ids:
+        client.xack(audit.STREAM_KEY, GROUP, *ids)
+        client.xdel(audit.STREAM_KEY, *ids)
+    return len(entries) - len(rejected)
+
+
+def drain_once(client: redis.Redis, consumer: str, block_ms: int | None = None) -> int:
+    """Write one batch: entries abandoned by other writers first, then new ones."""
+    _, stale, *_ = client.xautoclaim(
+        audit.STREAM_KEY,
+        GROUP,
+        consumer,
+        min_idle_time=settings.audit_writer_claim_idle_ms,
+        count=settings.audit_writer_batch_size,
+    )
+    if stale:
+        return _write(client, stale)
+    response = client.xreadgroup(
+        GROUP, consumer, {audit.STREAM_KEY: ">"}, count=settings.audit_writer_batch_size, block=block_ms
+    )
+    return sum(_write(client, messages) for _, messages in response or [])
+
+
+def run() -> None:
+    setup_logging()
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    consumer = f"{socket.gethostname()}:{os.getpid()}"
+    # No socket_timeout: XREADGROUP blocks for up to audit_writer_block_ms.
+    client = redis.Redis.from_url(settings.redis_url, socket_connect_timeout=1)
+    logger.info("audit_writer_started", extra={"consumer": consumer})
+    while not _stopping:
+        try:
+            ensure_group(client)
+            while not _stopping:
+                drain_once(client, consumer, block_ms=settings.audit_writer_block_ms)
+        except redis.RedisError:
+            logger.warning("audit_writer_redis_unavailable", exc_info=True)
+            time.sleep(1)
+        except Exception:
+            # Typically the database; the batch stays pending and is retried via XAUTOCLAIM.
+            logger.exception("audit_writer_batch_failed")
+            time.sleep(1)
+    logger.info("audit_writer_stopped")
+
+
+if __name__ == "__main__":
+    run()
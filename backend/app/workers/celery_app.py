@@ -1,5 +1,7 @@
+import logging
 import os
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
 broker_url = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
 backend_url = os.getenv("CELERY_RESULT_BACKEND", "redis://redis:6379/0")
@@ -14,14 +16,69 @@ celery_app.conf.update(
     include=["app.workers.tasks"],
 )
 
+# Manual publish-now jobs run on their own queue so they never wait behind a wave
+# of scheduled posts; run a worker dedicated to it (`-Q publish_priority`).
+PRIORITY_QUEUE = "publish_priority"
+
 celery_app.conf.update(
     task_track_started=True,
+    task_routes={"app.workers.tasks.publish_now_task": {"queue": PRIORITY_QUEUE}},
     timezone="UTC",
     enable_utc=True,
     beat_schedule={
         "publish-scheduled-posts-every-minute": {
             "task": "app.workers.tasks.publish_scheduled_posts",
             "schedule": 60.0,
-        }
+        },
+        # Safety net; API requests wake the worker right after queueing an entry.
+        "deliver-telegram-outbox-every-10-seconds": {
+            "task": "app.workers.tasks.deliver_telegram_outbox",
+            "schedule": 10.0,
+        },
+        "reap-expired-publish-leases-every-minute": {
+            "task": "app.workers.tasks.reap_expired_publish_leases",
+            "schedule": 60.0,
+        },
+        # Creates upcoming monthly partitions and archives expired ones (Postgres only).
+        "maintain-audit-partitions-hourly": {
+            "task": "app.workers.tasks.maintain_audit_partitions",
+            "schedule": 3600.0,
+        },
     },
 )
+
+
+def send_task_nowait(
+    name: str, *, args: tuple = (), task_id: str | None = None, countdown: float | None = None
+) -> bool:
+    """Send a task from a request without Celery's connection retries.
+
+    Returns False when the broker is unreachable; by default Celery would hold
+    the request for many seconds retrying the connection.
+    """
+    try:
+        with celery_app.connection_for_write() as conn:
+            conn.ensure_connection(max_retries=1, interval_start=0, timeout=1)
+            celery_app.send_task(
+                name, args=args, task_id=task_id, countdown=countdown, retry=False, connection=conn
+            )
+    except Exception:
+        logging.getLogger("celery_app").warning("celery_send_failed", extra={"task": name}, exc_info=True)
+        return False
+    return True
+
+
+@worker_process_shutdown.connect
+def _close_telegram_client(**_kwargs):
+    # Imported lazily so that loading the Celery app does not pull in settings.
+    from app.services import telegram as telegram_service
+
+    telegram_service.close_client()
+
+
+@worker_process_init.connect
+def _reset_db_pool(**_kwargs):
+    # Prefork children must not reuse connections the parent opened before forking.
+    from app.db.session import engine
+
+    engine.dispose(close=False)
@@ -0,0 +1,75 @@
+"""Sub-second dispatcher for the Redis delay queue of scheduled posts.
+
+Run as a separate lightweight process:
+
+    python -m app.workers.dispatcher
+
+It pops due post ids from the delay queue, interleaves them across channels and
+hands them to the publish tasks.
+The minute-level beat task keeps running as a safety net for anything the queue
+misses (Redis restarts, posts scheduled before the queue existed).
+"""
+
+import logging
+import signal
+import time
+from datetime import datetime, timedelta
+
+import redis
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.db.session import SessionLocal
+from app.repositories import posts as post_repo
+from app.services import publish_queue
+from app.workers.tasks import dispatch_posts
+
+logger = logging.getLogger("dispatcher")
+
+_stopping = False
+
+
+def _stop(_signum, _frame) -> None:
+    global _stopping
+    _stopping = True
+
+
+def dispatch_due() -> int:
+    due = publish_queue.pop_due(settings.publish_dispatch_batch_size)
+    if not due:
+        return 0
+    reserved = publish_queue.reserve(due)
+    if len(reserved) > 1:
+        with SessionLocal() as db:
+            channel_of = post_repo.channel_ids_for_posts(db, reserved)
+        reserved = publish_queue.fair_order(reserved, channel_of)
+    dispatch_posts(reserved)
+    for post_id in set(due) - set(reserved):
+        # Over the in-flight cap (or already dispatched): put it back shortly so
+        # it is not lost; a duplicate dispatch is dropped by the task's re-check.
+        publish_queue.schedule(post_id, datetime.utcnow() + timedelta(seconds=1))
+    return len(reserved)
+
+
+def run() -> None:
+    setup_logging()
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    poll = settings.publish_dispatcher_poll_seconds
+    logger.info("dispatcher_started", extra={"poll_seconds": poll})
+    while not _stopping:
+        try:
+            if dispatch_due():
+                continue
+            wait = publish_queue.next_due_in()
+        except redis.RedisError:
+            logger.warning("dispatcher_redis_unavailable", exc_info=True)
+            wait = None
+        # Sleep until the next post is due, but never longer than the poll interval
+        # so newly scheduled posts are picked up promptly.
+        time.sleep(poll if wait is None else min(wait, poll))
+    logger.info("dispatcher_stopped")
+
+
+if __name__ == "__main__":
+    run()
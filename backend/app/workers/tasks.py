@@ -1,26 +1,192 @@
+import logging
+import time
 from datetime import datetime
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.orm import Session
 from app.workers.celery_app import celery_app
+from app.core.config import settings
 from app.db.session import SessionLocal
 from app.models.post import Post
 from app.models.enums import PostStatus
-from app.services.publisher import publish_post
+from app.services import audit_partitions, publish_queue
+from app.repositories import posts as post_repo
+from app.services.publisher import claim_post, claim_posts, new_lease_owner, publish_post, renew_leases
+from app.services.telegram_outbox import deliver_pending
+
+logger = logging.getLogger("tasks")
+
+
+def dispatch_posts(post_ids: list[int]) -> None:
+    """Hand reserved post ids to the workers, one task per post or in batches."""
+    size = settings.publish_task_batch_size
+    if size <= 1:
+        for post_id in post_ids:
+            publish_post_task.delay(post_id)
+        return
+    for start in range(0, len(post_ids), size):
+        publish_posts_batch_task.delay(post_ids[start : start + size])
 
 
 @celery_app.task
 def publish_scheduled_posts():
+    # Beat only finds due posts and fans them out; the Telegram calls happen in
+    # publish_post_task across the worker pool.
     db: Session = SessionLocal()
     try:
         now = datetime.utcnow()
-        posts = (
-            db.query(Post)
-            .filter(Post.status == PostStatus.scheduled)
-            .filter(Post.scheduled_at <= now)
-            .with_for_update(skip_locked=True)
-            .all()
+        # Fair order across channels: every channel's oldest due post first, then
+        # every channel's second one, and so on (round-robin per channel).
+        channel_rank = (
+            func.row_number()
+            .over(partition_by=Post.channel_id, order_by=(Post.scheduled_at.asc(), Post.id.asc()))
+            .label("channel_rank")
+        )
+        due = (
+            select(Post.id, Post.scheduled_at, channel_rank)
+            .where(Post.status == PostStatus.scheduled)
+            .where(Post.scheduled_at <= now)
+            .subquery()
         )
-        for post in posts:
-            actor_user_id = post.updated_by or post.created_by
-            publish_post(db, post, actor_user_id)
+        dispatched = 0
+        cursor = None
+        while dispatched < settings.publish_max_in_flight:
+            stmt = (
+                select(due.c.id, due.c.scheduled_at, due.c.channel_rank)
+                .order_by(due.c.channel_rank.asc(), due.c.scheduled_at.asc(), due.c.id.asc())
+                .limit(settings.publish_dispatch_batch_size)
+            )
+            if cursor is not None:
+                stmt = stmt.where(tuple_(due.c.channel_rank, due.c.scheduled_at, due.c.id) > cursor)
+            rows = db.execute(stmt).all()
+            if not rows:
+                break
+            cursor = (rows[-1].channel_rank, rows[-1].scheduled_at, rows[-1].id)
+            reserved = publish_queue.reserve([int(r.id) for r in rows])
+            dispatch_posts(reserved)
+            dispatched += len(reserved)
+            if len(rows) < settings.publish_dispatch_batch_size:
+                break
+        return dispatched
+    finally:
+        db.close()
+
+
+@celery_app.task
+def publish_post_task(post_id: int):
+    db: Session = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        # The claim re-checks status and due time atomically: the post may have been
+        # published, edited or rescheduled since it was dispatched.
+        if not claim_post(db, post_id, from_statuses={PostStatus.scheduled}, due_before=now):
+            post = db.get(Post, post_id)
+            if post and post.status == PostStatus.scheduled and post.scheduled_at and post.scheduled_at > now:
+                # Rescheduled later (or dispatched a hair early): hand it back to the delay queue.
+                publish_queue.schedule(post.id, post.scheduled_at)
+            return
+        post = db.get(Post, post_id)
+        actor_user_id = post.updated_by or post.created_by
+        publish_post(db, post, actor_user_id)
+    finally:
+        db.close()
+        publish_queue.release(post_id)
+
+
+@celery_app.task
+def publish_posts_batch_task(post_ids: list[int]):
+    # Batch mode: one claim UPDATE for the whole chunk and one commit per publish
+    # outcome, its audit row included. Posts wait their turn within the chunk, so
+    # the remaining leases are renewed once half the lease has elapsed.
+    db: Session = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        owner = new_lease_owner()
+        claimed = claim_posts(db, post_ids, from_statuses={PostStatus.scheduled}, due_before=now, owner=owner)
+        skipped = set(post_ids) - set(claimed)
+        if skipped:
+            for post in db.query(Post).filter(Post.id.in_(skipped)).all():
+                if post.status == PostStatus.scheduled and post.scheduled_at and post.scheduled_at > now:
+                    publish_queue.schedule(post.id, post.scheduled_at)
+        if claimed:
+            posts = {post.id: post for post in db.query(Post).filter(Post.id.in_(claimed)).all()}
+            # Keep the dispatch (channel round-robin) order within the chunk.
+            queue = [post_id for post_id in post_ids if post_id in posts]
+            held = set(queue)
+            renew_at = time.monotonic() + settings.publish_lease_seconds / 2
+            for index, post_id in enumerate(queue):
+                if time.monotonic() >= renew_at:
+                    held = set(renew_leases(db, queue[index:], owner))
+                    renew_at = time.monotonic() + settings.publish_lease_seconds / 2
+                if post_id in held:
+                    post = posts[post_id]
+                    publish_post(db, post, post.updated_by or post.created_by)
+        return len(claimed)
+    finally:
+        db.close()
+        for post_id in post_ids:
+            publish_queue.release(post_id)
+
+
+@celery_app.task
+def publish_now_task(post_id: int, actor_user_id: int, job_id: str):
+    # Routed to the priority queue. The API already claimed the post with the job id
+    # as lease owner; if the lease expired meanwhile the reaper has handed the post
+    # back to the scheduled flow and this job must not publish it too.
+    db: Session = SessionLocal()
+    try:
+        post = db.get(Post, post_id)
+        if not post or post.status != PostStatus.publishing or post.lease_owner != job_id:
+            return None
+        post = publish_post(db, post, actor_user_id, respect_cooldown=False)
+        return post.status.value
+    finally:
+        db.close()
+
+
+@celery_app.task
+def deliver_telegram_outbox():
+    db: Session = SessionLocal()
+    try:
+        # Only the oldest pending entry of each post is claimable per pass, so a short
+        # batch does not mean the outbox is drained; stop once nothing is claimable.
+        delivered = 0
+        while True:
+            count = deliver_pending(db)
+            if not count:
+                return delivered
+            delivered += count
+    finally:
+        db.close()
+
+
+@celery_app.task
+def reap_expired_publish_leases():
+    # A worker that died mid-publish leaves its post in `publishing`; once the lease
+    # expires the post goes back to the queue. If Telegram had already accepted the
+    # message this can publish it twice, which is preferred over losing the post.
+    db: Session = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        post_ids = post_repo.release_expired_leases(db, now)
+        for post_id in post_ids:
+            publish_queue.schedule(post_id, now)
+        return len(post_ids)
+    finally:
+        db.close()
+
+
+@celery_app.task
+def maintain_audit_partitions():
+    db: Session = SessionLocal()
+    try:
+        if db.get_bind().dialect.name != "postgresql":
+            return 0
+        try:
+            audit_partitions.ensure_partitions(db)
+        except Exception:
+            # Retention runs regardless: a failure here must not let old months pile up.
+            db.rollback()
+            logger.exception("audit_partitions_ensure_failed")
+        return len(audit_partitions.archive_expired(db))
     finally:
         db.close()
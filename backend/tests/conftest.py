@@ -1,24 +1,33 @@
 import os
+import tempfile
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 # Ensure env vars are set before importing app/settings.
 os.environ.setdefault("APP_ENV", "test")
 os.environ.setdefault("APP_SECRET", "test_secret")
-os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+# A file rather than :memory: so the async engine (a separate driver) sees the same database.
+os.environ.setdefault("DATABASE_URL", f"sqlite+pysqlite:///{tempfile.mkdtemp()}/test.db")
 os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("TELEGRAM_RATE_LIMIT_ENABLED", "false")
 os.environ.setdefault("N8N_API_KEY", "test-n8n-key")
 os.environ.setdefault("MEDIA_DIR", "/tmp/manager_tg_test_media")
+# No Redis in tests: tests that exercise the cache enable it against fakeredis.
+os.environ.setdefault("DASHBOARD_CACHE_TTL_SECONDS", "0")
 
 from app.core.config import settings  # noqa: E402
 from app.db.base import Base  # noqa: E402
 from app.db import base_class_imports  # noqa: F401,E402
 from app.api.deps import get_db  # noqa: E402
+from app.db.deps import get_async_db, get_async_read_db, read_db_dependency  # noqa: E402
+from app.db.session import async_database_url, read_session_factory  # noqa: E402
 from app.main import app  # noqa: E402
+from app.services import events  # noqa: E402
 
 
 connect_args = {"check_same_thread": False}
@@ -28,6 +37,10 @@ if settings.database_url.endswith(":memory:"):
 else:
     engine = create_engine(settings.database_url, connect_args=connect_args)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# NullPool: every TestClient runs its own event loop, and aiosqlite connections cannot cross loops.
+async_engine = create_async_engine(async_database_url(settings.database_url), poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+override_get_async_read_db = read_db_dependency(read_session_factory(async_engine))
 
 
 def override_get_db():
@@ -38,6 +51,11 @@ def override_get_db():
         db.close()
 
 
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
 @pytest.fixture(autouse=True, scope="session")
 def setup_db():
     Base.metadata.create_all(bind=engine)
@@ -45,6 +63,12 @@ def setup_db():
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def no_change_events(monkeypatch):
+    # Change events go to Redis pub/sub; tests that check them patch publish or use fakeredis.
+    monkeypatch.setattr(events, "publish", lambda event_type, data: None)
+
+
 @pytest.fixture()
 def db_session():
     db = TestingSessionLocal()
@@ -54,9 +78,16 @@ def db_session():
         db.close()
 
 
+@pytest.fixture()
+def session_factory():
+    return TestingSessionLocal
+
+
 @pytest.fixture()
 def client():
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_read_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -0,0 +1,67 @@
+import asyncio
+from datetime import datetime
+
+from app.core.security import hash_password, create_access_token
+from app.db.session import async_database_url
+from app.models.channel import Channel
+from app.models.enums import UserRole, PostStatus
+from app.models.post import Post
+from app.models.user import User
+from app.usecases import posts as post_usecase
+
+
+def test_async_database_url_maps_sync_drivers():
+    assert async_database_url("sqlite+pysqlite:////tmp/x.db") == "sqlite+aiosqlite:////tmp/x.db"
+    assert async_database_url("postgresql://u:p@db/app") == "postgresql+psycopg://u:p@db/app"
+    assert async_database_url("postgresql+psycopg://u:p@db/app") == "postgresql+psycopg://u:p@db/app"
+
+
+def test_post_list_refreshes_views_through_async_client(monkeypatch, client, db_session):
+    channel = Channel(title="Ch", telegram_channel_identifier="@ch_async_views")
+    user = User(email="async_views@example.com", password_hash=hash_password("secret"), role=UserRole.viewer)
+    db_session.add_all([channel, user])
+    db_session.commit()
+    post = Post(
+        channel_id=channel.id,
+        title="T",
+        body_text="B",
+        status=PostStatus.published,
+        telegram_message_id="7",
+        published_at=datetime.utcnow(),
+        last_known_views=1,
+        created_by=user.id,
+        updated_by=user.id,
+    )
+    db_session.add(post)
+    db_session.commit()
+
+    class FakeAsyncClient:
+        async def get_message_views(self, chat_id, message_id):
+            await asyncio.sleep(0)
+            return 42
+
+    monkeypatch.setattr(post_usecase.settings, "telegram_feature_views", True)
+    monkeypatch.setattr(post_usecase, "get_async_client", FakeAsyncClient)
+    monkeypatch.setattr(
+        post_usecase, "get_message_views", lambda *a: (_ for _ in ()).throw(AssertionError("sync client used"))
+    )
+    headers = {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+
+    resp = client.get(f"/v1/channels/{channel.id}/posts", headers=headers)
+
+    assert resp.status_code == 200
+    assert resp.json()[0]["last_known_views"] == 42
+    db_session.expire_all()
+    assert db_session.get(Post, post.id).last_known_views == 42
+
+
+def test_async_auth_rejects_inactive_user(client, db_session):
+    user = User(
+        email="async_inactive@example.com", password_hash=hash_password("secret"), role=UserRole.admin, is_active=False
+    )
+    db_session.add(user)
+    db_session.commit()
+
+    resp = client.get("/v1/dashboard/overview", headers={"Authorization": f"Bearer {create_access_token(str(user.id))}"})
+
+    assert resp.status_code == 403
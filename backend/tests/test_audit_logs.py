@@ -48,3 +48,31 @@ def test_audit_logs_filtering(client, db_session):
     assert data["items"][0]["entity_type"] == "post"
     assert data["items"][0]["entity_id"] == 10
     assert data["items"][0]["action"] == "update"
+
+
+def test_audit_logs_cursor_pages_through_ties(client, db_session):
+    admin = User(email="admin3_audit@example.com", password_hash=hash_password("secret"), role=UserRole.admin)
+    db_session.add(admin)
+    db_session.commit()
+    for i in range(5):
+        log_action(db_session, "post", 777, f"step{i}", admin.id, {})
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(str(admin.id))}"}
+
+    seen, cursor = [], None
+    while True:
+        params = {"entity_type": "post", "entity_id": 777, "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        data = client.get("/v1/audit-logs", params=params, headers=headers).json()
+        seen += [item["id"] for item in data["items"]]
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == 5
+    assert seen == sorted(seen, reverse=True)
+    offset_page = client.get(
+        "/v1/audit-logs", params={"entity_type": "post", "entity_id": 777, "limit": 2, "offset": 2}, headers=headers
+    ).json()
+    assert [item["id"] for item in offset_page["items"]] == seen[2:4]
@@ -0,0 +1,166 @@
+import gzip
+import json
+from datetime import datetime
+
+from types import SimpleNamespace
+
+from sqlalchemy import Column, MetaData, Table, insert
+from sqlalchemy.exc import ProgrammingError
+
+from app.core.config import settings
+from app.models.audit_log import AuditLog
+from app.services import audit_partitions
+from app.workers import tasks
+from tests.conftest import engine
+
+
+def test_month_helpers():
+    assert audit_partitions.month_start(datetime(2026, 10, 18, 13, 5)) == datetime(2026, 10, 1)
+    assert audit_partitions.add_months(datetime(2026, 11, 1), 2) == datetime(2027, 1, 1)
+    assert audit_partitions.add_months(datetime(2026, 1, 1), -13) == datetime(2024, 12, 1)
+    assert audit_partitions.partition_name(datetime(2026, 3, 1)) == "audit_logs_2026_03"
+    assert audit_partitions.partition_month("audit_logs_2026_03") == datetime(2026, 3, 1)
+    assert audit_partitions.partition_month("audit_logs_default") is None
+
+
+def test_expired_partitions_keep_the_retention_window(monkeypatch):
+    monkeypatch.setattr(settings, "audit_retention_months", 3)
+    names = [
+        "audit_logs_default",
+        "audit_logs_2026_08",
+        "audit_logs_2026_06",
+        "audit_logs_2026_07",
+        "audit_logs_2026_05",
+        "audit_logs_2026_11",
+    ]
+    # Kept: the current month (October) and the three before it.
+    assert audit_partitions.expired_partitions(names, datetime(2026, 10, 18)) == [
+        "audit_logs_2026_05",
+        "audit_logs_2026_06",
+    ]
+
+    monkeypatch.setattr(settings, "audit_retention_months", 0)
+    assert audit_partitions.expired_partitions(names, datetime(2026, 10, 18)) == []
+
+
+def test_export_partition_writes_gzipped_jsonl(db_session, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "media_dir", str(tmp_path))
+    name = "audit_logs_2025_01"
+    # A detached partition has the columns of audit_logs but none of its foreign keys.
+    partition = Table(name, MetaData(), *(Column(c.name, c.type) for c in AuditLog.__table__.columns))
+    partition.create(engine)
+    try:
+        with engine.begin() as connection:
+            connection.execute(
+                insert(partition),
+                [
+                    {
+                        "id": 2,
+                        "entity_type": "post",
+                        "entity_id": 7,
+                        "action": "published",
+                        "actor_user_id": 1,
+                        "payload_json": {"title": "Привет"},
+                        "created_at": datetime(2025, 1, 20),
+                    },
+                    {
+                        "id": 1,
+                        "entity_type": "post",
+                        "entity_id": 7,
+                        "action": "created",
+                        "actor_user_id": 1,
+                        "payload_json": {},
+                        "created_at": datetime(2025, 1, 3),
+                    },
+                ],
+            )
+        path = audit_partitions.export_partition(db_session, name)
+    finally:
+        partition.drop(engine)
+
+    assert path == tmp_path / "audit_archive" / f"{name}.jsonl.gz"
+    assert not list(path.parent.glob("*.partial"))
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert [row["action"] for row in rows] == ["created", "published"]
+    assert rows[1] == {
+        "id": 2,
+        "entity_type": "post",
+        "entity_id": 7,
+        "action": "published",
+        "actor_user_id": 1,
+        "payload_json": {"title": "Привет"},
+        "created_at": "2025-01-20T00:00:00",
+    }
+
+
+def test_audit_archive_is_not_served_from_media(client):
+    archive = audit_partitions.archive_dir()
+    archive.mkdir(parents=True, exist_ok=True)
+    (archive / "audit_logs_2025_01.jsonl.gz").write_bytes(b"secret")
+
+    assert client.get("/media/audit_archive/audit_logs_2025_01.jsonl.gz").status_code == 404
+    assert client.get("/media/previews/../audit_archive/audit_logs_2025_01.jsonl.gz").status_code == 404
+
+
+class FakePostgres:
+    """Answers the catalog queries of ensure_partitions and records the DDL it runs."""
+
+    def __init__(self, tables, default_months, failing=()):
+        self.tables, self.default_months, self.failing = tables, default_months, failing
+        self.statements = []
+        self.rollbacks = 0
+
+    def execute(self, statement):
+        sql = " ".join(str(statement).split())
+        if "FROM pg_class" in sql:
+            return SimpleNamespace(all=lambda: [(name, True) for name in self.tables])
+        if "date_trunc" in sql:
+            return SimpleNamespace(scalars=lambda: iter(self.default_months))
+        if any(name in sql for name in self.failing):
+            raise ProgrammingError(sql, {}, Exception("relation already exists"))
+        self.statements.append(sql)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def test_ensure_partitions_moves_default_rows_and_isolates_failures(monkeypatch):
+    monkeypatch.setattr(settings, "audit_partitions_ahead_months", 2)
+    db = FakePostgres(
+        tables=["audit_logs_2026_10"], default_months=[datetime(2026, 8, 1)], failing=["audit_logs_2026_11"]
+    )
+
+    created = audit_partitions.ensure_partitions(db, datetime(2026, 10, 18))
+
+    assert created == ["audit_logs_2026_08", "audit_logs_2026_12"]
+    assert db.rollbacks == 1
+    august = [sql for sql in db.statements if "audit_logs_2026_08" in sql]
+    assert august[0] == "CREATE TABLE audit_logs_2026_08 (LIKE audit_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    assert "DELETE FROM audit_logs_default WHERE created_at >= '2026-08-01' AND created_at < '2026-09-01'" in august[1]
+    assert august[2] == (
+        "ALTER TABLE audit_logs ATTACH PARTITION audit_logs_2026_08 FOR VALUES FROM ('2026-08-01') TO ('2026-09-01')"
+    )
+    assert db.statements[-1] == (
+        "CREATE TABLE audit_logs_2026_12 PARTITION OF audit_logs FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')"
+    )
+
+
+def test_maintenance_archives_even_when_creating_partitions_fails(monkeypatch):
+    db = SimpleNamespace(
+        get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="postgresql")),
+        rollback=lambda: None,
+        close=lambda: None,
+    )
+
+    def broken(_db):
+        raise RuntimeError("catalog unavailable")
+
+    monkeypatch.setattr(tasks, "SessionLocal", lambda: db)
+    monkeypatch.setattr(audit_partitions, "ensure_partitions", broken)
+    monkeypatch.setattr(audit_partitions, "archive_expired", lambda _db: ["audit_logs_2025_01.jsonl.gz"])
+
+    assert tasks.maintain_audit_partitions() == 1
@@ -0,0 +1,128 @@
+from datetime import datetime
+
+import fakeredis
+import redis
+from sqlalchemy import event, func, select
+
+from app.core.security import hash_password
+from app.models.audit_log import AuditLog
+from app.models.enums import UserRole
+from app.models.user import User
+from app.services import audit
+from app.services.audit import log_action
+from app.workers import audit_writer
+
+
+def _actor(db_session, suffix: str) -> User:
+    user = User(email=f"audit_sink_{suffix}@example.com", password_hash=hash_password("secret"), role=UserRole.admin)
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+def _logged(db_session, actor: User) -> int:
+    return db_session.scalar(select(func.count()).select_from(AuditLog).where(AuditLog.actor_user_id == actor.id))
+
+
+def test_entries_of_a_commit_are_written_with_one_insert(db_session):
+    actor = _actor(db_session, "bulk")
+    statements = []
+
+    def on_execute(_conn, _cursor, statement, *_args):
+        if statement.startswith("INSERT INTO audit_logs"):
+            statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        for i in range(25):
+            log_action(db_session, "post", i, "update", actor.id, {"n": i})
+        db_session.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+    assert len(statements) == 1
+    assert _logged(db_session, actor) == 25
+
+
+def test_entries_of_a_rolled_back_transaction_are_dropped(db_session):
+    actor = _actor(db_session, "rollback")
+
+    log_action(db_session, "post", 1, "update", actor.id, {})
+    db_session.rollback()
+    db_session.commit()
+
+    assert _logged(db_session, actor) == 0
+
+
+def test_stream_sink_is_drained_by_the_writer(db_session, session_factory, monkeypatch):
+    actor = _actor(db_session, "stream")
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(audit, "_redis_client", client)
+    monkeypatch.setattr(audit.settings, "audit_sink", "stream")
+    monkeypatch.setattr(audit_writer, "SessionLocal", session_factory)
+
+    log_action(db_session, "post", 1, "create", actor.id, {"status": "draft"})
+    log_action(db_session, "post", 1, "approve", actor.id, {"status": "approved"})
+    db_session.commit()
+    assert _logged(db_session, actor) == 0
+    assert client.xlen(audit.STREAM_KEY) == 2
+
+    audit_writer.ensure_group(client)
+    assert audit_writer.drain_once(client, "test-writer") == 2
+
+    assert _logged(db_session, actor) == 2
+    assert client.xlen(audit.STREAM_KEY) == 0
+    assert audit_writer.drain_once(client, "test-writer") == 0
+
+
+def test_stream_sink_falls_back_to_the_database_without_redis(db_session, monkeypatch):
+    actor = _actor(db_session, "fallback")
+
+    class DownRedis:
+        def pipeline(self, transaction=True):
+            raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(audit, "_redis_client", DownRedis())
+    monkeypatch.setattr(audit.settings, "audit_sink", "stream")
+
+    log_action(db_session, "post", 1, "create", actor.id, {})
+    db_session.commit()
+
+    assert _logged(db_session, actor) == 1
+
+
+def test_writer_isolates_rejected_entries_and_dead_letters_them(db_session, session_factory, monkeypatch):
+    actor = _actor(db_session, "poison")
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(audit, "_redis_client", client)
+    monkeypatch.setattr(audit_writer, "SessionLocal", session_factory)
+    monkeypatch.setattr(audit_writer.settings, "audit_writer_max_deliveries", 2)
+    monkeypatch.setattr(audit_writer.settings, "audit_writer_claim_idle_ms", 0)
+    row = {"entity_type": "post", "entity_id": 1, "actor_user_id": actor.id, "payload_json": {}}
+    now = datetime.utcnow()
+    audit.send_to_stream(
+        [
+            {**row, "action": "create", "created_at": now},
+            # NOT NULL violation: rejected by the database whatever batch it is in.
+            {**row, "action": None, "created_at": now},
+            {**row, "action": "update", "created_at": now},
+        ]
+    )
+    client.xadd(audit.STREAM_KEY, {"entry": "not json"})
+    audit_writer.ensure_group(client)
+
+    assert audit_writer.drain_once(client, "test-writer") == 2
+    assert _logged(db_session, actor) == 2
+    # The rejected entry stays pending for another delivery; the malformed one is dead-lettered.
+    assert client.xlen(audit.STREAM_KEY) == 1
+    assert client.xlen(audit_writer.DEAD_LETTER_KEY) == 1
+
+    # Second delivery (claimed back via XAUTOCLAIM) reaches the limit.
+    assert audit_writer.drain_once(client, "test-writer") == 0
+    assert client.xlen(audit.STREAM_KEY) == 0
+    dead = [fields for _, fields in client.xrange(audit_writer.DEAD_LETTER_KEY)]
+    assert len(dead) == 2
+    assert dead[0][b"error"] == b"malformed entry"
+    assert b"audit_logs.action" in dead[1][b"error"]
+    assert _logged(db_session, actor) == 2
@@ -0,0 +1,178 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, func, select
+
+from app.core.security import hash_password
+from app.models.channel import Channel
+from app.models.channel_post_stats import ChannelPostStats
+from app.models.enums import PostStatus, UserRole
+from app.models.post import Post
+from app.models.user import User
+from app.repositories import channels as channel_repo
+from app.repositories import posts as post_repo
+from app.usecases import dashboard as dashboard_usecase
+
+
+def _channel_and_user(db_session, suffix: str):
+    channel = Channel(title="Ch", telegram_channel_identifier=f"@ch_stats_{suffix}")
+    user = User(email=f"stats_{suffix}@example.com", password_hash=hash_password("secret"), role=UserRole.editor)
+    db_session.add_all([channel, user])
+    db_session.commit()
+    return channel, user
+
+
+def _post(channel, user, **kwargs) -> Post:
+    return Post(channel_id=channel.id, title="T", body_text="B", created_by=user.id, updated_by=user.id, **kwargs)
+
+
+def _recomputed(db_session, channel_id: int) -> dict:
+    posts = select(Post).where(Post.channel_id == channel_id).subquery()
+    counts = db_session.execute(select(posts.c.status, func.count()).group_by(posts.c.status)).all()
+    return {
+        "status_counts": {PostStatus(status): int(cnt) for status, cnt in counts},
+        "first_scheduled_at": db_session.execute(
+            select(func.min(posts.c.scheduled_at)).where(posts.c.status == PostStatus.scheduled)
+        ).scalar(),
+        "last_post_at": db_session.execute(select(func.max(posts.c.created_at))).scalar(),
+        "last_published_at": db_session.execute(select(func.max(posts.c.published_at))).scalar(),
+    }
+
+
+def _stored(db_session, channel_id: int) -> dict:
+    db_session.expire_all()
+    stats = db_session.get(ChannelPostStats, channel_id)
+    return {
+        "status_counts": stats.status_counts(),
+        "first_scheduled_at": stats.first_scheduled_at,
+        "last_post_at": stats.last_post_at,
+        "last_published_at": stats.last_published_at,
+    }
+
+
+def test_stats_follow_orm_post_changes(db_session):
+    channel, user = _channel_and_user(db_session, "orm")
+    other, _ = _channel_and_user(db_session, "orm_other")
+    now = datetime.utcnow()
+    draft = _post(channel, user, created_at=now - timedelta(days=1))
+    early = _post(channel, user, status=PostStatus.scheduled, scheduled_at=now + timedelta(hours=1))
+    late = _post(channel, user, status=PostStatus.scheduled, scheduled_at=now + timedelta(hours=3))
+    db_session.add_all([draft, early, late])
+    db_session.commit()
+    assert _stored(db_session, channel.id) == _recomputed(db_session, channel.id)
+    assert _stored(db_session, channel.id)["first_scheduled_at"] == early.scheduled_at
+
+    early.status = PostStatus.published
+    early.published_at = now
+    late.scheduled_at = now + timedelta(minutes=30)
+    db_session.commit()
+    assert _stored(db_session, channel.id) == _recomputed(db_session, channel.id)
+
+    # Changes made on expired instances still know the previous value.
+    db_session.expire_all()
+    late.channel_id = other.id
+    draft.status = PostStatus.pending
+    db_session.commit()
+    assert _stored(db_session, channel.id) == _recomputed(db_session, channel.id)
+    assert _stored(db_session, other.id) == _recomputed(db_session, other.id)
+
+    db_session.delete(early)
+    db_session.commit()
+    assert _stored(db_session, channel.id) == _recomputed(db_session, channel.id)
+    assert _stored(db_session, channel.id)["status_counts"] == {PostStatus.pending: 1}
+
+
+def test_stats_follow_claims_and_expired_leases(db_session):
+    channel, user = _channel_and_user(db_session, "claim")
+    now = datetime.utcnow()
+    due = [_post(channel, user, status=PostStatus.scheduled, scheduled_at=now - timedelta(minutes=i)) for i in range(3)]
+    approved = _post(channel, user, status=PostStatus.approved)
+    db_session.add_all([*due, approved])
+    db_session.commit()
+
+    claimed = post_repo.claim_many_for_publishing(
+        db_session,
+        [p.id for p in due],
+        owner="stats-test",
+        lease_seconds=60,
+        from_statuses=[PostStatus.scheduled],
+        due_before=now,
+    )
+    assert post_repo.claim_for_publishing(
+        db_session, approved.id, owner="stats-test-2", lease_seconds=-60, from_statuses=[PostStatus.approved]
+    )
+    assert sorted(claimed) == sorted(p.id for p in due)
+    assert _stored(db_session, channel.id) == _recomputed(db_session, channel.id)
+    assert _stored(db_session, channel.id)["status_counts"] == {PostStatus.publishing: 4}
+
+    released = post_repo.release_expired_leases(db_session)
+    assert approved.id in released
+    assert _stored(db_session, channel.id) == _recomputed(db_session, channel.id)
+    assert _stored(db_session, channel.id)["status_counts"] == {PostStatus.publishing: 3, PostStatus.scheduled: 1}
+
+    # Release the remaining leases too, so no other test's reaper finds them.
+    assert sorted(post_repo.release_expired_leases(db_session, now + timedelta(minutes=5))) == sorted(claimed)
+    assert _stored(db_session, channel.id) == _recomputed(db_session, channel.id)
+    assert _stored(db_session, channel.id)["status_counts"] == {PostStatus.scheduled: 4}
+
+
+def test_stats_row_removed_with_channel(db_session):
+    channel, user = _channel_and_user(db_session, "delete")
+    db_session.add(_post(channel, user))
+    db_session.commit()
+    channel_id = channel.id
+
+    channel_repo.delete_posts_for_channel(db_session, channel_repo.get_post_ids_for_channel(db_session, channel_id))
+    channel_repo.delete_channel(db_session, channel)
+
+    assert db_session.get(ChannelPostStats, channel_id) is None
+
+
+def test_overview_next_scheduled_skips_overdue_posts(db_session):
+    channel, user = _channel_and_user(db_session, "overview")
+    quiet, _ = _channel_and_user(db_session, "overview_quiet")
+    now = datetime.utcnow()
+    upcoming_at = now + timedelta(hours=2)
+    db_session.add_all(
+        [
+            _post(channel, user, status=PostStatus.scheduled, scheduled_at=now - timedelta(hours=1)),
+            _post(channel, user, status=PostStatus.scheduled, scheduled_at=now - timedelta(hours=2)),
+            _post(channel, user, status=PostStatus.scheduled, scheduled_at=upcoming_at),
+        ]
+    )
+    db_session.commit()
+
+    overview = dashboard_usecase.get_overview(db_session, now=now)
+    rows = {row.channel_id: row for row in overview.channels}
+    assert rows[channel.id].overdue_scheduled_count == 2
+    assert rows[channel.id].next_scheduled_at == upcoming_at
+    assert rows[channel.id].status_counts == {PostStatus.scheduled: 3}
+    assert rows[quiet.id].status_counts == {}
+    assert rows[quiet.id].next_scheduled_at is None
+
+
+def test_timestamps_are_read_after_locking_the_stats_row(db_session):
+    channel, user = _channel_and_user(db_session, "lock_order")
+    db_session.add(_post(channel, user))
+    db_session.commit()
+    statements = []
+
+    def on_execute(_conn, _cursor, statement, *_args):
+        statements.append(" ".join(statement.split()))
+
+    engine = db_session.get_bind()
+    post = _post(channel, user, status=PostStatus.scheduled, scheduled_at=datetime.utcnow())
+    db_session.add(post)
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        db_session.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+    stats = [i for i, sql in enumerate(statements) if "channel_post_stats" in sql]
+    lock, update = stats[0], stats[-1]
+    assert statements[lock].startswith("SELECT channel_post_stats.channel_id")
+    assert statements[update].startswith("UPDATE channel_post_stats")
+    # No subquery in the UPDATE: the timestamps come from statements run after the lock.
+    assert "SELECT" not in statements[update]
+    assert any("min(posts.scheduled_at)" in sql for sql in statements[lock:update])
+    assert _stored(db_session, channel.id) == _recomputed(db_session, channel.id)
@@ -0,0 +1,100 @@
+import asyncio
+from datetime import datetime
+
+import fakeredis
+import pytest
+import redis
+
+from app.core.security import create_access_token, hash_password
+from app.models.channel import Channel
+from app.models.enums import PostStatus, UserRole
+from app.models.post import Post
+from app.models.user import User
+from app.schemas.dashboard import DashboardOverview
+from app.services import dashboard_cache
+from app.usecases import dashboard as dashboard_usecase
+
+
+@pytest.fixture()
+def fake_redis(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(dashboard_cache, "_redis_client", fakeredis.FakeRedis(server=server))
+    monkeypatch.setattr(dashboard_cache, "_async_redis_client", fakeredis.FakeAsyncRedis(server=server))
+    monkeypatch.setattr(dashboard_cache.settings, "dashboard_cache_ttl_seconds", 30.0)
+    monkeypatch.setattr(dashboard_cache, "_backoff", dashboard_cache.RedisBackoff())
+    return server
+
+
+def test_overview_is_cached_until_a_status_change_commits(client, db_session, fake_redis, monkeypatch):
+    channel = Channel(title="Ch", telegram_channel_identifier="@ch_dash_cache")
+    user = User(email="dash_cache@example.com", password_hash=hash_password("secret"), role=UserRole.viewer)
+    db_session.add_all([channel, user])
+    db_session.commit()
+    post = Post(channel_id=channel.id, title="T", body_text="B", created_by=user.id, updated_by=user.id)
+    db_session.add(post)
+    db_session.commit()
+
+    computed = []
+    original = dashboard_usecase.get_overview
+
+    def counting_overview(db, **kwargs):
+        computed.append(1)
+        return original(db, **kwargs)
+
+    monkeypatch.setattr(dashboard_usecase, "get_overview", counting_overview)
+    headers = {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+
+    def channel_counts():
+        resp = client.get("/v1/dashboard/overview", headers=headers)
+        assert resp.status_code == 200
+        return next(row for row in resp.json()["channels"] if row["channel_id"] == channel.id)["status_counts"]
+
+    assert channel_counts() == {"draft": 1}
+    assert channel_counts() == {"draft": 1}
+    assert len(computed) == 1
+
+    # Edits that leave status and schedule alone keep the cached overview.
+    post.body_text = "edited"
+    db_session.commit()
+    channel_counts()
+    assert len(computed) == 1
+
+    post.status = PostStatus.pending
+    db_session.commit()
+    assert channel_counts() == {"pending": 1}
+    assert len(computed) == 2
+
+
+def test_concurrent_misses_compute_once(fake_redis):
+    computed = []
+
+    async def slow_compute():
+        computed.append(1)
+        await asyncio.sleep(0.2)
+        return DashboardOverview(now=datetime.utcnow())
+
+    async def poll_many():
+        return await asyncio.gather(*[dashboard_cache.get_overview(slow_compute) for _ in range(20)])
+
+    results = asyncio.run(poll_many())
+
+    assert len(computed) == 1
+    assert len({result.now for result in results}) == 1
+
+
+def test_invalidation_backs_off_while_redis_is_down(monkeypatch):
+    calls = []
+
+    class DownRedis:
+        def incr(self, key):
+            calls.append(key)
+            raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(dashboard_cache, "_redis_client", DownRedis())
+    monkeypatch.setattr(dashboard_cache, "_backoff", dashboard_cache.RedisBackoff())
+    monkeypatch.setattr(dashboard_cache.settings, "redis_outage_backoff_seconds", 60.0)
+
+    dashboard_cache.invalidate()
+    dashboard_cache.invalidate()
+
+    assert calls == [dashboard_cache.GENERATION_KEY]
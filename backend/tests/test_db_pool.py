@@ -0,0 +1,31 @@
+import sqlite3
+
+from prometheus_client import REGISTRY
+
+from app.db import session
+
+
+def test_worker_profile_uses_worker_sizes_and_statement_timeout(monkeypatch):
+    monkeypatch.setattr(session.settings, "db_worker_pool_size", 3)
+    monkeypatch.setattr(session.settings, "db_worker_pool_max_overflow", 1)
+    monkeypatch.setattr(session.settings, "db_worker_statement_timeout_ms", 120000)
+    monkeypatch.setattr(session.settings, "db_statement_timeout_ms", 0)
+
+    worker = session.pool_options("worker")
+    api = session.pool_options("api")
+
+    assert (worker["pool_size"], worker["max_overflow"]) == (3, 1)
+    assert worker["connect_args"] == {"options": "-c statement_timeout=120000"}
+    assert api["pool_size"] == session.settings.db_pool_size
+    assert "connect_args" not in api
+
+
+def test_pool_checkout_wait_is_observed(tmp_path):
+    pool_class = type("TestQueuePool", (session.InstrumentedQueuePool,), {"profile": "test"})
+    pool = pool_class(lambda: sqlite3.connect(str(tmp_path / "pool.db")), pool_size=1, max_overflow=0)
+    labels = {"profile": "test"}
+    before = REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count", labels) or 0
+
+    pool.connect().close()
+
+    assert REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count", labels) == before + 1
@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+import fakeredis
+
+from app.core.security import create_access_token, hash_password
+from app.models.channel import Channel
+from app.models.enums import UserRole
+from app.models.user import User
+from app.services import events
+
+
+def test_events_requires_auth(client):
+    resp = client.get("/v1/events")
+    assert resp.status_code == 401
+
+
+def test_post_and_suggestion_changes_are_published(client, db_session, monkeypatch):
+    channel = Channel(title="Ch", telegram_channel_identifier="@ch_events")
+    editor = User(email="events@example.com", password_hash=hash_password("secret"), role=UserRole.editor)
+    db_session.add_all([channel, editor])
+    db_session.commit()
+    published = []
+    monkeypatch.setattr(events, "publish", lambda event_type, data: published.append((event_type, data)))
+
+    payload = {"title": "News", "body_text": "Body", "source_url": "https://example.com/events"}
+    resp = client.post(f"/v1/channels/{channel.id}/suggestions", json=payload, headers={"X-API-Key": "test-n8n-key"})
+    assert resp.status_code == 200
+    suggestion_id = resp.json()["id"]
+    headers = {"Authorization": f"Bearer {create_access_token(str(editor.id))}"}
+    resp = client.post(f"/v1/channels/{channel.id}/suggestions/{suggestion_id}/accept", headers=headers)
+    assert resp.status_code == 200
+    post_id = resp.json()["id"]
+    resp = client.post(f"/v1/posts/{post_id}/submit-approval", headers=headers)
+    assert resp.status_code == 200
+
+    assert [event_type for event_type, _ in published] == [
+        "suggestion.created",
+        "suggestion.accepted",
+        "post.updated",
+        "post.updated",
+    ]
+    assert published[0][1] == {"suggestion_id": suggestion_id, "channel_id": channel.id}
+    assert published[-1][1]["post_id"] == post_id
+    assert published[-1][1]["status"] == "pending"
+    assert published[-1][1]["previous_status"] == "draft"
+
+
+# The real publish, captured before conftest stubs it out for every test.
+publish_to_redis = events.publish
+
+
+def test_stream_relays_published_events(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(events, "publish", publish_to_redis)
+    monkeypatch.setattr(events, "_redis_client", fakeredis.FakeRedis(server=server))
+    monkeypatch.setattr(events, "_subscriber", lambda: fakeredis.FakeAsyncRedis(server=server))
+    monkeypatch.setattr(events, "_hub", events.EventHub())
+    monkeypatch.setattr(events.settings, "events_heartbeat_seconds", 0.01)
+
+    async def read_frames():
+        frames = events.stream()
+        received = [await anext(frames)]
+        events.post_deleted(7, 3)
+        for _ in range(20):
+            received.append(await anext(frames))
+        await frames.aclose()
+        return received
+
+    retry, *rest = asyncio.run(read_frames())
+
+    assert retry == f"retry: {events.settings.events_retry_ms}\n\n"
+    assert ": keepalive\n\n" in rest
+    deleted = next(frame for frame in rest if frame.startswith("event:"))
+    event_line, data_line, _, _ = deleted.split("\n")
+    assert event_line == "event: post.deleted"
+    assert json.loads(data_line.removeprefix("data: ")) == {"post_id": 7, "channel_id": 3}
+
+
+def test_streams_share_one_redis_subscription(monkeypatch):
+    server = fakeredis.FakeServer()
+    connections = []
+
+    def subscriber():
+        connections.append(fakeredis.FakeAsyncRedis(server=server))
+        return connections[-1]
+
+    monkeypatch.setattr(events, "publish", publish_to_redis)
+    monkeypatch.setattr(events, "_redis_client", fakeredis.FakeRedis(server=server))
+    monkeypatch.setattr(events, "_subscriber", subscriber)
+    monkeypatch.setattr(events, "_hub", events.EventHub())
+    monkeypatch.setattr(events.settings, "events_heartbeat_seconds", 0.01)
+
+    async def next_event(frames):
+        while not (frame := await anext(frames)).startswith("event:"):
+            pass
+        return frame
+
+    async def run():
+        streams = [events.stream() for _ in range(3)]
+        for frames in streams:
+            await anext(frames)
+        events.post_deleted(8, 3)
+        received = [await asyncio.wait_for(next_event(frames), timeout=2) for frames in streams]
+        for frames in streams:
+            await frames.aclose()
+        return received
+
+    received = asyncio.run(run())
+
+    assert len(connections) == 1
+    assert all(frame.startswith("event: post.deleted") for frame in received)
@@ -0,0 +1,97 @@
+from datetime import datetime
+
+from app.core.security import hash_password, create_access_token
+from app.models.channel import Channel
+from app.models.enums import UserRole, PostStatus
+from app.models.post import Post
+from app.models.post_comment import PostComment
+from app.models.user import User
+from app.repositories.pagination import encode_cursor
+
+
+def _setup(db_session, suffix: str):
+    channel = Channel(title="Ch", telegram_channel_identifier=f"@ch_pages_{suffix}")
+    user = User(email=f"pages_{suffix}@example.com", password_hash=hash_password("secret"), role=UserRole.admin)
+    db_session.add_all([channel, user])
+    db_session.commit()
+    return channel, user, {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+
+
+def test_post_list_cursor_in_header(client, db_session):
+    channel, user, headers = _setup(db_session, "posts")
+    created = datetime(2026, 1, 1)
+    db_session.add_all(
+        [
+            Post(
+                channel_id=channel.id,
+                title=f"P{i}",
+                body_text="B",
+                status=PostStatus.draft,
+                created_by=user.id,
+                updated_by=user.id,
+                created_at=created,
+            )
+            for i in range(5)
+        ]
+    )
+    db_session.commit()
+
+    titles, cursor = [], None
+    for _ in range(3):
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        resp = client.get(f"/v1/channels/{channel.id}/posts", params=params, headers=headers)
+        assert resp.status_code == 200
+        titles += [row["title"] for row in resp.json()]
+        cursor = resp.headers.get("X-Next-Cursor")
+
+    assert titles == ["P4", "P3", "P2", "P1", "P0"]
+    assert cursor is None
+
+
+def test_comment_cursor_pages_in_creation_order(client, db_session):
+    channel, user, headers = _setup(db_session, "comments")
+    post = Post(channel_id=channel.id, title="T", body_text="B", created_by=user.id, updated_by=user.id)
+    db_session.add(post)
+    db_session.commit()
+    db_session.add_all([PostComment(post_id=post.id, author_user_id=user.id, body_text=f"c{i}") for i in range(3)])
+    db_session.commit()
+
+    first = client.get(f"/v1/posts/{post.id}/comments", params={"limit": 2}, headers=headers)
+    second = client.get(
+        f"/v1/posts/{post.id}/comments", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]}, headers=headers
+    )
+
+    assert [c["body_text"] for c in first.json() + second.json()] == ["c0", "c1", "c2"]
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_malformed_or_foreign_cursor_is_rejected(client, db_session):
+    _channel, _user, headers = _setup(db_session, "invalid")
+
+    assert client.get("/v1/audit-logs", params={"cursor": "not-a-cursor"}, headers=headers).status_code == 400
+    foreign = encode_cursor("users", datetime(2026, 1, 1), 1)
+    assert client.get("/v1/schedule", params={"cursor": foreign}, headers=headers).status_code == 400
+
+
+def test_total_mode_none_and_estimated(monkeypatch, client, db_session):
+    from app.repositories import pagination
+    from app.services.audit import log_action
+
+    monkeypatch.setattr(pagination, "_count_cache", {})
+    _channel, user, headers = _setup(db_session, "totals")
+    log_action(db_session, "post", 888, "create", user.id, {})
+    db_session.commit()
+    params = {"entity_type": "post", "entity_id": 888}
+
+    none = client.get("/v1/audit-logs", params={**params, "total_mode": "none"}, headers=headers).json()
+    assert (none["total"], none["total_mode"], len(none["items"])) == (None, "none", 1)
+
+    first = client.get("/v1/audit-logs", params={**params, "total_mode": "estimated"}, headers=headers).json()
+    log_action(db_session, "post", 888, "update", user.id, {})
+    db_session.commit()
+    cached = client.get("/v1/audit-logs", params={**params, "total_mode": "estimated"}, headers=headers).json()
+    exact = client.get("/v1/audit-logs", params=params, headers=headers).json()
+
+    assert (first["total"], cached["total"], cached["total_mode"]) == (1, 1, "estimated")
+    assert (exact["total"], exact["total_mode"]) == (2, "exact")
+    assert client.get("/v1/audit-logs", params={"total_mode": "bogus"}, headers=headers).status_code == 422
@@ -0,0 +1,460 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.core.security import hash_password, create_access_token
+from app.models.audit_log import AuditLog
+from app.models.channel import Channel
+from app.models.post import Post
+from app.models.user import User
+from app.models.enums import UserRole, PostStatus
+from app.repositories import posts as post_repo
+from app.services import publish_queue, publisher
+from app.services.publisher import claim_post
+from app.services.telegram import TelegramResult
+from app.usecases import posts as post_usecase
+from app.workers import dispatcher, tasks
+
+
+def _channel_and_user(db_session, suffix: str):
+    channel = Channel(title="Ch", telegram_channel_identifier=f"@ch_pub_{suffix}")
+    user = User(email=f"pub_{suffix}@example.com", password_hash=hash_password("secret"), role=UserRole.editor)
+    db_session.add_all([channel, user])
+    db_session.commit()
+    return channel, user
+
+
+def _post(channel, user, **kwargs) -> Post:
+    return Post(
+        channel_id=channel.id,
+        title="T",
+        body_text="B",
+        created_by=user.id,
+        updated_by=user.id,
+        **kwargs,
+    )
+
+
+def test_beat_fans_out_one_task_per_due_post(monkeypatch, db_session, session_factory):
+    channel, user = _channel_and_user(db_session, "fanout")
+    now = datetime.utcnow()
+    due = [_post(channel, user, status=PostStatus.scheduled, scheduled_at=now - timedelta(minutes=i)) for i in range(5)]
+    future = _post(channel, user, status=PostStatus.scheduled, scheduled_at=now + timedelta(hours=1))
+    db_session.add_all([*due, future])
+    db_session.commit()
+
+    dispatched = []
+    monkeypatch.setattr(tasks, "SessionLocal", session_factory)
+    monkeypatch.setattr(tasks.settings, "publish_dispatch_batch_size", 2)
+    monkeypatch.setattr(tasks.publish_queue, "reserve", lambda ids: ids)
+    monkeypatch.setattr(tasks.publish_post_task, "delay", dispatched.append)
+
+    tasks.publish_scheduled_posts()
+
+    assert {p.id for p in due} <= set(dispatched)
+    assert future.id not in dispatched
+    assert len(dispatched) == len(set(dispatched))
+
+
+def test_post_task_skips_posts_no_longer_due(monkeypatch, db_session, session_factory):
+    channel, user = _channel_and_user(db_session, "skip")
+    post = _post(channel, user, status=PostStatus.published, telegram_message_id="1")
+    db_session.add(post)
+    db_session.commit()
+
+    calls = []
+    monkeypatch.setattr(tasks, "SessionLocal", session_factory)
+    monkeypatch.setattr(tasks, "publish_post", lambda *args, **kwargs: calls.append(args))
+    monkeypatch.setattr(tasks.publish_queue, "release", lambda post_id: None)
+
+    tasks.publish_post_task(post.id)
+
+    assert calls == []
+
+
+def test_beat_dispatches_round_robin_across_channels(monkeypatch, db_session, session_factory):
+    big, user = _channel_and_user(db_session, "fair_big")
+    small = Channel(title="Small", telegram_channel_identifier="@ch_pub_fair_small")
+    db_session.add(small)
+    db_session.commit()
+    now = datetime.utcnow()
+    flood = [
+        _post(big, user, status=PostStatus.scheduled, scheduled_at=now - timedelta(minutes=10, seconds=i))
+        for i in range(6)
+    ]
+    single = _post(small, user, status=PostStatus.scheduled, scheduled_at=now - timedelta(minutes=1))
+    db_session.add_all([*flood, single])
+    db_session.commit()
+
+    dispatched = []
+    monkeypatch.setattr(tasks, "SessionLocal", session_factory)
+    monkeypatch.setattr(tasks.settings, "publish_dispatch_batch_size", 2)
+    monkeypatch.setattr(tasks.publish_queue, "reserve", lambda ids: ids)
+    monkeypatch.setattr(tasks.publish_post_task, "delay", dispatched.append)
+
+    tasks.publish_scheduled_posts()
+
+    mine = [post_id for post_id in dispatched if post_id in {p.id for p in [*flood, single]}]
+    assert single.id in mine[:2]
+    assert sorted(mine) == sorted(p.id for p in [*flood, single])
+
+
+def test_fair_order_interleaves_channels():
+    channel_of = {1: 10, 2: 10, 3: 10, 4: 20, 5: 30, 6: 20}
+    assert publish_queue.fair_order([1, 2, 3, 4, 5, 6], channel_of) == [1, 4, 5, 2, 6, 3]
+
+
+def test_dispatcher_hands_due_posts_to_workers_and_requeues_overflow(monkeypatch, session_factory):
+    dispatched = []
+    requeued = []
+    monkeypatch.setattr(dispatcher, "SessionLocal", session_factory)
+    monkeypatch.setattr(dispatcher.publish_queue, "pop_due", lambda limit: [1, 2, 3])
+    monkeypatch.setattr(dispatcher.publish_queue, "reserve", lambda ids: ids[:2])
+    monkeypatch.setattr(dispatcher.publish_queue, "schedule", lambda post_id, when: requeued.append(post_id))
+    monkeypatch.setattr(tasks.publish_post_task, "delay", dispatched.append)
+
+    assert dispatcher.dispatch_due() == 2
+    assert dispatched == [1, 2]
+    assert requeued == [3]
+
+
+def test_claim_is_exclusive_and_expired_leases_are_reaped(db_session):
+    channel, user = _channel_and_user(db_session, "lease")
+    now = datetime.utcnow()
+    post = _post(channel, user, status=PostStatus.scheduled, scheduled_at=now - timedelta(seconds=1))
+    db_session.add(post)
+    db_session.commit()
+
+    assert claim_post(db_session, post.id, from_statuses={PostStatus.scheduled}, due_before=now)
+    assert not claim_post(db_session, post.id, from_statuses={PostStatus.scheduled}, due_before=now)
+    db_session.refresh(post)
+    assert post.status == PostStatus.publishing
+    assert post.lease_owner
+
+    assert post_repo.release_expired_leases(db_session, now) == []
+    reaped = post_repo.release_expired_leases(db_session, post.lease_expires_at + timedelta(seconds=1))
+    assert reaped == [post.id]
+    db_session.refresh(post)
+    assert post.status == PostStatus.scheduled
+    assert post.lease_owner is None
+
+
+def test_publish_now_returns_job_and_publishes_on_priority_task(monkeypatch, client, db_session, session_factory):
+    channel, user = _channel_and_user(db_session, "now")
+    post = _post(channel, user, status=PostStatus.approved)
+    db_session.add(post)
+    db_session.commit()
+
+    seen_status = []
+    sent = []
+
+    def fake_publish(channel_identifier, text, photo_url=None, file_id=None, heartbeat=None):
+        with db_session.bind.connect() as conn:
+            seen_status.append(conn.exec_driver_sql(f"SELECT status FROM posts WHERE id = {post.id}").scalar())
+        return TelegramResult(ok=True, message_id="99", error=None)
+
+    monkeypatch.setattr(publisher, "publish_message", fake_publish)
+    monkeypatch.setattr(post_usecase, "send_task_nowait", lambda name, args, task_id: sent.append(args) or True)
+    monkeypatch.setattr(tasks, "SessionLocal", session_factory)
+    headers = {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+
+    resp = client.post(f"/v1/posts/{post.id}/publish-now", headers=headers)
+
+    assert resp.status_code == 202
+    job = resp.json()
+    assert job["state"] == "pending"
+    assert job["post"]["status"] == "publishing"
+    assert sent == [(post.id, user.id, job["job_id"])]
+    assert seen_status == []
+
+    # A stale job id (e.g. after the lease was reaped) must not publish.
+    assert tasks.publish_now_task(post.id, user.id, "other-job") is None
+    assert tasks.publish_now_task(*sent[0]) == "published"
+    # The claim was committed before Telegram was called.
+    assert seen_status == ["publishing"]
+
+    status_resp = client.get(f"/v1/posts/{post.id}/publish-jobs/{job['job_id']}", headers=headers)
+    assert status_resp.status_code == 200
+    assert status_resp.json()["state"] == "published"
+    assert status_resp.json()["post"]["telegram_message_id"] == "99"
+    unknown = client.get(f"/v1/posts/{post.id}/publish-jobs/not-a-job", headers=headers)
+    assert unknown.status_code == 404
+
+
+def test_publish_now_publishes_inline_when_broker_is_down(monkeypatch, client, db_session):
+    channel, user = _channel_and_user(db_session, "now_inline")
+    post = _post(channel, user, status=PostStatus.approved)
+    db_session.add(post)
+    db_session.commit()
+
+    monkeypatch.setattr(
+        publisher, "publish_message", lambda *args, **kwargs: TelegramResult(ok=True, message_id="5", error=None)
+    )
+    monkeypatch.setattr(post_usecase, "send_task_nowait", lambda name, args, task_id: False)
+    headers = {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+
+    resp = client.post(f"/v1/posts/{post.id}/publish-now", headers=headers)
+
+    assert resp.status_code == 202
+    assert resp.json()["state"] == "published"
+
+
+def test_publish_outcome_is_a_single_commit(monkeypatch, db_session):
+    channel, user = _channel_and_user(db_session, "onecommit")
+    post = _post(channel, user, status=PostStatus.publishing)
+    db_session.add(post)
+    db_session.commit()
+
+    commits = []
+
+    def on_commit(session):
+        commits.append(session)
+
+    event.listen(db_session, "after_commit", on_commit)
+    monkeypatch.setattr(
+        publisher, "publish_message", lambda *args, **kwargs: TelegramResult(ok=True, message_id="7", error=None)
+    )
+    try:
+        publisher.publish_post(db_session, post, user.id, channel)
+    finally:
+        event.remove(db_session, "after_commit", on_commit)
+
+    assert len(commits) == 1
+    assert post.status == PostStatus.published
+    actions = db_session.query(AuditLog.action).filter(AuditLog.entity_type == "post", AuditLog.entity_id == post.id)
+    assert [a for (a,) in actions] == ["publish"]
+
+
+def test_batch_task_claims_chunk_and_audits_each_outcome(monkeypatch, db_session, session_factory):
+    channel, user = _channel_and_user(db_session, "batch")
+    now = datetime.utcnow()
+    due = [_post(channel, user, status=PostStatus.scheduled, scheduled_at=now - timedelta(seconds=i)) for i in range(3)]
+    done = _post(channel, user, status=PostStatus.published, telegram_message_id="1")
+    db_session.add_all([*due, done])
+    db_session.commit()
+
+    released = []
+    monkeypatch.setattr(tasks, "SessionLocal", session_factory)
+    monkeypatch.setattr(tasks.publish_queue, "release", released.append)
+    monkeypatch.setattr(
+        publisher, "publish_message", lambda *args, **kwargs: TelegramResult(ok=True, message_id="8", error=None)
+    )
+
+    ids = [p.id for p in due] + [done.id]
+    assert tasks.publish_posts_batch_task(ids) == 3
+
+    db_session.expire_all()
+    assert all(p.status == PostStatus.published for p in due)
+    audited = db_session.query(AuditLog.entity_id).filter(AuditLog.entity_type == "post", AuditLog.action == "publish")
+    assert {p.id for p in due} <= {entity_id for (entity_id,) in audited}
+    assert done.id not in {entity_id for (entity_id,) in audited}
+    assert sorted(released) == sorted(ids)
+
+
+def test_batch_task_keeps_audit_rows_of_committed_outcomes(monkeypatch, db_session, session_factory):
+    channel, user = _channel_and_user(db_session, "batch_crash")
+    now = datetime.utcnow()
+    due = [_post(channel, user, status=PostStatus.scheduled, scheduled_at=now - timedelta(seconds=i)) for i in range(2)]
+    db_session.add_all(due)
+    db_session.commit()
+    calls = []
+
+    def fake_publish(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 2:
+            raise RuntimeError("worker died")
+        return TelegramResult(ok=True, message_id="8", error=None)
+
+    monkeypatch.setattr(tasks, "SessionLocal", session_factory)
+    monkeypatch.setattr(tasks.publish_queue, "release", lambda post_id: None)
+    monkeypatch.setattr(publisher, "publish_message", fake_publish)
+
+    try:
+        tasks.publish_posts_batch_task([p.id for p in due])
+    except RuntimeError:
+        pass
+
+    db_session.expire_all()
+    published = [p for p in due if p.status == PostStatus.published]
+    assert len(published) == 1
+    audited = db_session.query(AuditLog.entity_id).filter(AuditLog.entity_type == "post", AuditLog.action == "publish")
+    assert published[0].id in {entity_id for (entity_id,) in audited}
+    # Leave no lease behind for other tests' reapers.
+    db_session.query(Post).filter(Post.id.in_([p.id for p in due])).update(
+        {"status": PostStatus.failed, "lease_owner": None, "lease_expires_at": None}, synchronize_session=False
+    )
+    db_session.commit()
+
+
+def test_batch_task_renews_leases_and_skips_posts_taken_over(monkeypatch, db_session, session_factory):
+    channel, user = _channel_and_user(db_session, "batch_lease")
+    now = datetime.utcnow()
+    first, second = [
+        _post(channel, user, status=PostStatus.scheduled, scheduled_at=now - timedelta(seconds=i)) for i in range(2)
+    ]
+    db_session.add_all([first, second])
+    db_session.commit()
+    calls = []
+
+    def fake_publish(*args, **kwargs):
+        calls.append(args)
+        # While the first post is sent, the reaper hands the second one to another worker.
+        with session_factory() as other:
+            other.query(Post).filter(Post.id == second.id).update({"lease_owner": "other-worker"})
+            other.commit()
+        return TelegramResult(ok=True, message_id="8", error=None)
+
+    monkeypatch.setattr(tasks, "SessionLocal", session_factory)
+    monkeypatch.setattr(tasks.publish_queue, "release", lambda post_id: None)
+    monkeypatch.setattr(tasks.settings, "publish_lease_seconds", 0)
+    monkeypatch.setattr(publisher, "publish_message", fake_publish)
+
+    assert tasks.publish_posts_batch_task([first.id, second.id]) == 2
+
+    db_session.expire_all()
+    assert len(calls) == 1
+    assert first.status == PostStatus.published
+    assert second.status == PostStatus.publishing and second.lease_owner == "other-worker"
+    second.status = PostStatus.failed
+    second.lease_owner = None
+    db_session.commit()
+
+
+def test_outcome_is_not_written_after_the_lease_was_lost(monkeypatch, db_session, session_factory):
+    channel, user = _channel_and_user(db_session, "lease_lost")
+    post = _post(channel, user, status=PostStatus.scheduled, scheduled_at=datetime.utcnow())
+    db_session.add(post)
+    db_session.commit()
+    assert claim_post(db_session, post.id, from_statuses={PostStatus.scheduled}, owner="slow-worker")
+    db_session.refresh(post)
+
+    def fake_publish(*args, **kwargs):
+        # The lease expired mid-call and the reaper returned the post to the schedule.
+        with session_factory() as other:
+            other.query(Post).filter(Post.id == post.id).update(
+                {"status": PostStatus.scheduled, "lease_owner": None, "lease_expires_at": None}
+            )
+            other.commit()
+        return TelegramResult(ok=True, message_id="9", error=None)
+
+    monkeypatch.setattr(publisher, "publish_message", fake_publish)
+
+    publisher.publish_post(db_session, post, user.id, channel)
+
+    assert post.status == PostStatus.scheduled
+    assert post.telegram_message_id is None
+    actions = db_session.query(AuditLog.action).filter(AuditLog.entity_type == "post", AuditLog.entity_id == post.id)
+    assert actions.all() == []
+
+
+def test_lease_is_renewed_before_an_attempt_that_could_outlast_it(monkeypatch, db_session):
+    channel, user = _channel_and_user(db_session, "heartbeat")
+    post = _post(channel, user, status=PostStatus.scheduled, scheduled_at=datetime.utcnow())
+    db_session.add(post)
+    db_session.commit()
+    assert claim_post(db_session, post.id, from_statuses={PostStatus.scheduled}, owner="slow-worker")
+    db_session.refresh(post)
+    # Retries and retry_after sleeps have already eaten most of the lease.
+    post.lease_expires_at = datetime.utcnow() + timedelta(seconds=5)
+    db_session.commit()
+    leases = []
+
+    def fake_publish(*args, heartbeat=None, **kwargs):
+        for _ in range(2):
+            heartbeat()
+            leases.append(post.lease_expires_at)
+        return TelegramResult(ok=True, message_id="10", error=None)
+
+    monkeypatch.setattr(publisher, "publish_message", fake_publish)
+
+    publisher.publish_post(db_session, post, user.id, channel)
+
+    assert leases[0] > datetime.utcnow() + timedelta(seconds=publisher.settings.telegram_attempt_seconds)
+    # A lease with more than one attempt left is not renewed again.
+    assert leases[1] == leases[0]
+    assert post.status == PostStatus.published
+
+
+def test_dispatch_posts_chunks_in_batch_mode(monkeypatch):
+    batches = []
+    monkeypatch.setattr(tasks.settings, "publish_task_batch_size", 2)
+    monkeypatch.setattr(tasks.publish_posts_batch_task, "delay", batches.append)
+
+    tasks.dispatch_posts([1, 2, 3, 4, 5])
+
+    assert batches == [[1, 2], [3, 4], [5]]
+
+
+def test_retry_backoff_is_exponential_with_full_jitter_and_capped(monkeypatch):
+    monkeypatch.setattr(publisher.settings, "publish_retry_delay_seconds", 10)
+    monkeypatch.setattr(publisher.settings, "publish_retry_max_delay_seconds", 60)
+    monkeypatch.setattr(publisher.random, "uniform", lambda low, high: high)
+
+    assert [publisher.retry_delay_seconds(n) for n in range(1, 6)] == [10, 20, 40, 60, 60]
+
+    monkeypatch.setattr(publisher.random, "uniform", lambda low, high: low)
+    assert publisher.retry_delay_seconds(3) == 0
+
+
+def test_retryable_failure_records_retry_and_cools_down_channel(monkeypatch, db_session):
+    channel, user = _channel_and_user(db_session, "cooldown")
+    post = _post(channel, user, status=PostStatus.publishing)
+    other = _post(channel, user, status=PostStatus.publishing)
+    db_session.add_all([post, other])
+    db_session.commit()
+
+    calls = []
+
+    def fake_publish(*args, **kwargs):
+        calls.append(args)
+        return TelegramResult(ok=False, message_id=None, error="Bad Gateway", retryable=True)
+
+    monkeypatch.setattr(publisher, "publish_message", fake_publish)
+    monkeypatch.setattr(publisher.publish_queue, "schedule", lambda post_id, when: None)
+    monkeypatch.setattr(publisher.settings, "publish_retry_delay_seconds", 10)
+    monkeypatch.setattr(publisher.settings, "publish_channel_cooldown_seconds", 120)
+    monkeypatch.setattr(publisher.random, "uniform", lambda low, high: high)
+
+    before = datetime.utcnow()
+    publisher.publish_post(db_session, post, user.id, channel)
+
+    assert post.status == PostStatus.scheduled
+    assert post.publish_attempts == 1
+    assert channel.publish_cooldown_until >= before + timedelta(seconds=120)
+    # The cool-down outlasts the 10s backoff, so the retry waits for it.
+    assert post.next_retry_at == post.scheduled_at == channel.publish_cooldown_until
+
+    publisher.publish_post(db_session, other, user.id, channel)
+
+    assert len(calls) == 1
+    assert other.status == PostStatus.scheduled
+    assert other.publish_attempts == 0
+    assert other.next_retry_at > channel.publish_cooldown_until
+
+
+def test_local_throttling_defers_without_counting_an_attempt(monkeypatch, db_session):
+    channel, user = _channel_and_user(db_session, "throttled")
+    post = _post(channel, user, status=PostStatus.publishing, publish_attempts=2)
+    db_session.add(post)
+    db_session.commit()
+    scheduled = []
+
+    monkeypatch.setattr(
+        publisher,
+        "publish_message",
+        lambda *args, **kwargs: TelegramResult(
+            ok=False, message_id=None, error="Telegram rate limit wait exceeded", retryable=True, throttled=True
+        ),
+    )
+    monkeypatch.setattr(publisher.publish_queue, "schedule", lambda post_id, when: scheduled.append(post_id))
+    monkeypatch.setattr(publisher.settings, "publish_retry_max", 3)
+    monkeypatch.setattr(publisher.settings, "publish_channel_cooldown_seconds", 120)
+
+    before = datetime.utcnow()
+    publisher.publish_post(db_session, post, user.id, channel)
+
+    assert post.status == PostStatus.scheduled
+    assert post.publish_attempts == 2
+    assert post.scheduled_at >= before + timedelta(seconds=publisher.settings.telegram_rate_limit_max_wait_seconds)
+    assert channel.publish_cooldown_until is None
+    assert scheduled == [post.id]
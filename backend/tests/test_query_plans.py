@@ -0,0 +1,179 @@
+"""EXPLAIN checks that the hot query shapes are served by the indexes of migration 0014.
+
+Runs on a separate, seeded SQLite database so the shared test database stays
+small. The default seed keeps the suite fast; for a full-size run use e.g.
+`QUERY_PLAN_SEED_ROWS=1000000 pytest tests/test_query_plans.py`.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, insert, select, text
+
+from app.db.base import Base
+from app.models.audit_log import AuditLog
+from app.models.channel import Channel
+from app.models.enums import PostStatus, UserRole
+from app.models.post import Post
+from app.models.suggestion import Suggestion
+from app.models.user import User
+
+SEED_ROWS = int(os.getenv("QUERY_PLAN_SEED_ROWS", "20000"))
+CHANNELS = 50
+NOW = datetime(2026, 1, 1)
+
+
+def _status(i: int) -> PostStatus:
+    if i % 50 == 0:
+        return PostStatus.scheduled
+    if i % 97 == 0:
+        return PostStatus.failed
+    if i % 7 == 0:
+        return PostStatus.draft
+    return PostStatus.published
+
+
+@pytest.fixture(scope="module")
+def plan_engine(tmp_path_factory):
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"email": "plans@example.com", "password_hash": "-", "role": UserRole.admin}])
+        conn.execute(
+            insert(Channel),
+            [{"title": f"Ch {i}", "telegram_channel_identifier": f"@plans_{i}", "created_at": NOW} for i in range(CHANNELS)],
+        )
+        posts = []
+        for i in range(SEED_ROWS):
+            status = _status(i)
+            created = NOW - timedelta(minutes=SEED_ROWS - i)
+            posts.append(
+                {
+                    "channel_id": i % CHANNELS + 1,
+                    "title": f"Post {i}",
+                    "body_text": "Body",
+                    "status": status,
+                    "scheduled_at": NOW + timedelta(minutes=i % 1440) if status == PostStatus.scheduled else None,
+                    "published_at": created if status == PostStatus.published else None,
+                    "last_error": "boom" if status == PostStatus.failed else None,
+                    "created_by": 1,
+                    "updated_by": 1,
+                    "created_at": created,
+                    "updated_at": created,
+                }
+            )
+        conn.execute(insert(Post), posts)
+        conn.execute(
+            insert(AuditLog),
+            [
+                {
+                    "entity_type": "post" if i % 3 else "suggestion",
+                    "entity_id": i % 5000,
+                    "action": "update",
+                    "actor_user_id": 1,
+                    "payload_json": {},
+                    "created_at": NOW - timedelta(minutes=SEED_ROWS - i),
+                }
+                for i in range(SEED_ROWS)
+            ],
+        )
+        conn.execute(
+            insert(Suggestion),
+            [
+                {
+                    "channel_id": i % CHANNELS + 1,
+                    "title": f"S {i}",
+                    "body_text": "Body",
+                    "source_hash": f"h{i}",
+                    "created_at": NOW - timedelta(minutes=i),
+                }
+                for i in range(max(1, SEED_ROWS // 10))
+            ],
+        )
+        conn.execute(text("ANALYZE"))
+    yield engine
+    engine.dispose()
+
+
+def _plan(engine, stmt) -> str:
+    # Literal binds: SQLite only uses a partial index when the predicate is visible
+    # in the SQL text.
+    sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+def _uses(plan: str, index_name: str) -> bool:
+    return f"INDEX {index_name}" in plan
+
+
+def test_channel_post_list_uses_composite_indexes(plan_engine):
+    by_status = (
+        select(Post.id)
+        .where(Post.channel_id == 7)
+        .where(Post.status == PostStatus.draft)
+        .order_by(Post.created_at.desc())
+        .limit(50)
+    )
+    assert _uses(_plan(plan_engine, by_status), "ix_posts_channel_status_created_at")
+
+    unfiltered = select(Post.id).where(Post.channel_id == 7).order_by(Post.created_at.desc()).limit(50)
+    plan = _plan(plan_engine, unfiltered)
+    assert _uses(plan, "ix_posts_channel_created_at")
+    assert "TEMP B-TREE" not in plan
+
+
+def test_due_scheduled_posts_use_partial_index(plan_engine):
+    due = (
+        select(Post.id, Post.scheduled_at)
+        .where(Post.status == PostStatus.scheduled)
+        .where(Post.scheduled_at <= NOW + timedelta(hours=1))
+        .order_by(Post.scheduled_at.asc(), Post.id.asc())
+        .limit(50)
+    )
+    plan = _plan(plan_engine, due)
+    assert _uses(plan, "ix_posts_scheduled_at_id")
+    assert "TEMP B-TREE" not in plan
+
+
+def test_dashboard_next_scheduled_per_channel_uses_partial_index(plan_engine):
+    next_at = (
+        select(Post.channel_id, func.min(Post.scheduled_at))
+        .where(Post.status == PostStatus.scheduled)
+        .where(Post.scheduled_at > NOW)
+        .group_by(Post.channel_id)
+    )
+    assert _uses(_plan(plan_engine, next_at), "ix_posts_scheduled_channel_at")
+
+
+def test_recent_errors_use_partial_index(plan_engine):
+    errors = select(Post.id).where(Post.last_error.is_not(None)).order_by(Post.updated_at.desc()).limit(10)
+    plan = _plan(plan_engine, errors)
+    assert _uses(plan, "ix_posts_errors_updated_at")
+    assert "TEMP B-TREE" not in plan
+
+
+def test_audit_log_listing_uses_created_at_indexes(plan_engine):
+    latest = select(AuditLog.id).order_by(AuditLog.created_at.desc()).limit(50)
+    assert _uses(_plan(plan_engine, latest), "ix_audit_logs_created_at_id")
+
+    for_entity = (
+        select(AuditLog.id)
+        .where(AuditLog.entity_type == "post")
+        .where(AuditLog.entity_id == 42)
+        .order_by(AuditLog.created_at.desc())
+        .limit(50)
+    )
+    assert _uses(_plan(plan_engine, for_entity), "ix_audit_logs_entity_created_at")
+
+
+def test_suggestions_inbox_uses_created_at_indexes(plan_engine):
+    latest = select(Suggestion.id).order_by(Suggestion.created_at.desc()).limit(50)
+    assert _uses(_plan(plan_engine, latest), "ix_suggestions_created_at_id")
+
+    for_channel = (
+        select(Suggestion.id).where(Suggestion.channel_id == 3).order_by(Suggestion.created_at.desc()).limit(50)
+    )
+    assert _uses(_plan(plan_engine, for_channel), "ix_suggestions_channel_created_at")
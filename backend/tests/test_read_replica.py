@@ -0,0 +1,94 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.security import hash_password, create_access_token
+from app.db.base import Base
+from app.db.deps import LAST_WRITE_COOKIE, get_async_read_db, read_db_dependency
+from app.db.session import async_database_url, read_session_factory
+from app import main
+from app.main import app
+from app.models.channel import Channel
+from app.models.enums import UserRole, PostStatus
+from app.models.post import Post
+from app.models.user import User
+
+REPLICA_CHANNEL_ID = 424242
+
+
+@pytest.fixture()
+def replica(tmp_path, monkeypatch, client):
+    url = f"sqlite+pysqlite:///{tmp_path / 'replica.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    with sessionmaker(bind=sync_engine)() as db:
+        db.add(Channel(id=REPLICA_CHANNEL_ID, title="Replica", telegram_channel_identifier="@replica"))
+        db.add(
+            Post(
+                channel_id=REPLICA_CHANNEL_ID,
+                title="from replica",
+                body_text="B",
+                status=PostStatus.scheduled,
+                scheduled_at=datetime.utcnow() + timedelta(hours=1),
+                created_by=1,
+                updated_by=1,
+            )
+        )
+        db.commit()
+
+    primary = create_async_engine(async_database_url(settings.database_url), poolclass=NullPool)
+    replica_engine = create_async_engine(async_database_url(url), poolclass=NullPool)
+    monkeypatch.setattr(settings, "database_read_url", url)
+    app.dependency_overrides[get_async_read_db] = read_db_dependency(read_session_factory(primary, replica_engine))
+    yield
+    sync_engine.dispose()
+
+
+def _titles(client, headers):
+    resp = client.get("/v1/schedule", params={"channel_id": REPLICA_CHANNEL_ID}, headers=headers)
+    assert resp.status_code == 200
+    return [item["title"] for item in resp.json()["items"]]
+
+
+def test_reads_go_to_replica_until_client_writes(replica, client, db_session):
+    user = User(email="replica_reader@example.com", password_hash=hash_password("secret"), role=UserRole.admin)
+    db_session.add(user)
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+
+    assert _titles(client, headers) == ["from replica"]
+
+    payload = {"title": "New", "telegram_channel_identifier": "@replica_write"}
+    resp = client.post("/v1/channels", json=payload, headers=headers)
+    assert resp.status_code < 400
+    assert LAST_WRITE_COOKIE in resp.cookies
+    # Primary has no such channel: the read after the write no longer hits the lagging replica.
+    assert _titles(client, headers) == []
+
+    client.cookies.set(LAST_WRITE_COOKIE, f"{time.time() - settings.read_your_writes_seconds - 1:.3f}")
+    assert _titles(client, headers) == ["from replica"]
+
+
+def test_shutdown_disposes_the_replica_engine(monkeypatch):
+    disposed = []
+
+    class Engine:
+        def __init__(self, name):
+            self.name = name
+
+        async def dispose(self):
+            disposed.append(self.name)
+
+    monkeypatch.setattr(main, "async_engine", Engine("primary"))
+    monkeypatch.setattr(main, "async_read_engine", Engine("replica"))
+
+    asyncio.run(main.close_async_engine())
+
+    assert disposed == ["primary", "replica"]
@@ -85,3 +85,36 @@ def test_list_schedule_filters(client, db_session):
     assert resp.status_code == 200
     data = resp.json()
     assert data["total"] == 1
+
+
+def test_schedule_cursor_keeps_unscheduled_times_last(client, db_session):
+    ch = Channel(title="Ch", telegram_channel_identifier="@ch_sched_cursor")
+    user = User(email="u_sched_cursor@example.com", password_hash=hash_password("secret"), role=UserRole.viewer)
+    db_session.add_all([ch, user])
+    db_session.commit()
+    at = datetime(2030, 1, 1)
+    db_session.add_all(
+        [
+            Post(
+                channel_id=ch.id,
+                title=title,
+                body_text="B",
+                status=PostStatus.scheduled,
+                scheduled_at=when,
+                created_by=user.id,
+                updated_by=user.id,
+            )
+            for title, when in [("late", at + timedelta(hours=1)), ("none", None), ("early", at), ("tie", at)]
+        ]
+    )
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+
+    titles, cursor = [], None
+    for _ in range(4):
+        params = {"channel_id": ch.id, "limit": 1, **({"cursor": cursor} if cursor else {})}
+        data = client.get("/v1/schedule", params=params, headers=headers).json()
+        titles += [item["title"] for item in data["items"]]
+        cursor = data["next_cursor"]
+
+    assert titles == ["early", "tie", "late", "none"]
@@ -0,0 +1,258 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+import redis
+
+from app.core.config import settings
+from app.services import telegram as telegram_service
+from app.services.telegram_async import AsyncTelegramClient
+from app.services.telegram_media import cached_file_id, remember_file_id
+
+
+def test_client_is_shared_and_recreated_after_close():
+    first = telegram_service._client()
+    assert telegram_service._client() is first
+
+    telegram_service.close_client()
+    assert first.is_closed
+
+    second = telegram_service._client()
+    assert second is not first
+    assert not second.is_closed
+    telegram_service.close_client()
+
+
+def test_http2_falls_back_to_http1_without_h2(monkeypatch):
+    # None in sys.modules makes `import h2` raise ImportError even where it is installed.
+    monkeypatch.setitem(sys.modules, "h2", None)
+    monkeypatch.setattr(settings, "telegram_http2", True)
+
+    # httpx raises ImportError for http2=True without h2; the client must still build.
+    client = telegram_service._build_client()
+    client.close()
+    assert not telegram_service._http2_enabled()
+
+
+def test_async_client_returns_same_result_shape():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path.endswith("/sendMessage")
+        return httpx.Response(200, json={"ok": True, "result": {"message_id": 42}})
+
+    async def run():
+        async with AsyncTelegramClient(httpx.AsyncClient(transport=httpx.MockTransport(handler))) as tg:
+            return await tg.publish_message("@ch", "hello")
+
+    previous = settings.telegram_bot_token
+    settings.telegram_bot_token = "test-token"
+    try:
+        result = asyncio.run(run())
+    finally:
+        settings.telegram_bot_token = previous
+    assert result.ok
+    assert result.message_id == "42"
+
+
+def test_retry_after_is_honoured_and_shared(monkeypatch):
+    calls = []
+    penalties = []
+    sleeps = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(
+                429,
+                json={"ok": False, "error_code": 429, "parameters": {"retry_after": 3}},
+            )
+        return httpx.Response(200, json={"ok": True, "result": {"message_id": 7}})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(telegram_service, "_client", lambda: client)
+    monkeypatch.setattr(telegram_service.telegram_rate_limit, "penalize", lambda chat, secs: penalties.append((chat, secs)))
+    monkeypatch.setattr(telegram_service.time, "sleep", sleeps.append)
+    monkeypatch.setattr(settings, "telegram_bot_token", "123:test")
+
+    result = telegram_service.publish_message("@ch_flood", "hello")
+
+    assert result.ok
+    assert len(calls) == 2
+    assert penalties == [("@ch_flood", 3.0)]
+    assert sleeps == [3.0]
+
+
+def test_media_upload_file_id_is_cached_and_reused(monkeypatch, db_session):
+    media_path = Path(settings.media_dir) / "cached_upload.jpg"
+    media_path.parent.mkdir(parents=True, exist_ok=True)
+    media_path.write_bytes(b"jpeg-bytes")
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        photos = [{"file_id": "small"}, {"file_id": "large"}]
+        return httpx.Response(200, json={"ok": True, "result": {"message_id": len(requests), "photo": photos}})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(telegram_service, "_client", lambda: client)
+    monkeypatch.setattr(settings, "telegram_bot_token", "123:test")
+
+    assert cached_file_id(db_session, "/media/cached_upload.jpg") is None
+    first = telegram_service.publish_message("@ch_a", "hi", "/media/cached_upload.jpg")
+    assert first.ok and first.file_id == "large"
+    assert requests[0].headers["content-type"].startswith("multipart/form-data")
+    remember_file_id(db_session, "/media/cached_upload.jpg", first)
+    db_session.commit()
+
+    file_id = cached_file_id(db_session, "/media/cached_upload.jpg")
+    assert file_id == "large"
+    second = telegram_service.publish_message("@ch_b", "hi", "/media/cached_upload.jpg", file_id=file_id)
+    assert second.ok and second.file_id is None
+    assert json.loads(requests[1].content)["photo"] == "large"
+
+
+def test_stale_file_id_falls_back_to_upload(monkeypatch):
+    media_path = Path(settings.media_dir) / "stale_upload.jpg"
+    media_path.parent.mkdir(parents=True, exist_ok=True)
+    media_path.write_bytes(b"jpeg-bytes")
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if len(requests) == 1:
+            return httpx.Response(
+                400,
+                json={"ok": False, "error_code": 400, "description": "Bad Request: wrong file identifier/HTTP URL specified"},
+            )
+        photos = [{"file_id": "fresh"}]
+        return httpx.Response(200, json={"ok": True, "result": {"message_id": 9, "photo": photos}})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(telegram_service, "_client", lambda: client)
+    monkeypatch.setattr(settings, "telegram_bot_token", "123:test")
+
+    result = telegram_service.publish_message("@ch_stale", "hi", "/media/stale_upload.jpg", file_id="gone")
+
+    assert result.ok and result.message_id == "9" and result.file_id == "fresh"
+    assert json.loads(requests[0].content)["photo"] == "gone"
+    assert requests[1].headers["content-type"].startswith("multipart/form-data")
+
+
+def test_async_stale_file_id_falls_back_to_upload(monkeypatch):
+    media_path = Path(settings.media_dir) / "stale_upload.jpg"
+    media_path.parent.mkdir(parents=True, exist_ok=True)
+    media_path.write_bytes(b"jpeg-bytes")
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if len(requests) == 1:
+            return httpx.Response(
+                400,
+                json={"ok": False, "error_code": 400, "description": "Bad Request: wrong file identifier/HTTP URL specified"},
+            )
+        return httpx.Response(200, json={"ok": True, "result": {"message_id": 9, "photo": [{"file_id": "fresh"}]}})
+
+    async def run():
+        async with AsyncTelegramClient(httpx.AsyncClient(transport=httpx.MockTransport(handler))) as tg:
+            return await tg.publish_message("@ch_stale", "hi", "/media/stale_upload.jpg", file_id="gone")
+
+    monkeypatch.setattr(settings, "telegram_bot_token", "123:test")
+    result = asyncio.run(run())
+
+    assert result.ok and result.file_id == "fresh"
+    assert len(requests) == 2
+
+
+def test_http_error_keeps_telegram_description(monkeypatch):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(400, json={"ok": False, "error_code": 400, "description": "Bad Request: chat not found"})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(telegram_service, "_client", lambda: client)
+    monkeypatch.setattr(settings, "telegram_bot_token", "123:test")
+
+    result = telegram_service.publish_message("@missing", "hi")
+
+    assert not result.ok and not result.retryable
+    assert result.error == "Bad Request: chat not found"
+
+
+def test_delete_of_missing_message_counts_as_done(monkeypatch):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(
+            400, json={"ok": False, "error_code": 400, "description": "Bad Request: message to delete not found"}
+        )
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(telegram_service, "_client", lambda: client)
+    monkeypatch.setattr(settings, "telegram_bot_token", "123:test")
+
+    result = telegram_service.delete_message("@ch", "15")
+
+    assert result.ok and result.message_id == "15"
+    assert len(calls) == 1
+
+
+def test_rate_limiter_cap_returns_a_throttled_result(monkeypatch):
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise AssertionError("Telegram must not be called")
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(telegram_service, "_client", lambda: client)
+    monkeypatch.setattr(telegram_service.telegram_rate_limit, "acquire", lambda chat_id: False)
+    monkeypatch.setattr(settings, "telegram_bot_token", "123:test")
+
+    result = telegram_service.publish_message("@busy", "hi")
+
+    assert not result.ok and result.retryable and result.throttled
+
+
+def test_limiter_held_back_retry_reports_the_real_error(monkeypatch):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(502, json={"ok": False, "error_code": 502, "description": "Bad Gateway"})
+
+    admitted = iter([True, False])
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(telegram_service, "_client", lambda: client)
+    monkeypatch.setattr(telegram_service.telegram_rate_limit, "acquire", lambda chat_id: next(admitted))
+    monkeypatch.setattr(telegram_service.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(settings, "telegram_bot_token", "123:test")
+
+    result = telegram_service.publish_message("@busy_retry", "hi")
+
+    assert len(calls) == 1
+    assert not result.ok and result.retryable and not result.throttled
+    assert result.error == "Bad Gateway"
+
+
+def test_rate_limiter_fails_open_and_backs_off_while_redis_is_down(monkeypatch):
+    limiter = telegram_service.telegram_rate_limit
+    calls = []
+
+    def unavailable(**kwargs):
+        calls.append(kwargs)
+        raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(limiter, "_backoff", limiter.RedisBackoff())
+    monkeypatch.setattr(limiter, "_redis", lambda: None)
+    monkeypatch.setattr(limiter, "_acquire", unavailable)
+    monkeypatch.setattr(limiter, "_penalize", unavailable)
+    monkeypatch.setattr(settings, "telegram_rate_limit_enabled", True)
+
+    assert limiter.try_acquire("@ch") == 0.0
+    # Until the backoff ends Redis is not asked again, so no send pays its timeout.
+    assert limiter.try_acquire("@ch") == 0.0
+    limiter.penalize("@ch", 3)
+    assert len(calls) == 1
+
+    limiter._backoff.reset()
+    assert limiter.try_acquire("@ch") == 0.0
+    assert len(calls) == 2
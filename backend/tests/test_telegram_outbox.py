@@ -0,0 +1,182 @@
+from datetime import datetime
+
+from app.core.security import hash_password, create_access_token
+from app.models.channel import Channel
+from app.models.enums import UserRole, PostStatus
+from app.models.post import Post
+from app.models.telegram_outbox import TelegramOutbox
+from app.models.user import User
+from app.services import telegram_outbox
+from app.services.post_render import post_fingerprint
+from app.services.telegram import TelegramResult
+from app.workers import tasks
+
+
+def _published_post(db_session, suffix: str, **kwargs):
+    channel = Channel(title="Ch", telegram_channel_identifier=f"@ch_outbox_{suffix}")
+    user = User(email=f"outbox_{suffix}@example.com", password_hash=hash_password("secret"), role=UserRole.admin)
+    db_session.add_all([channel, user])
+    db_session.commit()
+    post = Post(
+        channel_id=channel.id,
+        title="T",
+        body_text="B",
+        status=PostStatus.published,
+        telegram_message_id="42",
+        published_at=datetime.utcnow(),
+        created_by=user.id,
+        updated_by=user.id,
+        **kwargs,
+    )
+    post.telegram_fingerprint = post_fingerprint(post)
+    db_session.add(post)
+    db_session.commit()
+    return channel, user, post
+
+
+def _entries(db_session, channel: Channel) -> list[TelegramOutbox]:
+    # Filtered by chat: SQLite may reuse the id of a post deleted in another test.
+    db_session.expire_all()
+    stmt = db_session.query(TelegramOutbox).filter(TelegramOutbox.chat_id == channel.telegram_channel_identifier)
+    return stmt.order_by(TelegramOutbox.id).all()
+
+
+def test_edit_of_published_post_is_queued_not_sent_inline(monkeypatch, client, db_session):
+    channel, user, post = _published_post(db_session, "edit")
+    notified = []
+    monkeypatch.setattr(telegram_outbox, "notify", lambda countdown=None: notified.append(countdown))
+    monkeypatch.setattr(telegram_outbox, "edit_message", lambda *a, **k: (_ for _ in ()).throw(AssertionError))
+    headers = {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+
+    resp = client.put(f"/v1/posts/{post.id}", json={"body_text": "New"}, headers=headers)
+
+    assert resp.status_code == 200
+    assert resp.json()["sync_pending"] is True
+    [entry] = _entries(db_session, channel)
+    assert entry.action == "edit"
+    assert entry.status == "pending"
+    assert entry.payload_json["text"] == "T\n\nNew"
+    assert notified == [telegram_outbox.settings.telegram_edit_debounce_seconds]
+
+
+def test_worker_delivers_latest_edit_and_clears_sync_pending(monkeypatch, db_session, session_factory):
+    monkeypatch.setattr(telegram_outbox.settings, "telegram_edit_debounce_seconds", 0)
+    channel, user, post = _published_post(db_session, "deliver")
+    post.body_text = "First"
+    telegram_outbox.enqueue_edit(db_session, post, channel)
+    post.body_text = "Second"
+    telegram_outbox.enqueue_edit(db_session, post, channel)
+    db_session.commit()
+
+    sent = []
+
+    def fake_edit(chat_id, message_id, text, photo_url=None, file_id=None):
+        if chat_id == channel.telegram_channel_identifier:
+            sent.append(text)
+        return TelegramResult(ok=True, message_id=message_id, error=None)
+
+    monkeypatch.setattr(telegram_outbox, "edit_message", fake_edit)
+    monkeypatch.setattr(tasks, "SessionLocal", session_factory)
+
+    tasks.deliver_telegram_outbox()
+
+    assert sent == ["T\n\nSecond"]
+    assert [e.status for e in _entries(db_session, channel)] == ["superseded", "sent"]
+    assert db_session.get(Post, post.id).sync_pending is False
+
+
+def test_delete_is_queued_and_retried_until_it_fails(monkeypatch, client, db_session, session_factory):
+    channel, user, post = _published_post(db_session, "delete")
+    post_id = post.id
+    monkeypatch.setattr(telegram_outbox, "notify", lambda countdown=None: None)
+    headers = {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+
+    assert client.delete(f"/v1/posts/{post_id}", headers=headers).status_code == 204
+    db_session.expire_all()
+    assert db_session.get(Post, post_id) is None
+
+    results = [
+        TelegramResult(ok=False, message_id=None, error="Bad Gateway", retryable=True),
+        TelegramResult(ok=False, message_id=None, error="Forbidden", retryable=False),
+    ]
+    monkeypatch.setattr(telegram_outbox, "delete_message", lambda chat_id, message_id: results.pop(0))
+    monkeypatch.setattr(
+        telegram_outbox, "edit_message", lambda *a, **k: TelegramResult(ok=True, message_id="1", error=None)
+    )
+    monkeypatch.setattr(tasks, "SessionLocal", session_factory)
+
+    tasks.deliver_telegram_outbox()
+    [entry] = _entries(db_session, channel)
+    assert (entry.status, entry.attempts, entry.last_error) == ("pending", 1, "Bad Gateway")
+
+    entry.available_at = datetime.utcnow()
+    db_session.commit()
+    tasks.deliver_telegram_outbox()
+    [entry] = _entries(db_session, channel)
+    assert (entry.status, entry.attempts) == ("failed", 2)
+
+
+def test_save_without_rendered_changes_queues_nothing(monkeypatch, client, db_session):
+    channel, user, post = _published_post(db_session, "unchanged")
+    monkeypatch.setattr(telegram_outbox, "notify", lambda countdown=None: (_ for _ in ()).throw(AssertionError))
+    headers = {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+
+    resp = client.put(f"/v1/posts/{post.id}", json={"title": "T", "body_text": "B"}, headers=headers)
+
+    assert resp.status_code == 200
+    assert resp.json()["sync_pending"] is False
+    assert _entries(db_session, channel) == []
+
+
+def test_caption_only_change_uses_edit_caption(monkeypatch, db_session, session_factory):
+    monkeypatch.setattr(telegram_outbox.settings, "telegram_edit_debounce_seconds", 0)
+    channel, user, post = _published_post(db_session, "caption", media_url="/media/photo.jpg")
+    post.body_text = "Fixed typo"
+    telegram_outbox.enqueue_edit(db_session, post, channel)
+    db_session.commit()
+
+    captions = []
+    monkeypatch.setattr(
+        telegram_outbox,
+        "edit_caption",
+        lambda chat_id, message_id, caption: captions.append(caption)
+        or TelegramResult(ok=True, message_id=message_id, error=None),
+    )
+    monkeypatch.setattr(telegram_outbox, "edit_message", lambda *a, **k: (_ for _ in ()).throw(AssertionError))
+    monkeypatch.setattr(tasks, "SessionLocal", session_factory)
+
+    tasks.deliver_telegram_outbox()
+
+    assert captions == ["T\n\nFixed typo"]
+    db_session.expire_all()
+    assert db_session.get(Post, post.id).telegram_fingerprint == post_fingerprint(db_session.get(Post, post.id))
+
+
+def test_burst_of_saves_is_folded_into_one_debounced_edit(monkeypatch, client, db_session, session_factory):
+    channel, user, post = _published_post(db_session, "burst")
+    monkeypatch.setattr(telegram_outbox, "notify", lambda countdown=None: None)
+    headers = {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+
+    for i in range(5):
+        assert client.put(f"/v1/posts/{post.id}", json={"body_text": f"v{i}"}, headers=headers).status_code == 200
+
+    [entry] = _entries(db_session, channel)
+    assert entry.payload_json["text"] == "T\n\nv4"
+    assert entry.available_at > datetime.utcnow()
+
+    sent = []
+    monkeypatch.setattr(
+        telegram_outbox,
+        "edit_message",
+        lambda chat_id, message_id, text, *a, **k: sent.append((chat_id, text))
+        or TelegramResult(ok=True, message_id=message_id, error=None),
+    )
+    monkeypatch.setattr(tasks, "SessionLocal", session_factory)
+    tasks.deliver_telegram_outbox()
+    # Still inside the quiet window.
+    assert (channel.telegram_channel_identifier, "T\n\nv4") not in sent
+
+    entry.available_at = datetime.utcnow()
+    db_session.commit()
+    tasks.deliver_telegram_outbox()
+    assert [text for chat_id, text in sent if chat_id == channel.telegram_channel_identifier] == ["T\n\nv4"]
@@ -0,0 +1,50 @@
+import { getStoredToken } from "../state/tokenStorage.js";
+
+const EVENTS_URL = "/v1/events";
+
+function parseFrame(frame, { onEvent, onRetry }) {
+  let type = "message";
+  const data = [];
+  for (const line of frame.split("\n")) {
+    if (!line || line.startsWith(":")) continue;
+    const sep = line.indexOf(":");
+    const field = sep < 0 ? line : line.slice(0, sep);
+    const value = sep < 0 ? "" : line.slice(sep + 1).replace(/^ /, "");
+    if (field === "event") type = value;
+    else if (field === "data") data.push(value);
+    else if (field === "retry" && Number.isFinite(Number(value))) onRetry?.(Number(value));
+  }
+  if (data.length) onEvent(type, JSON.parse(data.join("\n")));
+}
+
+// fetch rather than EventSource: EventSource cannot send the Authorization header.
+// Resolves when the server closes the stream; rejects on HTTP errors (err.status) or abort.
+export async function streamEvents(token, { signal, onOpen, onEvent, onRetry } = {}) {
+  const authToken = token || getStoredToken();
+  const res = await fetch(EVENTS_URL, {
+    headers: {
+      Accept: "text/event-stream",
+      ...(authToken ? { Authorization: `Bearer ${authToken}` } : {})
+    },
+    signal
+  });
+  if (!res.ok || !res.body) {
+    const err = new Error("Event stream unavailable");
+    err.status = res.status;
+    throw err;
+  }
+  onOpen?.();
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) return;
+    buffer += value.replace(/\r\n?/g, "\n");
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary >= 0) {
+      parseFrame(buffer.slice(0, boundary), { onEvent, onRetry });
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf("\n\n");
+    }
+  }
+}
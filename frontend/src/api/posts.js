@@ -45,6 +45,10 @@ export function publishNow(token, postId) {
   return apiFetch(`/posts/${postId}/publish-now`, { method: "POST", token });
 }
 
+export function getPublishJob(token, postId, jobId, wait = 0) {
+  return apiFetch(`/posts/${postId}/publish-jobs/${jobId}?wait=${wait}`, { token });
+}
+
 export function deletePost(token, postId) {
   return apiFetch(`/posts/${postId}`, { method: "DELETE", token });
 }
@@ -1,14 +1,16 @@
 import { useState } from "react";
 import { Link, Outlet, useNavigate } from "react-router-dom";
 import { useAuth } from "../state/auth.jsx";
+import { useServerEvents } from "../hooks/useServerEvents.js";
 
 export default function AppShell() {
-  const { logout: authLogout, user } = useAuth();
+  const { logout: authLogout, token, user } = useAuth();
   const navigate = useNavigate();
   const [collapsed, setCollapsed] = useState(false);
   const role = user?.role || null;
   const isAdmin = role === "admin";
   const canModerate = role === "admin" || role === "editor";
+  useServerEvents(token);
 
   function logout() {
     authLogout();
@@ -33,6 +33,7 @@ export default function PostsList({
             <h3>{post.title}</h3>
             <p className="muted">{post.body_excerpt}</p>
             {post.editor_comment && <p className="note">Комментарий: {post.editor_comment}</p>}
+            {post.sync_pending && <p className="note">Изменения отправляются в Telegram…</p>}
             {post.last_error && <p className="note error">Ошибка: {post.last_error}</p>}
           </div>
           <div className="post-meta">
@@ -5,6 +5,7 @@ import {
   rejectPost as rejectPostApi,
   schedulePost as schedulePostApi,
   publishNow as publishNowApi,
+  getPublishJob,
   deletePost as deletePostApi
 } from "../api/posts.js";
 import { deleteChannel as deleteChannelApi } from "../api/channels.js";
@@ -45,7 +46,15 @@ export function useChannelActions({ token, channelId, navigate, invalidatePosts,
 
   const publishNowMutation = useMutation({
     mutationFn: (postId) => publishNowApi(token, postId),
-    onSuccess: invalidatePosts,
+    onSuccess: (job) => {
+      invalidatePosts();
+      // The publish runs in the background (202); long-poll for the outcome and refresh once it lands.
+      if (job?.state === "pending") {
+        getPublishJob(token, job.post_id, job.job_id, 20)
+          .then(invalidatePosts)
+          .catch(() => {});
+      }
+    },
     onError
   });
 
@@ -24,10 +24,10 @@ export function useChannelPostQueries({ channelId, token, activeTab, statusFilte
   });
 
   const queueQuery = useInfiniteQuery({
-    queryKey: ["posts", { channelId, statusFilters: ["pending", "approved", "scheduled"], limit: pageSize }],
+    queryKey: ["posts", { channelId, statusFilters: ["pending", "approved", "scheduled", "publishing"], limit: pageSize }],
     queryFn: ({ pageParam = 0 }) =>
       listPosts(token, channelId, {
-        statusFilters: ["pending", "approved", "scheduled"],
+        statusFilters: ["pending", "approved", "scheduled", "publishing"],
         limit: pageSize,
         offset: pageParam
       }),
@@ -1,14 +1,17 @@
 import { useQuery } from "@tanstack/react-query";
 import { getDashboardOverview } from "../api/dashboard.js";
+import { useServerEventsConnected } from "./useServerEvents.js";
 
 const DASHBOARD_KEY = ["dashboard", { scope: "overview" }];
 
 export function useDashboardOverviewQuery(token) {
+  // Pushed post events refresh the overview; poll only while the event stream is down.
+  const eventsConnected = useServerEventsConnected();
   const query = useQuery({
     queryKey: DASHBOARD_KEY,
     queryFn: () => getDashboardOverview(token),
     enabled: Boolean(token),
-    refetchInterval: 30_000
+    refetchInterval: eventsConnected ? false : 30_000
   });
 
   return {
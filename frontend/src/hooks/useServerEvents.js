@@ -0,0 +1,86 @@
+import { useEffect, useSyncExternalStore } from "react";
+import { useQueryClient } from "@tanstack/react-query";
+import { streamEvents } from "../api/events.js";
+import {
+  isServerEventsConnected,
+  setServerEventsConnected,
+  subscribeServerEvents
+} from "../state/serverEvents.js";
+
+const DEFAULT_RETRY_MS = 5_000;
+const POST_VIEW_KEYS = [["dashboard"], ["schedule"]];
+const SUGGESTION_VIEW_KEYS = [["inbox-suggestions"], ["suggestions"]];
+
+function sameChannel(query, channelId) {
+  return String(query.queryKey[1]?.channelId) === String(channelId);
+}
+
+// Keeps the cached views in step with server-side changes pushed over /v1/events.
+export function useServerEvents(token) {
+  const queryClient = useQueryClient();
+
+  useEffect(() => {
+    if (!token) return undefined;
+    const controller = new AbortController();
+    let retryMs = DEFAULT_RETRY_MS;
+    let reconnectTimer = null;
+    let opened = false;
+
+    function invalidate(keys) {
+      keys.forEach((queryKey) => queryClient.invalidateQueries({ queryKey }));
+    }
+
+    function handleEvent(type, data) {
+      if (type.startsWith("post.")) {
+        queryClient.invalidateQueries({
+          predicate: (query) =>
+            ["posts", "channel-stats"].includes(query.queryKey[0]) && sameChannel(query, data.channel_id)
+        });
+        queryClient.invalidateQueries({ queryKey: ["post", data.post_id] });
+        invalidate(POST_VIEW_KEYS);
+      } else if (type.startsWith("suggestion.")) {
+        invalidate(SUGGESTION_VIEW_KEYS);
+      }
+    }
+
+    function handleOpen() {
+      // Changes made while disconnected were missed: refetch once on reconnect.
+      if (opened) {
+        queryClient.invalidateQueries({ predicate: (query) => query.queryKey[0] === "posts" });
+        invalidate([...POST_VIEW_KEYS, ...SUGGESTION_VIEW_KEYS]);
+      }
+      opened = true;
+      setServerEventsConnected(true);
+    }
+
+    async function connect() {
+      try {
+        await streamEvents(token, {
+          signal: controller.signal,
+          onOpen: handleOpen,
+          onEvent: handleEvent,
+          onRetry: (ms) => {
+            retryMs = ms;
+          }
+        });
+      } catch (err) {
+        // 401: the session is over; the next API call handles the logout.
+        if (controller.signal.aborted || err.status === 401) return;
+      } finally {
+        setServerEventsConnected(false);
+      }
+      if (!controller.signal.aborted) reconnectTimer = setTimeout(connect, retryMs);
+    }
+
+    connect();
+    return () => {
+      controller.abort();
+      clearTimeout(reconnectTimer);
+      setServerEventsConnected(false);
+    };
+  }, [token, queryClient]);
+}
+
+export function useServerEventsConnected() {
+  return useSyncExternalStore(subscribeServerEvents, isServerEventsConnected);
+}
@@ -24,6 +24,8 @@ export default function Audit() {
     () => ({
       limit: DEFAULT_LIMIT,
       offset,
+      // Exact counts are costly on large tables; "more" relies on next_cursor instead.
+      total_mode: "estimated",
       entity_type: entityType || undefined,
       entity_id: entityId ? Number(entityId) : undefined,
       action: action || undefined
@@ -35,6 +37,7 @@ export default function Audit() {
   const data = query.data;
   const items = data?.items ?? [];
   const total = data?.total ?? 0;
+  const totalLabel = data?.total_mode === "estimated" ? `~${total}` : String(total);
 
   const isAdmin = user?.role === "admin";
 
@@ -77,7 +80,7 @@ export default function Audit() {
           </button>
         </div>
         <div className="mini" style={{ marginTop: 10 }}>
-          Всего: {total}. Показано: {items.length}. Offset: {offset}.
+          Всего: {totalLabel}. Показано: {items.length}. Offset: {offset}.
         </div>
       </div>
 
@@ -99,7 +102,7 @@ export default function Audit() {
         {items.length === 0 && !query.isLoading && <div className="empty">Нет записей.</div>}
       </div>
 
-      {isAdmin && items.length > 0 && offset + DEFAULT_LIMIT < total && (
+      {isAdmin && items.length > 0 && data?.next_cursor && (
         <div style={{ marginTop: 16 }}>
           <button type="button" className="ghost" onClick={() => setOffset((v) => v + DEFAULT_LIMIT)}>
             Еще
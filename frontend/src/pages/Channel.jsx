@@ -18,12 +18,13 @@ import { useChannelModals } from "../hooks/useChannelModals.js";
 import { useChannelActions } from "../hooks/useChannelActions.js";
 import { useChannelPostPreview } from "../hooks/useChannelPostPreview.js";
 
-const STATUSES = ["draft", "pending", "approved", "scheduled", "published", "rejected", "failed"];
+const STATUSES = ["draft", "pending", "approved", "scheduled", "publishing", "published", "rejected", "failed"];
 const STATUS_LABELS = {
   draft: "Черновик",
   pending: "На согласовании",
   approved: "Одобрен",
   scheduled: "Запланирован",
+  publishing: "Публикуется",
   published: "Опубликован",
   rejected: "Отклонён",
   failed: "Ошибка"
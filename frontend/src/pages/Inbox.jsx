@@ -21,6 +21,7 @@ export default function Inbox() {
     () => ({
       limit: PAGE_SIZE,
       offset,
+      total_mode: "estimated",
       channel_id: channelId ? Number(channelId) : undefined,
       q: q || undefined
     }),
@@ -37,6 +38,7 @@ export default function Inbox() {
   const data = inboxQuery.data;
   const items = data?.items ?? [];
   const total = data?.total ?? 0;
+  const totalLabel = data?.total_mode === "estimated" ? `~${total}` : String(total);
 
   const canModerate = user?.role === "admin" || user?.role === "editor";
 
@@ -86,7 +88,7 @@ export default function Inbox() {
           </button>
         </div>
         <div className="mini" style={{ marginTop: 10 }}>
-          Всего: {total}. Показано: {items.length}. Offset: {offset}.
+          Всего: {totalLabel}. Показано: {items.length}. Offset: {offset}.
         </div>
       </div>
 
@@ -134,7 +136,7 @@ export default function Inbox() {
         {items.length === 0 && !inboxQuery.isLoading && <div className="empty">Нет предложений.</div>}
       </div>
 
-      {canModerate && items.length > 0 && offset + PAGE_SIZE < total && (
+      {canModerate && items.length > 0 && data?.next_cursor && (
         <div style={{ marginTop: 16 }}>
           <button type="button" className="ghost" onClick={() => setOffset((v) => v + PAGE_SIZE)}>
             Еще
@@ -17,6 +17,7 @@ export default function Schedule() {
     () => ({
       limit: PAGE_SIZE,
       offset,
+      total_mode: "estimated",
       channel_id: channelId ? Number(channelId) : undefined
     }),
     [offset, channelId]
@@ -31,6 +32,7 @@ export default function Schedule() {
   const data = query.data;
   const items = data?.items ?? [];
   const total = data?.total ?? 0;
+  const totalLabel = data?.total_mode === "estimated" ? `~${total}` : String(total);
 
   return (
     <section>
@@ -53,7 +55,7 @@ export default function Schedule() {
           </label>
         </div>
         <div className="mini" style={{ marginTop: 10 }}>
-          Всего: {total}. Показано: {items.length}. Offset: {offset}.
+          Всего: {totalLabel}. Показано: {items.length}. Offset: {offset}.
         </div>
       </div>
 
@@ -76,7 +78,7 @@ export default function Schedule() {
         {items.length === 0 && !query.isLoading && <div className="empty">Нет запланированных постов.</div>}
       </div>
 
-      {items.length > 0 && offset + PAGE_SIZE < total && (
+      {items.length > 0 && data?.next_cursor && (
         <div style={{ marginTop: 16 }}>
           <button type="button" className="ghost" onClick={() => setOffset((v) => v + PAGE_SIZE)}>
             Еще
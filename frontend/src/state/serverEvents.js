@@ -0,0 +1,18 @@
+// Whether the /v1/events stream is open; polling hooks back off while it is.
+let connected = false;
+const listeners = new Set();
+
+export function isServerEventsConnected() {
+  return connected;
+}
+
+export function setServerEventsConnected(value) {
+  if (connected === value) return;
+  connected = value;
+  listeners.forEach((listener) => listener());
+}
+
+export function subscribeServerEvents(listener) {
+  listeners.add(listener);
+  return () => listeners.delete(listener);
+}